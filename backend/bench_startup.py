@@ -0,0 +1,125 @@
+"""
+Backend cold-start benchmark and import profiler
+
+Starts the app in fresh interpreters and measures the time until it can
+answer its first request (import main + lifespan startup + GET /health),
+then reports the per-module import cost (python -X importtime) for the
+app's own modules and the third-party packages they pull in.
+
+Exits with status 1 when the median time to first response exceeds the
+budget, so it can gate CI.
+
+Usage:
+    python bench_startup.py [--mode lazy|eager] [--runs 5] [--budget-ms 1500] [--top 15]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+FIRST_PARTY = {"main", "config", "core", "modules"}
+
+# Runs in the child interpreter; the last stdout line carries the measurements
+CHILD = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+from core.lazy import LazyObject
+client_import = time.perf_counter() - imported
+with TestClient(main.app) as client:
+    started = time.perf_counter()
+    client.get("/health")
+    first = time.perf_counter()
+print("BENCH " + json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "lifespan_ms": (started - imported - client_import) * 1000,
+    "first_response_ms": (first - start - client_import) * 1000,
+    "lazy_loaded": [entry["name"] for entry in LazyObject.loaded],
+}))
+"""
+
+
+def run_child(mode: str, importtime: bool = False) -> Tuple[Dict, str]:
+    env = {**os.environ, "LAZY_IMPORTS": "true" if mode == "lazy" else "false", "PYTHONDONTWRITEBYTECODE": "1"}
+    args = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", CHILD]
+    proc = subprocess.run(args, cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("BENCH ")]
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(f"App failed to start ({proc.returncode}):\n{proc.stderr[-2000:]}")
+    return json.loads(lines[-1][len("BENCH "):]), proc.stderr
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) for each line of -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def report_imports(rows: List[Tuple[str, int, int]], top: int) -> None:
+    own = sorted(
+        ((name, cumulative) for name, _, cumulative in rows if name.split(".")[0] in FIRST_PARTY),
+        key=lambda row: row[1], reverse=True
+    )
+    packages: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        root = name.split(".")[0]
+        if root not in FIRST_PARTY:
+            packages[root] += self_us
+
+    print(f" {'App modules (cumulative)':<40}")
+    for name, cumulative in own[:top]:
+        print(f"   {name:<38}: {cumulative / 1000:>8.1f}ms")
+    print(f" {'Packages (self time)':<40}")
+    for name, self_us in sorted(packages.items(), key=lambda row: row[1], reverse=True)[:top]:
+        print(f"   {name:<38}: {self_us / 1000:>8.1f}ms")
+
+
+def main(mode: str, runs: int, budget_ms: float, top: int) -> int:
+    print("\n" + "=" * 50)
+    print("      ⏱️  BACKEND COLD START BENCHMARK      ")
+    print("=" * 50)
+    print(f" MODE               : {mode}")
+    print(f" RUNS               : {runs}")
+    print(f" BUDGET             : {budget_ms:.0f}ms to first response")
+    print("=" * 50)
+
+    results = [run_child(mode)[0] for _ in range(runs)]
+    for key in ("import_ms", "lifespan_ms", "first_response_ms"):
+        values = [r[key] for r in results]
+        print(f" {key:<28}: median {statistics.median(values):>7.1f}ms   max {max(values):>7.1f}ms")
+    print(f" {'loaded on first request':<28}: {', '.join(results[-1]['lazy_loaded']) or '-'}")
+
+    print("=" * 50)
+    _, stderr = run_child(mode, importtime=True)
+    report_imports(parse_importtime(stderr), top)
+    print("=" * 50)
+
+    median = statistics.median(r["first_response_ms"] for r in results)
+    if median > budget_ms:
+        print(f"❌ Cold start {median:.0f}ms exceeds budget {budget_ms:.0f}ms")
+        return 1
+    print(f"✅ Cold start {median:.0f}ms within budget {budget_ms:.0f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=["lazy", "eager"], default="lazy")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    sys.exit(main(args.mode, args.runs, args.budget_ms, args.top))
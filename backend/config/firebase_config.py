@@ -4,22 +4,23 @@ Firebase Admin SDK Configuration
 Manages Firebase Admin SDK initialization and provides access to Firebase services.
 """
 
-import firebase_admin
-from firebase_admin import credentials, auth, firestore
-from typing import Optional
+from typing import Any, Optional
 import os
+import threading
 
 from .settings import settings
+from core.lazy import lazy_import
 
 
 class FirebaseConfig:
     """Firebase Admin SDK configuration and initialization"""
     
     def __init__(self):
-        self._app: Optional[firebase_admin.App] = None
-        self._db: Optional[firestore.Client] = None
+        self._app: Optional["firebase_admin.App"] = None
+        self._db: Optional["firestore.Client"] = None
+        self._lock = threading.Lock()
         
-    def initialize(self) -> firebase_admin.App:
+    def initialize(self) -> "firebase_admin.App":
         """
         Initialize Firebase Admin SDK
         
@@ -34,6 +35,10 @@ class FirebaseConfig:
             print("⚠️  Firebase already initialized")
             return self._app
         
+        # Imported here: firebase_admin pulls in google.auth and requests
+        import firebase_admin
+        from firebase_admin import credentials
+        
         cred_path = settings.FIREBASE_CREDENTIALS_PATH
         
         # Check if credentials file exists
@@ -77,7 +82,22 @@ class FirebaseConfig:
             print(f"❌ Failed to initialize Firebase: {e}")
             raise
     
-    def get_auth(self) -> auth:
+    def ensure_initialized(self) -> None:
+        """
+        Initialize on first use (LAZY_IMPORTS mode)
+        
+        Failures are reported like the startup initialization and not raised;
+        Admin SDK calls then fail with the SDK's own "app does not exist" error.
+        """
+        with self._lock:
+            if self._app:
+                return
+            try:
+                self.initialize()
+            except Exception as e:
+                print(f"❌ Firebase initialization failed: {e}")
+    
+    def get_auth(self) -> Any:
         """
         Get Firebase Auth client
         
@@ -88,7 +108,7 @@ class FirebaseConfig:
             raise RuntimeError("Firebase not initialized. Call initialize() first.")
         return auth
     
-    def get_firestore(self) -> firestore.Client:
+    def get_firestore(self) -> "firestore.Client":
         """
         Get Firestore client
         
@@ -99,6 +119,8 @@ class FirebaseConfig:
             raise RuntimeError("Firebase not initialized. Call initialize() first.")
         
         if not self._db:
+            # Imported here: google.cloud.firestore (grpc) is the heaviest import in the app
+            from firebase_admin import firestore
             self._db = firestore.client()
         
         return self._db
@@ -110,3 +132,7 @@ class FirebaseConfig:
 
 # Global instance
 firebase_config = FirebaseConfig()
+
+# Firebase Admin auth module shared by the app. With LAZY_IMPORTS the SDK is
+# imported and initialized on first use instead of at startup.
+auth = lazy_import("firebase_admin.auth", on_load=lambda module: firebase_config.ensure_initialized())
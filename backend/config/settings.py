@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional, Literal
+from typing import Optional, Literal, Dict
 import os
 
 
@@ -53,14 +53,117 @@ class Settings(BaseSettings):
     def DATA_CONNECT_PROJECT_ID(self) -> str:
         return self.FIREBASE_PROJECT_ID
 
+    # --- Data Connect Transport (async pooled client) ---
+    # All calls go to a single Data Connect host, so these pool limits are per-host.
+    DATA_CONNECT_HTTP2: bool = True
+    DATA_CONNECT_MAX_CONNECTIONS: int = 100
+    DATA_CONNECT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    DATA_CONNECT_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    DATA_CONNECT_TIMEOUT: float = 30.0  # seconds
+
+    # Refresh the cached service account token this many seconds before it expires
+    DATA_CONNECT_TOKEN_REFRESH_MARGIN: int = 300
+
+    # Read-through cache for reference queries (see modules/shared/query_cache.py)
+    DATA_CONNECT_QUERY_CACHE_ENABLED: bool = True
+    DATA_CONNECT_QUERY_CACHE_SIZE: int = 1024
+
+    # Collapse concurrent identical queries into one upstream call
+    DATA_CONNECT_COALESCE_QUERIES: bool = True
+
+    # Resilience: retries apply to queries only (mutations are not idempotent)
+    DATA_CONNECT_RETRY_ATTEMPTS: int = 3
+    DATA_CONNECT_RETRY_BASE_DELAY: float = 0.1  # seconds
+    DATA_CONNECT_RETRY_MAX_DELAY: float = 2.0  # seconds
+    DATA_CONNECT_BREAKER_FAILURE_THRESHOLD: int = 5
+    DATA_CONNECT_BREAKER_RESET_TIMEOUT: float = 30.0  # seconds
+    # Send a duplicate read if the first has not answered by the observed p95
+    DATA_CONNECT_HEDGE_READS: bool = False
+    DATA_CONNECT_HEDGE_MIN_DELAY: float = 0.05  # seconds
+
+    # Default page size for paginated list queries
+    DATA_CONNECT_PAGE_SIZE: int = 500
+
     # Logging
     LOG_LEVEL: str = "DEBUG"
 
+    # Request logging (DEBUG level only): sampling and body capture
+    REQUEST_LOG_SAMPLE_RATE: float = 1.0
+    # Per path-prefix sample rates, e.g. {"/api/v1/pricing": 0.1}; longest prefix wins
+    REQUEST_LOG_ROUTE_SAMPLE_RATES: Dict[str, float] = {"/health": 0.0, "/livez": 0.0, "/readyz": 0.0, "/metrics": 0.0}
+    REQUEST_LOG_MAX_BODY_BYTES: int = 4096
+
+    # Readiness probe (/readyz): per-check timeout and result cache (seconds), and the
+    # thresholds past which the instance reports not ready
+    HEALTH_CHECK_TIMEOUT: float = 2.0
+    HEALTH_CHECK_CACHE_TTL: float = 5.0
+    READINESS_MAX_UPSTREAM_LATENCY_MS: float = 1000.0
+    READINESS_MAX_LOOP_LAG_MS: float = 250.0
+    # Seconds between event-loop lag samples
+    LOOP_LAG_SAMPLE_INTERVAL: float = 0.5
+
+    # Prometheus metrics at /metrics (request, Data Connect and executor histograms)
+    METRICS_ENABLED: bool = True
+
+    # Request tracing (see core/tracing.py). Callers' sampled flag is honored;
+    # otherwise TRACE_SAMPLE_RATE of new traces are recorded. Exporter: console | file | none
+    TRACING_ENABLED: bool = False
+    TRACE_SAMPLE_RATE: float = 0.05
+    TRACE_RESPECT_PARENT: bool = True
+    TRACE_EXPORTER: Literal["console", "file", "none"] = "console"
+    TRACE_FILE_PATH: str = "traces.jsonl"
+    TRACE_EXPORT_INTERVAL: float = 2.0  # seconds
+    TRACE_MAX_SPANS_PER_TRACE: int = 512
+    TRACE_MAX_PENDING_TRACES: int = 1000
+
+    # JSON backend for responses and Data Connect payloads: "auto" uses orjson when installed
+    JSON_BACKEND: Literal["auto", "orjson", "stdlib"] = "auto"
+
+    # Import Firebase Admin, requests and the pricing/procurement engines on first
+    # use instead of at startup (shorter cold starts; first use pays the import)
+    LAZY_IMPORTS: bool = False
+
     # --- Firebase Admin SDK ---
     FIREBASE_DATABASE_URL: Optional[str] = None
     FIREBASE_CREDENTIALS_PATH: str = "./serviceAccountKey.json"
     FIREBASE_AUTH_EMULATOR_HOST: Optional[str] = "127.0.0.1:9099"
 
+    # Thread pool for blocking Admin SDK / google-auth calls
+    BLOCKING_EXECUTOR_MAX_WORKERS: int = 16
+    # Concurrent Firebase Admin user-management calls (create_user, set_custom_user_claims, ...)
+    FIREBASE_ADMIN_MAX_CONCURRENCY: int = 8
+    # Decoded ID token cache (entries expire at the token's exp)
+    ID_TOKEN_CACHE_ENABLED: bool = True
+    ID_TOKEN_CACHE_SIZE: int = 10000
+    # Seconds between background refreshes of Google's ID token signing keys
+    ID_TOKEN_CERT_PREFETCH_INTERVAL: float = 600.0
+    # Compiled per-user permission sets (seconds / entries)
+    PERMISSION_CACHE_TTL: float = 300.0
+    PERMISSION_CACHE_SIZE: int = 10000
+    # When the permission lookup fails, grant the token's role claim instead of
+    # failing the request (503). Opt-in for local development only.
+    PERMISSION_TRUST_ROLE_CLAIM_ON_LOOKUP_FAILURE: bool = False
+    # GetUserByAuthId rows shared by permission and tenant resolution (seconds / entries)
+    USER_RECORD_CACHE_TTL: float = 300.0
+    USER_RECORD_CACHE_SIZE: int = 10000
+    # Bulk staff provisioning: User rows per CreateUsersBulk mutation, concurrent
+    # mutations, and password setup links generated per second
+    BULK_PROVISION_DB_BATCH_SIZE: int = 100
+    BULK_PROVISION_DB_CONCURRENCY: int = 4
+    BULK_PROVISION_INVITE_RATE: float = 10.0
+    # Tenant contexts memoized per token (entries; each lives until its token's exp)
+    TENANT_CACHE_SIZE: int = 10000
+    # Merged user profiles served by /auth/profile/{uid} (seconds / entries)
+    PROFILE_CACHE_TTL: float = 60.0
+    PROFILE_CACHE_SIZE: int = 10000
+    # In-memory price books (modules/pricing/price_book.py): seconds between incremental
+    # refreshes, seconds between full reloads (picks up deleted rows), businesses kept
+    PRICE_BOOK_REFRESH_INTERVAL: float = 30.0
+    PRICE_BOOK_FULL_RELOAD_INTERVAL: float = 900.0
+    PRICE_BOOK_MAX_BUSINESSES: int = 1000
+    # Products a point fetch found unpriced, not fetched again for PRICE_BOOK_REFRESH_INTERVAL
+    PRICE_BOOK_MAX_UNPRICED: int = 10000
+
     @property
     def database_url(self) -> str:
         if self.FIREBASE_DATABASE_URL:
@@ -0,0 +1,154 @@
+"""
+Blocking Call Executor
+
+Bounded thread pool for synchronous SDK calls (Firebase Admin, google-auth)
+made from async code. Keeping them off the default executor means a burst of
+slow Admin API calls cannot starve asyncio.to_thread users, and the pool size
+is an explicit, observable limit.
+"""
+
+from typing import Dict, Any, Callable, Optional, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import threading
+import time
+
+from config.settings import settings
+from core.metrics import metrics
+
+T = TypeVar("T")
+
+# Recorded by the awaiting coroutine, so from the event loop thread only
+executor_call_duration = metrics.histogram(
+    "executor_call_duration_seconds",
+    "Blocking call latency including time queued for a thread",
+    ("pool", "call", "outcome"),
+)
+
+
+class BlockingExecutor:
+    """
+    Runs blocking callables on a dedicated, bounded thread pool
+
+    Usage:
+        user = await blocking_executor.run(auth.get_user, uid)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, thread_name_prefix: str = "blocking"):
+        self.max_workers = max_workers or settings.BLOCKING_EXECUTOR_MAX_WORKERS
+        self._thread_name_prefix = thread_name_prefix
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.submitted = 0
+        self.active = 0
+        self.peak_active = 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix=self._thread_name_prefix
+                    )
+        return self._pool
+
+    def _call(self, fn: Callable[..., T]) -> T:
+        with self._lock:
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run fn(*args, **kwargs) on the pool and await its result
+
+        Exceptions raised by fn propagate unchanged.
+        """
+        self.submitted += 1
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await loop.run_in_executor(self._get_pool(), self._call, functools.partial(fn, *args, **kwargs))
+            outcome = "ok"
+            return result
+        finally:
+            executor_call_duration.observe(
+                time.perf_counter() - start, self._thread_name_prefix, getattr(fn, "__name__", "call"), outcome
+            )
+
+    def shutdown(self) -> None:
+        """Stop accepting work and release idle threads (call from the app lifespan)"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool counters; queued > 0 means callers are waiting for a free thread"""
+        return {
+            "max_workers": self.max_workers,
+            "active": self.active,
+            "peak_active": self.peak_active,
+            "submitted": self.submitted,
+            "queued": self._pool._work_queue.qsize() if self._pool is not None else 0,
+        }
+
+
+class RateLimiter:
+    """
+    Async token bucket: at most `rate` acquisitions per second, bursts up to `burst`
+
+    Usage:
+        limiter = RateLimiter(rate=10)
+        async with limiter:
+            await admin_executor.run(auth.generate_password_reset_link, email)
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def __aenter__(self) -> "RateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+# Global instances: token verification / google-auth, and Firebase Admin API calls
+# (user management round-trips are slow; a separate pool keeps them from starving verification)
+blocking_executor = BlockingExecutor()
+admin_executor = BlockingExecutor(max_workers=settings.FIREBASE_ADMIN_MAX_CONCURRENCY, thread_name_prefix="firebase-admin")
+
+metrics.gauge_function(
+    "executor_active_threads", "Threads currently running a blocking call",
+    lambda: {(e._thread_name_prefix,): e.active for e in (blocking_executor, admin_executor)}, ("pool",)
+)
+metrics.gauge_function(
+    "executor_queued_calls", "Blocking calls waiting for a free thread",
+    lambda: {(e._thread_name_prefix,): e.stats()["queued"] for e in (blocking_executor, admin_executor)}, ("pool",)
+)
@@ -0,0 +1,251 @@
+"""
+Liveness and Readiness
+
+/livez answers as long as the process and its event loop are running.
+/readyz tells the load balancer whether this instance should get traffic:
+Data Connect must be reachable within the latency budget, the service
+account token must be valid, the Auth emulator (when configured) must
+accept connections, and the event loop must not be lagging.
+
+Dependency checks are time-bounded and their results cached for
+HEALTH_CHECK_CACHE_TTL seconds, so frequent probes never pile up on a
+slow upstream.
+"""
+
+from typing import Dict, Any, Optional, Callable, Awaitable
+from dataclasses import dataclass, field, asdict
+import asyncio
+import logging
+import os
+import time
+
+from config.settings import settings
+from core.executors import blocking_executor, admin_executor
+from core.metrics import metrics
+from modules.shared.dataconnect_client import async_dataconnect_client
+from modules.shared.token_cache import access_token_cache
+
+logger = logging.getLogger(__name__)
+
+event_loop_lag = metrics.histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop wakes a periodic sleep",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one dependency check"""
+    ok: bool
+    latency_ms: Optional[float] = None
+    detail: Optional[str] = None
+    checked_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag: how late a periodic sleep wakes up
+
+    Lag means callbacks are waiting behind blocking work on the loop.
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or settings.LOOP_LAG_SAMPLE_INTERVAL
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, (time.perf_counter() - start - self.interval) * 1000)
+            self.lag_ms = lag
+            event_loop_lag.observe(lag / 1000)
+            self.max_lag_ms = max(self.max_lag_ms, lag)
+
+    def start(self) -> None:
+        """Start sampling (call from the app lifespan)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lag_ms": round(self.lag_ms, 2),
+            "max_lag_ms": round(self.max_lag_ms, 2),
+            "running": self._task is not None and not self._task.done(),
+        }
+
+
+class HealthChecker:
+    """
+    Cached, time-bounded dependency checks behind /readyz
+
+    Concurrent probes share one in-flight round of checks.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, cache_ttl: Optional[float] = None):
+        self.timeout = timeout or settings.HEALTH_CHECK_TIMEOUT
+        self.cache_ttl = cache_ttl if cache_ttl is not None else settings.HEALTH_CHECK_CACHE_TTL
+        self.max_upstream_latency_ms = settings.READINESS_MAX_UPSTREAM_LATENCY_MS
+        self.max_loop_lag_ms = settings.READINESS_MAX_LOOP_LAG_MS
+        self.loop_monitor = LoopLagMonitor()
+        self.started_at = time.time()
+        # Set during shutdown so the load balancer drains this instance first
+        self.draining = False
+
+        self._checks: Dict[str, Callable[[], Awaitable[CheckResult]]] = {
+            "dataconnect": self._check_dataconnect,
+            "token": self._check_token,
+            "auth_emulator": self._check_auth_emulator,
+        }
+        self._results: Dict[str, CheckResult] = {}
+        self._checked_at = 0.0
+        self._inflight: Optional[asyncio.Future] = None
+
+        # Metrics
+        self.rounds = 0
+        self.not_ready = 0
+
+    # --- Checks ---
+
+    async def _check_dataconnect(self) -> CheckResult:
+        latency = await async_dataconnect_client.ping(timeout=self.timeout) * 1000
+        breakers = async_dataconnect_client.breakers
+        open_breakers = [verb for verb, breaker in breakers.items() if breaker.state == "OPEN"]
+        if open_breakers:
+            return CheckResult(ok=False, latency_ms=round(latency, 2), detail=f"circuit open: {', '.join(open_breakers)}")
+        return CheckResult(ok=True, latency_ms=round(latency, 2))
+
+    async def _check_token(self) -> CheckResult:
+        if not access_token_cache.has_valid_token():
+            return CheckResult(ok=False, detail="no valid service account token")
+        expires_in = access_token_cache.stats().get("expires_in")
+        return CheckResult(ok=True, detail=f"expires in {expires_in}s" if expires_in is not None else None)
+
+    async def _check_auth_emulator(self) -> CheckResult:
+        # DEV always runs against the emulator (see FirebaseConfig.initialize)
+        host = os.environ.get("FIREBASE_AUTH_EMULATOR_HOST")
+        if not host and settings.ENV == "DEV":
+            host = settings.FIREBASE_AUTH_EMULATOR_HOST
+        if not host:
+            return CheckResult(ok=True, detail="not configured")
+        hostname, _, port = host.rpartition(":")
+        start = time.perf_counter()
+        _, writer = await asyncio.open_connection(hostname, int(port))
+        writer.close()
+        return CheckResult(ok=True, latency_ms=round((time.perf_counter() - start) * 1000, 2), detail=host)
+
+    async def _run_check(self, name: str) -> CheckResult:
+        try:
+            return await asyncio.wait_for(self._checks[name](), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return CheckResult(ok=False, detail=f"timed out after {self.timeout}s")
+        except Exception as e:
+            return CheckResult(ok=False, detail=f"{type(e).__name__}: {e}")
+
+    async def _run_checks(self) -> Dict[str, CheckResult]:
+        names = list(self._checks)
+        results = await asyncio.gather(*(self._run_check(name) for name in names))
+        self._results = dict(zip(names, results))
+        self._checked_at = time.monotonic()
+        self.rounds += 1
+        for name, result in self._results.items():
+            if not result.ok:
+                logger.warning(f"⚠️ Readiness check {name} failed: {result.detail}")
+        return self._results
+
+    async def check_dependencies(self) -> Dict[str, CheckResult]:
+        """Dependency results, refreshed at most once per cache_ttl"""
+        if self._results and time.monotonic() - self._checked_at < self.cache_ttl:
+            return self._results
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._run_checks())
+        return await asyncio.shield(self._inflight)
+
+    # --- Probes ---
+
+    def executor_stats(self) -> Dict[str, Any]:
+        """Thread pool usage; saturated means every worker is busy and calls are queueing"""
+        pools = {}
+        for name, executor in (("blocking", blocking_executor), ("firebase_admin", admin_executor)):
+            stats = executor.stats()
+            stats["saturated"] = stats["active"] >= stats["max_workers"] and stats["queued"] > 0
+            pools[name] = stats
+        return pools
+
+    def liveness(self) -> Dict[str, Any]:
+        return {
+            "status": "alive",
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "loop": self.loop_monitor.stats(),
+        }
+
+    async def readiness(self) -> Dict[str, Any]:
+        """
+        Readiness report
+
+        Returns:
+            Dict with "ready" plus the reasons it is False, dependency results,
+            loop lag and thread pool usage
+        """
+        checks = await self.check_dependencies()
+        reasons = [f"{name}: {result.detail or 'failed'}" for name, result in checks.items() if not result.ok]
+
+        dataconnect = checks.get("dataconnect")
+        read_p95 = async_dataconnect_client.read_latency.percentile(95)
+        upstream_ms = max(
+            (dataconnect.latency_ms or 0.0) if dataconnect else 0.0,
+            read_p95 * 1000 if read_p95 is not None else 0.0,
+        )
+        if upstream_ms > self.max_upstream_latency_ms:
+            reasons.append(f"upstream latency {upstream_ms:.0f}ms > {self.max_upstream_latency_ms:.0f}ms")
+
+        loop = self.loop_monitor.stats()
+        if loop["lag_ms"] > self.max_loop_lag_ms:
+            reasons.append(f"event loop lag {loop['lag_ms']:.0f}ms > {self.max_loop_lag_ms:.0f}ms")
+
+        if self.draining:
+            reasons.append("shutting down")
+
+        ready = not reasons
+        if not ready:
+            self.not_ready += 1
+        return {
+            "status": "ready" if ready else "not_ready",
+            "ready": ready,
+            "reasons": reasons,
+            "checks": {name: result.to_dict() for name, result in checks.items()},
+            "upstream_latency_ms": round(upstream_ms, 2),
+            "loop": loop,
+            "executors": self.executor_stats(),
+        }
+
+    def start(self) -> None:
+        self.loop_monitor.start()
+
+    async def stop(self) -> None:
+        self.draining = True
+        await self.loop_monitor.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"rounds": self.rounds, "not_ready": self.not_ready}
+
+
+# Global instance used by the /livez and /readyz endpoints
+health_checker = HealthChecker()
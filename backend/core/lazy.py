@@ -0,0 +1,102 @@
+"""
+Lazy Imports
+
+Defers heavy imports (Firebase Admin, google-auth, requests, pricing and
+procurement engines) to their first use when LAZY_IMPORTS is enabled, so a
+cold start only pays for what the first request actually touches.
+
+Usage:
+    auth = lazy_import("firebase_admin.auth")
+    pricing_engine = LazyObject(lambda: PricingEngine())
+
+Attribute access on the proxy triggers the import; call sites stay unchanged
+(auth.verify_id_token(...), except auth.UserNotFoundError, ...).
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+import importlib
+import logging
+import threading
+import time
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LazyObject:
+    """
+    Proxy that builds its target on first attribute access
+
+    The factory runs at most once (thread-safe); if it raises, the error
+    propagates and the next access retries.
+    """
+
+    # Targets resolved so far: (label, milliseconds), in load order
+    loaded: List[Dict[str, Any]] = []
+
+    def __init__(self, factory: Callable[[], Any], label: Optional[str] = None):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_label", label or getattr(factory, "__qualname__", "object"))
+        object.__setattr__(self, "_target", _MISSING)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _resolve(self) -> Any:
+        target = object.__getattribute__(self, "_target")
+        if target is not _MISSING:
+            return target
+        with object.__getattribute__(self, "_lock"):
+            target = object.__getattribute__(self, "_target")
+            if target is _MISSING:
+                label = object.__getattribute__(self, "_label")
+                start = time.perf_counter()
+                target = object.__getattribute__(self, "_factory")()
+                elapsed = (time.perf_counter() - start) * 1000
+                object.__setattr__(self, "_target", target)
+                LazyObject.loaded.append({"name": label, "ms": round(elapsed, 1)})
+                logger.info(f"📦 Lazy load: {label} ({elapsed:.0f}ms)")
+        return target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._resolve(), name, value)
+
+    def __repr__(self) -> str:
+        target = object.__getattribute__(self, "_target")
+        label = object.__getattribute__(self, "_label")
+        return f"<lazy {label} (loaded)>" if target is not _MISSING else f"<lazy {label} (pending)>"
+
+
+def lazy_import(name: str, on_load: Optional[Callable[[Any], None]] = None) -> Any:
+    """
+    Import a module now, or on first use when LAZY_IMPORTS is enabled
+
+    Args:
+        name: Absolute module name
+        on_load: Called with the module after a deferred import (lazy mode only;
+                 in eager mode the equivalent setup runs in the app lifespan)
+
+    Returns:
+        The module, or a LazyObject proxy for it
+    """
+    if not settings.LAZY_IMPORTS:
+        return importlib.import_module(name)
+
+    def load() -> Any:
+        module = importlib.import_module(name)
+        if on_load is not None:
+            on_load(module)
+        return module
+
+    return LazyObject(load, label=name)
+
+
+def lazy_instance(factory: Callable[[], Any], label: Optional[str] = None) -> Any:
+    """Build factory() now, or on first use when LAZY_IMPORTS is enabled"""
+    if not settings.LAZY_IMPORTS:
+        return factory()
+    return LazyObject(factory, label=label)
@@ -0,0 +1,265 @@
+"""
+Prometheus Metrics
+
+Minimal, dependency-free metrics registry rendered in the Prometheus text
+exposition format (version 0.0.4) at /metrics.
+
+Counters, gauges and histograms are plain dicts of per-label-set values with
+no locks. Every observation is made on the event loop thread (executor call
+latencies are recorded by the awaiting coroutine, not the worker thread),
+so increments never race and the hot path costs a dict lookup, a bisect and
+two additions.
+
+Values that already exist elsewhere (cache hit ratios, thread pool usage)
+are read from the owning object's stats() at scrape time instead of being
+counted twice.
+"""
+
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple, Union
+from bisect import bisect_left
+import math
+
+LabelValues = Tuple[str, ...]
+
+# Prometheus client default buckets (seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic counter; inc() takes label values positionally"""
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in list(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    """Gauge that can go up and down"""
+    type_name = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+
+class GaugeFunction(_Metric):
+    """
+    Gauge read at scrape time
+
+    fn returns a number (no labels) or a dict of label-value tuples to numbers.
+    """
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        fn: Callable[[], Union[float, Dict[LabelValues, float]]],
+        labelnames: Tuple[str, ...] = ()
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.fn = fn
+
+    def samples(self) -> List[str]:
+        values = self.fn()
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(float(value))}"
+            for labels, value in values.items()
+            if value is not None
+        ]
+
+
+class CounterFunction(GaugeFunction):
+    """Monotonic counter read at scrape time (e.g. a hits counter owned by a cache)"""
+    type_name = "counter"
+
+
+class Histogram(_Metric):
+    """
+    Bucketed histogram
+
+    Per-bucket counts are stored non-cumulatively (one increment per
+    observation) and accumulated when rendered.
+    """
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [bucket counts..., +Inf count], sum
+        self._children: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        child = self._children.get(labels)
+        if child is None:
+            child = self._children.setdefault(labels, ([0] * (len(self.buckets) + 1), [0.0]))
+        counts, total = child
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def count(self, *labels: str) -> int:
+        child = self._children.get(labels)
+        return sum(child[0]) if child else 0
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, (counts, total) in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Named metrics plus scrape-time cache statistics
+
+    Usage:
+        latency = metrics.histogram("x_seconds", "X latency", ("operation",))
+        latency.observe(0.012, "GetUser")
+        metrics.register_cache("query", query_cache.stats)
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._caches: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def _register(self, metric: _Metric) -> Any:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def gauge_function(
+        self,
+        name: str,
+        help_text: str,
+        fn: Callable[[], Union[float, Dict[LabelValues, float]]],
+        labelnames: Tuple[str, ...] = ()
+    ) -> GaugeFunction:
+        return self._register(GaugeFunction(name, help_text, fn, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def register_cache(self, name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+        """Expose a cache whose stats() reports hits, misses and size"""
+        self._caches[name] = stats
+
+    def _cache_metrics(self) -> List[_Metric]:
+        snapshot = {name: stats() for name, stats in self._caches.items()}
+
+        def field(key: str) -> Dict[LabelValues, float]:
+            return {(name,): stats[key] for name, stats in snapshot.items() if stats.get(key) is not None}
+
+        def hit_ratio() -> Dict[LabelValues, float]:
+            ratios = {}
+            for name, stats in snapshot.items():
+                lookups = stats.get("hits", 0) + stats.get("misses", 0)
+                ratios[(name,)] = stats.get("hits", 0) / lookups if lookups else 0.0
+            return ratios
+
+        labels = ("cache",)
+        return [
+            CounterFunction("cache_hits_total", "Cache hits", lambda: field("hits"), labels),
+            CounterFunction("cache_misses_total", "Cache misses", lambda: field("misses"), labels),
+            GaugeFunction("cache_hit_ratio", "Cache hits / lookups since start", hit_ratio, labels),
+            GaugeFunction("cache_entries", "Entries currently cached", lambda: field("size"), labels),
+        ]
+
+    def render(self) -> str:
+        """Text exposition of every registered metric"""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()) + self._cache_metrics():
+            samples = metric.samples()
+            if samples:
+                lines.extend(metric.header())
+                lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+# Global registry rendered by /metrics
+metrics = MetricsRegistry()
+
+# HTTP server metrics (recorded by core.middleware.MetricsMiddleware)
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+http_requests_in_flight = metrics.gauge("http_requests_in_flight", "HTTP requests currently being served")
@@ -0,0 +1,211 @@
+"""
+HTTP Middleware
+
+Pure ASGI request logging, metrics and tracing. Unlike a BaseHTTPMiddleware subclass it does not
+wrap the request in a Request object, buffer the body or spawn a task per
+call; when the logger is disabled (or the request is not sampled) the
+downstream app is called directly.
+"""
+
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+import logging
+import random
+import time
+
+from config.settings import settings
+from core.metrics import http_request_duration, http_requests_in_flight
+from core.serialization import json_loads, json_dumps_pretty
+from core.tracing import tracer, Span
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+class RequestLoggingMiddleware:
+    """
+    Logs method, path, status and latency (and request bodies) at DEBUG level
+
+    Args:
+        app: Downstream ASGI app
+        logger_name: Logger to write to
+        sample_rate: Fraction of requests logged (0.0 - 1.0)
+        route_sample_rates: Per path-prefix overrides, longest prefix wins
+            (e.g. {"/health": 0.0, "/api/v1/pricing": 0.1})
+        max_body_bytes: Request body bytes kept for logging (0 disables body logging)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        logger_name: str = "bizPharma",
+        sample_rate: Optional[float] = None,
+        route_sample_rates: Optional[Dict[str, float]] = None,
+        max_body_bytes: Optional[int] = None,
+    ):
+        self.app = app
+        self.logger = logging.getLogger(logger_name)
+        self.sample_rate = settings.REQUEST_LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+        rates = settings.REQUEST_LOG_ROUTE_SAMPLE_RATES if route_sample_rates is None else route_sample_rates
+        # Longest prefix first so the most specific override wins
+        self.route_sample_rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self.max_body_bytes = settings.REQUEST_LOG_MAX_BODY_BYTES if max_body_bytes is None else max_body_bytes
+
+    def _sampled(self, path: str) -> bool:
+        rate = self.sample_rate
+        for prefix, route_rate in self.route_sample_rates:
+            if path.startswith(prefix):
+                rate = route_rate
+                break
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.logger.isEnabledFor(logging.DEBUG) or not self._sampled(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+        query = scope.get("query_string", b"")
+        target = f"{path}?{query.decode('latin-1')}" if query else path
+        self.logger.debug(f"Incoming Request: {method} {target}")
+
+        start = time.perf_counter()
+        status_code = 500
+        # Chunks are kept by reference (no copy) until the cap is reached
+        chunks: List[bytes] = []
+        captured = 0
+        total = 0
+
+        async def logging_receive() -> Message:
+            nonlocal captured, total
+            message = await receive()
+            if message["type"] == "http.request" and self.max_body_bytes:
+                body = message.get("body", b"")
+                total += len(body)
+                if body and captured < self.max_body_bytes:
+                    chunks.append(body)
+                    captured += len(body)
+                if not message.get("more_body", False) and total:
+                    self._log_body(scope, chunks, total)
+            return message
+
+        async def logging_send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                elapsed = (time.perf_counter() - start) * 1000
+                self.logger.debug(f"Response Status: {status_code} {method} {path} (took {elapsed:.2f}ms)")
+
+        try:
+            await self.app(scope, logging_receive, logging_send)
+        except Exception:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.logger.debug(f"Response Status: unhandled error {method} {path} (took {elapsed:.2f}ms)")
+            raise
+
+    def _log_body(self, scope: Scope, chunks: List[bytes], total: int) -> None:
+        body = b"".join(chunks)[:self.max_body_bytes]
+        truncated = total - len(body)
+
+        content_type = b""
+        for name, value in scope.get("headers", ()):
+            if name == b"content-type":
+                content_type = value
+                break
+
+        if not truncated and b"json" in content_type:
+            try:
+                self.logger.debug(f"Request Body: {json_dumps_pretty(json_loads(body))}")
+                return
+            except ValueError:
+                pass
+
+        suffix = f" ... ({truncated} more bytes)" if truncated else ""
+        self.logger.debug(f"Request Body (raw): {body.decode(errors='ignore')}{suffix}")
+
+
+class MetricsMiddleware:
+    """
+    Records request latency per route template and the in-flight request gauge
+
+    The route template ("/api/v1/auth/profile/{uid}") comes from the route
+    FastAPI matched, so path parameters never become label values; requests
+    that match no route are recorded as "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        http_requests_in_flight.inc()
+
+        async def metrics_send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, metrics_send)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            )
+
+
+class TracingMiddleware:
+    """
+    Opens the server span for each request
+
+    Continues the caller's W3C traceparent, names the span after the matched
+    route template, and returns the trace id in a `traceresponse` header so
+    a slow call can be looked up in the exported traces.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope.get("headers", ()):
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        method = scope["method"]
+        with tracer.start_trace(f"{method} {scope['path']}", traceparent, {"http.method": method}) as span:
+            response_header = tracer.current_traceparent().encode("latin-1")
+
+            async def tracing_send(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    message["headers"] = list(message.get("headers", ())) + [(b"traceresponse", response_header)]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, tracing_send)
+            finally:
+                route = scope.get("route")
+                if route is not None and isinstance(span, Span):
+                    span.name = f"{method} {route.path}"
+                    span.set_attribute("http.route", route.path)
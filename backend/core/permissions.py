@@ -0,0 +1,250 @@
+"""
+Permission Resolution
+
+Maps UserRole values to permission sets and caches each user's compiled
+permissions (role grants + per-user grants from User.permissions), so
+RBACChecker answers with a set-membership check instead of a Data Connect
+query per request.
+
+Permission strings are "<domain>:<action>". Grants may use wildcards:
+"*" (everything) or "<domain>:*" (every action in a domain).
+"""
+
+from typing import Dict, Any, FrozenSet, Iterable, Optional, Tuple
+import asyncio
+import logging
+import uuid
+
+from cachetools import TTLCache
+
+from config.settings import settings
+from core.metrics import metrics
+from modules.shared.dataconnect_client import DataConnectError
+from core.users import user_records
+
+logger = logging.getLogger(__name__)
+
+
+# Role grants, keyed by dataconnect UserRole
+ROLE_PERMISSIONS: Dict[str, FrozenSet[str]] = {
+    "BUSINESS_ADMIN": frozenset({"*"}),
+    "OPERATIONS_MANAGER": frozenset({
+        "setup:read", "inventory:*", "procurement:*", "pricing:*", "sales:*", "financial:read", "reports:read",
+    }),
+    "DISTRICT_AREA_MANAGER": frozenset({
+        "setup:read", "inventory:read", "procurement:read", "procurement:approve", "pricing:read", "sales:read", "reports:read",
+    }),
+    "WAREHOUSE_MANAGER": frozenset({
+        "inventory:*", "procurement:read", "procurement:receive", "reports:read",
+    }),
+    "PROCUREMENT_MANAGER": frozenset({
+        "inventory:read", "procurement:*", "pricing:read", "reports:read",
+    }),
+    "SALES_MANAGER": frozenset({
+        "inventory:read", "pricing:*", "sales:*", "reports:read",
+    }),
+    "STORE_MANAGER": frozenset({
+        "setup:read", "inventory:read", "inventory:write", "procurement:read", "procurement:request",
+        "pricing:read", "sales:*", "reports:read",
+    }),
+    "FRONT_END_SUPERVISOR": frozenset({
+        "inventory:read", "pricing:read", "sales:*",
+    }),
+    "CASHIER_POS_OPERATOR": frozenset({
+        "inventory:read", "pricing:read", "sales:create", "sales:read",
+    }),
+    "BILLING_SPECIALIST_ACCOUNTANT": frozenset({
+        "financial:*", "sales:read", "procurement:read", "reports:read",
+    }),
+    "CLINICAL_SERVICES_COORDINATOR": frozenset({
+        "inventory:read", "pricing:read", "sales:read",
+    }),
+    "DATA_ANALYST": frozenset({
+        "inventory:read", "procurement:read", "pricing:read", "sales:read", "financial:read", "reports:*",
+    }),
+    "RECEIVING_STOCK_CLERK": frozenset({
+        "inventory:read", "inventory:write", "procurement:receive",
+    }),
+    "DELIVERY_LOGISTICS_COORDINATOR": frozenset({
+        "inventory:read", "procurement:read",
+    }),
+}
+
+# Role names written into custom claims before roles matched the UserRole enum
+ROLE_ALIASES: Dict[str, str] = {
+    "admin": "BUSINESS_ADMIN",
+}
+
+
+def normalize_role(role: Optional[str]) -> Optional[str]:
+    """Map a claim/database role to its UserRole name"""
+    if not role:
+        return None
+    return ROLE_ALIASES.get(role, role.upper())
+
+
+def compile_permissions(role: Optional[str], extra: Optional[Iterable[str]] = None) -> FrozenSet[str]:
+    """
+    Build the permission set for a role plus per-user grants
+
+    Args:
+        role: UserRole name (or legacy alias)
+        extra: User.permissions grants
+
+    Returns:
+        FrozenSet[str]: Permissions, including any wildcard grants
+    """
+    granted = set(ROLE_PERMISSIONS.get(normalize_role(role), ()))
+    if extra:
+        granted.update(p for p in extra if isinstance(p, str))
+    return frozenset(granted)
+
+
+def has_permission(granted: FrozenSet[str], permission: str) -> bool:
+    """Check one permission against a compiled set (exact, domain wildcard or global wildcard)"""
+    if permission in granted or "*" in granted:
+        return True
+    domain, _, _ = permission.partition(":")
+    return f"{domain}:*" in granted
+
+
+def same_uuid(a: Any, b: Any) -> bool:
+    """Compare two UUIDs in any textual form (hyphenated, 32 hex digits, any case); unparseable values never match"""
+    try:
+        return uuid.UUID(str(a)) == uuid.UUID(str(b))
+    except (ValueError, TypeError, AttributeError):
+        return False
+
+
+def ungrantable(granted: FrozenSet[str], role: Optional[str], extra: Optional[Iterable[str]] = None) -> FrozenSet[str]:
+    """
+    Permissions a role plus per-user grants would confer that the granter does not hold
+
+    A user may only hand out what they have themselves: an empty result means
+    the granter may assign the role and grants (so no one can create an
+    account above their own role, and "*" can only come from a "*" holder).
+    """
+    return frozenset(p for p in compile_permissions(role, extra) if not has_permission(granted, p))
+
+
+class PermissionCache:
+    """
+    Per-user compiled permission cache
+
+    Keyed by (uid, business_id). Entries live for PERMISSION_CACHE_TTL seconds
+    and are dropped explicitly with invalidate() when a user's role or grants
+    change. Concurrent misses for the same user share one lookup; a lookup
+    invalidated while in flight is not cached.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        self._entries: TTLCache = TTLCache(
+            maxsize=maxsize or settings.PERMISSION_CACHE_SIZE,
+            ttl=ttl or settings.PERMISSION_CACHE_TTL
+        )
+        self._inflight: Dict[Tuple[str, Optional[str]], asyncio.Future] = {}
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+    async def _load(self, uid: str, business_id: Optional[str], claimed_role: Optional[str]) -> FrozenSet[str]:
+        try:
+            user = await user_records.get(uid)
+        except DataConnectError as e:
+            if not settings.PERMISSION_TRUST_ROLE_CLAIM_ON_LOOKUP_FAILURE:
+                raise
+            # Opted in (local dev without Data Connect): the role claim only, never a default role (not cached)
+            logger.warning(f"⚠️ Permission lookup failed for {uid}, using role claim {claimed_role!r}: {e}")
+            return compile_permissions(claimed_role)
+
+        if not user or not user.get("isActive", True):
+            granted = frozenset()
+        elif business_id and not same_uuid(user.get("businessId"), business_id):
+            # Token claims a different tenant than the user record
+            logger.warning(f"⚠️ Business mismatch for {uid}: claim {business_id}, record {user.get('businessId')}")
+            granted = frozenset()
+        else:
+            granted = compile_permissions(user.get("role"), user.get("permissions"))
+
+        # Not if the user was invalidated while the lookup was in flight
+        key = (uid, business_id)
+        if self._inflight.get(key) is asyncio.current_task():
+            self._entries[key] = granted
+        return granted
+
+    def _forget(self, key: Tuple[str, Optional[str]], future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    async def get(self, uid: str, business_id: Optional[str] = None, claimed_role: Optional[str] = None) -> FrozenSet[str]:
+        """
+        Get a user's compiled permissions
+
+        Args:
+            uid: Firebase UID (User.id)
+            business_id: Tenant from the token, None if not yet onboarded
+            claimed_role: Role claim, only used when the lookup fails and
+                          PERMISSION_TRUST_ROLE_CLAIM_ON_LOOKUP_FAILURE is set
+
+        Returns:
+            FrozenSet[str]: Granted permissions (empty if the user is unknown or inactive)
+
+        Raises:
+            DataConnectError: If the lookup fails (fails closed unless opted in)
+        """
+        key = (uid, business_id)
+        granted = self._entries.get(key)
+        if granted is not None:
+            self.hits += 1
+            return granted
+
+        self.misses += 1
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._load(uid, business_id, claimed_role))
+            self._inflight[key] = future
+            future.add_done_callback(lambda f, k=key: self._forget(k, f))
+        return await asyncio.shield(future)
+
+    def invalidate(self, uid: Optional[str] = None, business_id: Optional[str] = None) -> int:
+        """
+        Drop cached permissions for a user, a whole business, or everything
+
+        Call after changing a user's role, permissions or business. The
+        shared user record cache is invalidated with it.
+        """
+        user_records.invalidate(uid=uid, business_id=business_id)
+        if uid is None and business_id is None:
+            count = len(self._entries)
+            self._entries.clear()
+            self._inflight.clear()
+        else:
+            def matches(k: Tuple[str, Optional[str]]) -> bool:
+                return (uid is None or k[0] == uid) and (business_id is None or k[1] == business_id)
+
+            for k in [k for k in self._inflight if matches(k)]:
+                del self._inflight[k]
+            keys = [k for k in list(self._entries.keys()) if matches(k)]
+            for k in keys:
+                self._entries.pop(k, None)
+            count = len(keys)
+        self.invalidated += count
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "invalidated": self.invalidated,
+            "size": len(self._entries),
+            "maxsize": self._entries.maxsize,
+        }
+
+
+# Global instance used by core.security.RBACChecker
+permission_cache = PermissionCache()
+metrics.register_cache("permissions", permission_cache.stats)
@@ -7,10 +7,14 @@ Provides Firebase token verification, user authentication, and role-based access
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional, List, Dict
-from firebase_admin import auth
+from config.firebase_config import auth
 
 from config.firebase_config import firebase_config
 from config.settings import settings
+from core.token_verification import verified_token_cache
+from core.permissions import permission_cache, has_permission
+from core.tenant import TenantContext, tenant_resolver
+from modules.shared.dataconnect_client import DataConnectError
 
 
 # HTTP Bearer token security scheme
@@ -44,9 +48,9 @@ async def verify_firebase_token(
     token = credentials.credentials
     
     try:
-        # Verify token with Firebase Admin SDK
+        # Verify token with Firebase Admin SDK (off the event loop, cached until the token's exp)
         # When FIREBASE_AUTH_EMULATOR_HOST is set (in DEV), this automatically connects to the emulator.
-        decoded_token = auth.verify_id_token(token)
+        decoded_token = await verified_token_cache.verify(token)
         
         return decoded_token
     
@@ -75,23 +79,39 @@ async def verify_firebase_token(
 
 async def get_current_user(
     token_data: Dict = Depends(verify_firebase_token)
-) -> Dict:
+) -> TenantContext:
     """
-    Extract current user information from verified token
-    
+    Resolve the current user and their tenant from the verified token
+
+    Resolved once per token: from custom claims (business_id, role, tier,
+    location_ids), or a cached GetUserByAuthId lookup for tokens issued
+    before onboarding set those claims.
+
     Args:
         token_data: Decoded Firebase token
-        
+
     Returns:
-        Dict: User information including uid, email, email_verified
+        TenantContext: uid, email, business_id, role, tier, location_ids
+        (supports dict-style access)
+    """
+    return await tenant_resolver.resolve(token_data)
+
+
+async def get_tenant_context(
+    current_user: TenantContext = Depends(get_current_user)
+) -> TenantContext:
+    """
+    Current user's tenant context, requiring an onboarded business
+
+    Raises:
+        HTTPException: 403 if the user is not associated with a business
     """
-    return {
-        'uid': token_data.get('uid'),
-        'email': token_data.get('email'),
-        'email_verified': token_data.get('email_verified', False),
-        'name': token_data.get('name'),
-        'picture': token_data.get('picture'),
-    }
+    if not current_user.business_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is not associated with a business"
+        )
+    return current_user
 
 
 async def get_optional_user(
@@ -136,40 +156,42 @@ class RBACChecker:
     
     async def __call__(
         self,
-        current_user: Dict = Depends(get_current_user)
-    ) -> Dict:
+        current_user: TenantContext = Depends(get_current_user)
+    ) -> TenantContext:
         """
         Check if user has required permissions
-        
+
+        Permissions are compiled once per user (role + User.permissions) and
+        cached, so this is a set-membership check on the hot path.
+
         Args:
-            current_user: Current authenticated user
-            
+            current_user: Current authenticated user and tenant
+
         Returns:
             Dict: User information if authorized
-            
+
         Raises:
-            HTTPException: If user lacks required permissions
+            HTTPException: 403 if user lacks required permissions, 503 if they cannot be resolved
         """
-        # TODO: Fetch user roles and permissions from database
-        # For now, allowing all authenticated users
-        # 
-        # Implementation plan:
-        # 1. Query user_roles table via Firebase Data Connect
-        # 2. Get all permissions for user's roles
-        # 3. Check if required_permissions ⊆ user_permissions
-        # 4. Raise 403 if insufficient permissions
-        
-        user_uid = current_user.get('uid')
-        
-        # Placeholder: In production, query database for user permissions
-        # user_permissions = await fetch_user_permissions(user_uid)
-        # 
-        # if not all(perm in user_permissions for perm in self.required_permissions):
-        #     raise HTTPException(
-        #         status_code=status.HTTP_403_FORBIDDEN,
-        #         detail=f"Insufficient permissions. Required: {self.required_permissions}"
-        #     )
-        
+        try:
+            granted = await permission_cache.get(
+                current_user.uid,
+                current_user.business_id,
+                claimed_role=current_user.role
+            )
+        except DataConnectError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Unable to resolve permissions: {str(e)}"
+            )
+
+        missing = [p for p in self.required_permissions if not has_permission(granted, p)]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Insufficient permissions. Required: {self.required_permissions}"
+            )
+
         return current_user
 
 
@@ -0,0 +1,111 @@
+"""
+JSON Serialization
+
+Single pluggable JSON backend used for API responses and Data Connect
+payloads. orjson is used when installed (and JSON_BACKEND allows it); the
+stdlib json module is the fallback. Both handle datetime/date/time, UUID,
+Decimal, Enum and NumPy values the same way.
+"""
+
+from typing import Any, Union
+from datetime import datetime, date, time
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+import json
+import logging
+
+from fastapi.responses import JSONResponse
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _decimal(value: Decimal) -> Union[int, float]:
+    # Same convention as FastAPI's jsonable_encoder: integral -> int, otherwise float
+    return int(value) if value.as_tuple().exponent >= 0 else float(value)
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Types orjson does not serialize natively"""
+    if isinstance(obj, Decimal):
+        return _decimal(obj)
+    if hasattr(obj, "tolist"):  # NumPy scalars with non-native dtypes
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_default(obj: Any) -> Any:
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    return _orjson_default(obj)
+
+
+def _use_orjson() -> bool:
+    if settings.JSON_BACKEND == "stdlib":
+        return False
+    if orjson is None:
+        if settings.JSON_BACKEND == "orjson":
+            logger.warning("⚠️ JSON_BACKEND=orjson but orjson is not installed, using stdlib json")
+        return False
+    return True
+
+
+USE_ORJSON = _use_orjson()
+JSON_BACKEND = "orjson" if USE_ORJSON else "stdlib"
+
+
+if USE_ORJSON:
+    _OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def json_dumps(obj: Any) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes"""
+        return orjson.dumps(obj, default=_orjson_default, option=_OPTIONS)
+
+    def json_dumps_canonical(obj: Any) -> str:
+        """Serialize with sorted keys (stable cache keys)"""
+        return orjson.dumps(obj, default=str, option=_OPTIONS | orjson.OPT_SORT_KEYS).decode()
+
+    def json_dumps_pretty(obj: Any) -> str:
+        """Indented JSON for debug logging"""
+        return orjson.dumps(obj, default=_orjson_default, option=_OPTIONS | orjson.OPT_INDENT_2).decode()
+
+    json_loads = orjson.loads
+
+else:
+    def json_dumps(obj: Any) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes"""
+        return json.dumps(obj, default=_stdlib_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def json_dumps_canonical(obj: Any) -> str:
+        """Serialize with sorted keys (stable cache keys)"""
+        return json.dumps(obj, default=str, sort_keys=True, separators=(",", ":"))
+
+    def json_dumps_pretty(obj: Any) -> str:
+        """Indented JSON for debug logging"""
+        return json.dumps(obj, default=_stdlib_default, ensure_ascii=False, indent=2)
+
+    json_loads = json.loads
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with the configured JSON backend
+
+    Used as the application's default_response_class.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
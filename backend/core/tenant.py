@@ -0,0 +1,173 @@
+"""
+Tenant Context
+
+Resolves who the caller is and which business (tenant) they act for, once per
+token. Custom claims set at onboarding (business_id, role, tier, location_ids)
+are used directly; users whose token predates those claims fall back to the
+user record shared with permission resolution (core.users).
+"""
+
+from typing import Dict, Any, FrozenSet, Optional, Tuple
+from dataclasses import dataclass, asdict
+import logging
+import time
+
+from cachetools import TLRUCache
+
+from config.settings import settings
+from core.metrics import metrics
+from core.permissions import normalize_role
+from core.users import user_records
+from modules.shared.dataconnect_client import DataConnectError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TenantContext:
+    """
+    Authenticated caller and their tenant scope
+
+    Supports dict-style access (ctx["uid"], ctx.get("business_id")) so
+    existing handlers typed as Dict keep working.
+    """
+    uid: str
+    email: Optional[str] = None
+    email_verified: bool = False
+    name: Optional[str] = None
+    picture: Optional[str] = None
+    business_id: Optional[str] = None
+    role: Optional[str] = None
+    tier: Optional[str] = None
+    # None = every location of the business
+    location_ids: Optional[FrozenSet[str]] = None
+    # Where business_id/role came from: "claims", "database" or "none"
+    source: str = "claims"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def can_access_location(self, location_id: str) -> bool:
+        """Check if the caller may act on a location of their business"""
+        return self.location_ids is None or str(location_id) in self.location_ids
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        if self.location_ids is not None:
+            data["location_ids"] = sorted(self.location_ids)
+        return data
+
+
+class TenantResolver:
+    """
+    Builds TenantContext objects from decoded ID tokens
+
+    - Contexts are memoized per token (uid + iat) until the token's exp.
+    - Database fallbacks read the shared user record cache; invalidate()
+      drops both when claims are (re)assigned.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        maxsize = maxsize or settings.TENANT_CACHE_SIZE
+        self._contexts = TLRUCache(maxsize=maxsize, ttu=self._expires_at, timer=time.time)
+
+        # Metrics
+        self.hits = 0
+        self.from_claims = 0
+        self.from_database = 0
+        self.lookup_failures = 0
+
+    def _expires_at(self, key: Tuple, context: TenantContext, now: float) -> float:
+        return key[2]
+
+    @staticmethod
+    def _location_ids(value: Any) -> Optional[FrozenSet[str]]:
+        if not value:
+            return None
+        return frozenset(str(v) for v in value)
+
+    async def resolve(self, token_data: Dict[str, Any]) -> TenantContext:
+        """
+        Resolve the tenant context for a decoded token
+
+        Args:
+            token_data: Verified ID token claims
+
+        Returns:
+            TenantContext: business_id is None if the user has not onboarded
+            (or the fallback lookup failed)
+        """
+        uid = token_data.get("uid")
+        key = (uid, token_data.get("iat"), token_data.get("exp") or time.time() + 60)
+        context = self._contexts.get(key)
+        if context is not None:
+            self.hits += 1
+            return context
+
+        identity = {
+            "uid": uid,
+            "email": token_data.get("email"),
+            "email_verified": token_data.get("email_verified", False),
+            "name": token_data.get("name"),
+            "picture": token_data.get("picture"),
+        }
+
+        if token_data.get("business_id"):
+            self.from_claims += 1
+            context = TenantContext(
+                **identity,
+                business_id=token_data["business_id"],
+                role=normalize_role(token_data.get("role")),
+                tier=token_data.get("tier"),
+                location_ids=self._location_ids(token_data.get("location_ids")),
+                source="claims",
+            )
+        else:
+            try:
+                user = await user_records.get(uid)
+            except DataConnectError as e:
+                # Don't fail authentication over a tenant lookup; don't memoize either
+                self.lookup_failures += 1
+                logger.warning(f"⚠️ Tenant lookup failed for {uid}: {e}")
+                return TenantContext(**identity, source="none")
+
+            self.from_database += 1
+            if user and user.get("isActive", True):
+                context = TenantContext(
+                    **identity,
+                    business_id=user.get("businessId"),
+                    role=normalize_role(user.get("role")),
+                    source="database",
+                )
+            else:
+                context = TenantContext(**identity, source="none")
+
+        self._contexts[key] = context
+        return context
+
+    def invalidate(self, uid: str) -> None:
+        """Forget a user's cached tenant (call after setting their claims)"""
+        user_records.invalidate(uid=uid)
+        for key in [k for k in list(self._contexts.keys()) if k[0] == uid]:
+            self._contexts.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.from_claims + self.from_database + self.lookup_failures,
+            "from_claims": self.from_claims,
+            "from_database": self.from_database,
+            "lookup_failures": self.lookup_failures,
+            "size": len(self._contexts),
+        }
+
+
+# Global instance used by core.security.get_current_user
+tenant_resolver = TenantResolver()
+metrics.register_cache("tenant", tenant_resolver.stats)
@@ -0,0 +1,162 @@
+"""
+Verified ID Token Cache
+
+Caches decoded Firebase ID tokens so a client that sends the same token on
+every call (e.g. a POS terminal) pays for signature verification once per
+token instead of once per request. Verification itself runs on the blocking
+executor, and Google's public signing keys are refreshed in the background.
+"""
+
+from typing import Dict, Any, Optional
+import asyncio
+import hashlib
+import logging
+import os
+import time
+
+from cachetools import TLRUCache
+
+from config.firebase_config import auth
+from config.settings import settings
+from core.metrics import metrics
+from core.executors import blocking_executor
+from core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class VerifiedTokenCache:
+    """
+    Bounded cache of decoded ID tokens
+
+    - Keyed by SHA-256 of the raw token (tokens themselves are not retained).
+    - Entries expire at the token's `exp` claim minus EXPIRY_SKEW.
+    - Concurrent misses for the same token share one verification.
+    - Failed verifications are never cached.
+    """
+
+    # Stop serving a cached token this many seconds before it expires
+    EXPIRY_SKEW = 5
+
+    def __init__(self, maxsize: Optional[int] = None, prefetch_interval: Optional[float] = None):
+        self.enabled = settings.ID_TOKEN_CACHE_ENABLED
+        self.prefetch_interval = prefetch_interval or settings.ID_TOKEN_CERT_PREFETCH_INTERVAL
+        self._entries = TLRUCache(maxsize=maxsize or settings.ID_TOKEN_CACHE_SIZE, ttu=self._expires_at, timer=time.time)
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+        self._prefetch_task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.prefetches = 0
+
+    def _expires_at(self, key: bytes, decoded: Dict[str, Any], now: float) -> float:
+        return min(decoded.get("exp", now), now + 3600) - self.EXPIRY_SKEW
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    async def _verify_uncached(self, key: bytes, token: str) -> Dict[str, Any]:
+        try:
+            decoded = await blocking_executor.run(auth.verify_id_token, token)
+        except Exception:
+            self.failures += 1
+            raise
+        if self.enabled:
+            self._entries[key] = decoded
+        return decoded
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verify an ID token, serving repeats from the cache
+
+        Args:
+            token: Raw Firebase ID token
+
+        Returns:
+            Dict: Decoded token claims (shared between callers, treat as read-only)
+
+        Raises:
+            The firebase_admin.auth errors raised by verify_id_token
+        """
+        with tracer.span("auth.verify_id_token") as span:
+            key = self._key(token)
+            decoded = self._entries.get(key)
+            span.set_attribute("cache.hit", decoded is not None)
+            if decoded is not None:
+                self.hits += 1
+                return decoded
+
+            self.misses += 1
+            future = self._inflight.get(key)
+            if future is None:
+                future = asyncio.ensure_future(self._verify_uncached(key, token))
+                self._inflight[key] = future
+                future.add_done_callback(lambda f, k=key: self._inflight.pop(k, None))
+            return await asyncio.shield(future)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    # --- Signing key prefetch ---
+
+    def _prefetch_certs(self) -> None:
+        """
+        Fetch Google's ID token signing keys through the SDK's own
+        cache-control session, so verify_id_token finds them fresh
+        """
+        from firebase_admin import _token_gen
+
+        client = auth._get_client(None)
+        client._token_verifier.request(_token_gen.ID_TOKEN_CERT_URI)
+        self.prefetches += 1
+
+    async def _prefetch_loop(self) -> None:
+        while True:
+            try:
+                await blocking_executor.run(self._prefetch_certs)
+            except Exception as e:
+                logger.warning(f"⚠️ Signing key prefetch failed: {e}")
+            await asyncio.sleep(self.prefetch_interval)
+
+    def start(self) -> None:
+        """
+        Start the background signing key prefetch (call from the app lifespan)
+
+        Skipped under the Auth emulator, whose tokens are unsigned (DEV always
+        uses the emulator, even before a deferred Firebase initialization).
+        With LAZY_IMPORTS the first prefetch also loads the Admin SDK, off the
+        request path.
+        """
+        if os.environ.get("FIREBASE_AUTH_EMULATOR_HOST") or settings.ENV == "DEV":
+            return
+        if self._prefetch_task is None or self._prefetch_task.done():
+            self._prefetch_task = asyncio.create_task(self._prefetch_loop())
+
+    async def stop(self) -> None:
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+            try:
+                await self._prefetch_task
+            except asyncio.CancelledError:
+                pass
+            self._prefetch_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "failures": self.failures,
+            "size": len(self._entries),
+            "maxsize": self._entries.maxsize,
+            "prefetches": self.prefetches,
+        }
+
+
+# Global instance used by core.security.verify_firebase_token
+verified_token_cache = VerifiedTokenCache()
+metrics.register_cache("id_token", verified_token_cache.stats)
@@ -0,0 +1,343 @@
+"""
+Request Tracing
+
+OpenTelemetry-style spans with W3C trace context propagation, without the
+OpenTelemetry SDK:
+
+- TracingMiddleware starts a server span per request, continuing the
+  caller's `traceparent` when present.
+- Spans are opened with `tracer.span(name, attributes)` and nest through a
+  context variable, so they follow the request across awaits and into tasks.
+- Outgoing Data Connect calls carry `traceparent` for the current span.
+- Finished traces are exported off the event loop to the console (log) or
+  a JSON lines file (one span per line, OTLP-like field names).
+
+Sampling: a caller's sampled flag is honored (TRACE_RESPECT_PARENT);
+otherwise TRACE_SAMPLE_RATE of new traces are recorded. Unsampled requests
+keep their trace id for propagation but create no span objects.
+"""
+
+from typing import Dict, Any, Iterator, List, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import deque
+from dataclasses import dataclass, field
+import asyncio
+import logging
+import random
+import re
+import secrets
+import time
+
+from config.settings import settings
+from core.serialization import json_dumps
+
+logger = logging.getLogger(__name__)
+
+_TRACEPARENT = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identifies the active span; what traceparent carries between services"""
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[SpanContext]:
+    """Parse a W3C traceparent header; None if missing or malformed"""
+    if not value:
+        return None
+    match = _TRACEPARENT.match(value.strip().lower())
+    if not match:
+        return None
+    version, trace_id, span_id, flags = match.groups()
+    if version == "ff" or trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return SpanContext(trace_id=trace_id, span_id=span_id, sampled=bool(int(flags, 16) & 0x01))
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace"""
+    name: str
+    context: SpanContext
+    parent_span_id: Optional[str]
+    kind: str = "internal"
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    status: str = "OK"
+    status_message: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status = "ERROR"
+        self.status_message = f"{type(exc).__name__}: {exc}"
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+        if self.status_message:
+            data["status_message"] = self.status_message
+        return data
+
+
+class _NoopSpan:
+    """Stand-in yielded for unsampled traces; every call is a no-op"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+_current: ContextVar[Optional[SpanContext]] = ContextVar("trace_context", default=None)
+
+
+class Tracer:
+    """
+    Creates spans and exports finished traces
+
+    Spans of a trace are buffered until its local root span ends and then
+    queued for export together; spans ending later (background tasks) are
+    exported on their own.
+    """
+
+    def __init__(self):
+        self.enabled = settings.TRACING_ENABLED
+        self.sample_rate = settings.TRACE_SAMPLE_RATE
+        self.respect_parent = settings.TRACE_RESPECT_PARENT
+        self.exporter = settings.TRACE_EXPORTER
+        self.file_path = settings.TRACE_FILE_PATH
+        self.export_interval = settings.TRACE_EXPORT_INTERVAL
+        self.max_spans_per_trace = settings.TRACE_MAX_SPANS_PER_TRACE
+
+        self._open: Dict[str, List[Span]] = {}
+        self._pending: deque = deque(maxlen=settings.TRACE_MAX_PENDING_TRACES)
+        self._export_task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.traces_started = 0
+        self.traces_sampled = 0
+        self.spans_exported = 0
+        self.spans_dropped = 0
+
+    # --- Context ---
+
+    def current(self) -> Optional[SpanContext]:
+        return _current.get()
+
+    def current_traceparent(self) -> Optional[str]:
+        """traceparent header value for outgoing calls, or None outside a trace"""
+        context = _current.get()
+        return context.traceparent if context is not None else None
+
+    def _sample(self, parent: Optional[SpanContext]) -> bool:
+        if parent is not None and self.respect_parent:
+            return parent.sampled
+        return self.sample_rate >= 1.0 or (self.sample_rate > 0.0 and random.random() < self.sample_rate)
+
+    # --- Spans ---
+
+    @contextmanager
+    def start_trace(self, name: str, traceparent: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+        """
+        Open the server span for an incoming request
+
+        Continues the caller's trace when traceparent is valid.
+        """
+        parent = parse_traceparent(traceparent)
+        self.traces_started += 1
+        sampled = self._sample(parent)
+        trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        if not sampled:
+            token = _current.set(SpanContext(trace_id, secrets.token_hex(8), False))
+            try:
+                yield _NOOP_SPAN
+            finally:
+                _current.reset(token)
+            return
+
+        self.traces_sampled += 1
+        with self._span(name, trace_id, parent.span_id if parent else None, "server", attributes, root=True) as span:
+            yield span
+
+    @contextmanager
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None, kind: str = "internal") -> Iterator[Any]:
+        """
+        Open a child span of the current span
+
+        Usage:
+            with tracer.span("dataconnect.post", {"dataconnect.operation": name}) as span:
+                span.set_attribute("http.status_code", 200)
+        """
+        parent = _current.get()
+        if parent is None or not parent.sampled:
+            yield _NOOP_SPAN
+            return
+        with self._span(name, parent.trace_id, parent.span_id, kind, attributes) as span:
+            yield span
+
+    @contextmanager
+    def _span(
+        self,
+        name: str,
+        trace_id: str,
+        parent_span_id: Optional[str],
+        kind: str,
+        attributes: Optional[Dict[str, Any]],
+        root: bool = False
+    ) -> Iterator[Span]:
+        span = Span(
+            name=name,
+            context=SpanContext(trace_id, secrets.token_hex(8), True),
+            parent_span_id=parent_span_id,
+            kind=kind,
+            attributes=dict(attributes) if attributes else {},
+        )
+        if root:
+            self._open[trace_id] = []
+        token = _current.set(span.context)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current.reset(token)
+            span.end_ns = time.time_ns()
+            self._finish(span, root)
+
+    def _finish(self, span: Span, root: bool) -> None:
+        trace_id = span.context.trace_id
+        spans = self._open.get(trace_id)
+        if spans is None:
+            # Outlived its trace's root span (e.g. a background task)
+            self._pending.append([span])
+            return
+        if len(spans) < self.max_spans_per_trace:
+            spans.append(span)
+        else:
+            self.spans_dropped += 1
+        if root:
+            self._pending.append(self._open.pop(trace_id))
+
+    # --- Export ---
+
+    def flush(self) -> int:
+        """Export queued traces (blocking; the export loop runs it off the event loop)"""
+        exported = 0
+        while self._pending:
+            spans = self._pending.popleft()
+            if self.exporter == "file":
+                with open(self.file_path, "ab") as f:
+                    for span in spans:
+                        f.write(json_dumps(span.to_dict()) + b"\n")
+            elif self.exporter == "console":
+                self._log_trace(spans)
+            exported += len(spans)
+        self.spans_exported += exported
+        return exported
+
+    def _log_trace(self, spans: List[Span]) -> None:
+        children: Dict[Optional[str], List[Span]] = {}
+        ids = {span.context.span_id for span in spans}
+        for span in sorted(spans, key=lambda s: s.start_ns):
+            parent = span.parent_span_id if span.parent_span_id in ids else None
+            children.setdefault(parent, []).append(span)
+
+        lines = []
+
+        def walk(parent: Optional[str], depth: int) -> None:
+            for span in children.get(parent, []):
+                flag = "" if span.status == "OK" else f"  ❗ {span.status_message}"
+                lines.append(f"{'  ' * depth}{span.name} {span.duration_ms:.2f}ms{flag}")
+                walk(span.context.span_id, depth + 1)
+
+        walk(None, 0)
+        logger.info(f"🧵 trace {spans[0].context.trace_id}\n" + "\n".join(lines))
+
+    async def _export_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.export_interval)
+            if self._pending:
+                try:
+                    await asyncio.to_thread(self.flush)
+                except Exception as e:
+                    logger.warning(f"⚠️ Trace export failed: {e}")
+
+    def start(self) -> None:
+        """Start the background exporter (call from the app lifespan)"""
+        if self.enabled and self.exporter != "none" and (self._export_task is None or self._export_task.done()):
+            self._export_task = asyncio.create_task(self._export_loop())
+
+    async def stop(self) -> None:
+        if self._export_task is not None:
+            self._export_task.cancel()
+            try:
+                await self._export_task
+            except asyncio.CancelledError:
+                pass
+            self._export_task = None
+        if self._pending:
+            await asyncio.to_thread(self.flush)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "traces_started": self.traces_started,
+            "traces_sampled": self.traces_sampled,
+            "spans_exported": self.spans_exported,
+            "spans_dropped": self.spans_dropped,
+            "pending_traces": len(self._pending),
+        }
+
+
+# Global instance
+tracer = Tracer()
+
+
+def instrument_fastapi() -> None:
+    """
+    Trace FastAPI's response model validation/serialization
+
+    fastapi.routing looks serialize_response up at call time, so wrapping
+    the module attribute puts a span around it for every route.
+    """
+    import fastapi.routing
+
+    original = fastapi.routing.serialize_response
+    if getattr(original, "__traced__", False):
+        return
+
+    async def serialize_response(*args: Any, **kwargs: Any) -> Any:
+        with tracer.span("fastapi.serialize_response"):
+            return await original(*args, **kwargs)
+
+    serialize_response.__traced__ = True
+    fastapi.routing.serialize_response = serialize_response
@@ -0,0 +1,120 @@
+"""
+User Records
+
+Cached GetUserByAuthId lookups shared by permission resolution and tenant
+context resolution, so a cold request that needs both costs one Data Connect
+query instead of two.
+"""
+
+from typing import Dict, Any, Optional
+import asyncio
+import logging
+
+from cachetools import TTLCache
+
+from config.settings import settings
+from core.metrics import metrics
+from modules.shared.dataconnect_client import async_dataconnect_client
+
+logger = logging.getLogger(__name__)
+
+# Cached "no such user" (TTLCache.get cannot tell it apart from a miss)
+_MISSING = object()
+
+
+class UserRecordCache:
+    """
+    User rows by Firebase UID
+
+    Entries (including "not found") live for USER_RECORD_CACHE_TTL seconds and
+    are dropped with invalidate() when a user's role, grants or business
+    change. Concurrent misses for the same user share one lookup; failed
+    lookups are not cached.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        self._entries: TTLCache = TTLCache(
+            maxsize=maxsize or settings.USER_RECORD_CACHE_SIZE,
+            ttl=ttl or settings.USER_RECORD_CACHE_TTL
+        )
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+    async def _load(self, uid: str) -> Optional[Dict[str, Any]]:
+        result = await async_dataconnect_client.execute_query("GetUserByAuthId", {"id": uid})
+        user = (result.get("data") or {}).get("user")
+        # Not if the user was invalidated while the lookup was in flight
+        if self._inflight.get(uid) is asyncio.current_task():
+            self._entries[uid] = user if user is not None else _MISSING
+        return user
+
+    def _forget(self, uid: str, future: asyncio.Future) -> None:
+        if self._inflight.get(uid) is future:
+            del self._inflight[uid]
+
+    async def get(self, uid: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a user's row
+
+        Returns:
+            Optional[Dict]: The User row, None if there is none
+
+        Raises:
+            DataConnectError: If the lookup fails
+        """
+        user = self._entries.get(uid)
+        if user is not None:
+            self.hits += 1
+            return None if user is _MISSING else user
+
+        self.misses += 1
+        future = self._inflight.get(uid)
+        if future is None:
+            future = asyncio.ensure_future(self._load(uid))
+            self._inflight[uid] = future
+            future.add_done_callback(lambda f, k=uid: self._forget(k, f))
+        return await asyncio.shield(future)
+
+    def invalidate(self, uid: Optional[str] = None, business_id: Optional[str] = None) -> int:
+        """
+        Drop cached rows for a user, a whole business, or everything
+        """
+        if uid is None and business_id is None:
+            count = len(self._entries)
+            self._entries.clear()
+            self._inflight.clear()
+        else:
+            if uid is not None:
+                self._inflight.pop(uid, None)
+            else:
+                self._inflight.clear()
+            keys = [
+                k for k, user in list(self._entries.items())
+                if (uid is None or k == uid)
+                and (business_id is None or (user is not _MISSING and user.get("businessId") == business_id))
+            ]
+            for k in keys:
+                self._entries.pop(k, None)
+            count = len(keys)
+        self.invalidated += count
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "invalidated": self.invalidated,
+            "size": len(self._entries),
+            "maxsize": self._entries.maxsize,
+        }
+
+
+# Global instance used by core.permissions and core.tenant
+user_records = UserRecordCache()
+metrics.register_cache("user_records", user_records.stats)
@@ -0,0 +1,16 @@
+"""
+Local Data Connect stand-in
+
+An in-process replacement for the Data Connect service backed by SQLite. It
+reads dataconnect/schema and dataconnect/connector and answers executeQuery /
+executeMutation requests with the same REST shape, so the backend can be load
+tested and integration tested without the emulator or a Cloud SQL instance.
+
+    python -m dataconnect_standin --port 9399
+"""
+
+from .executor import StandinExecutor, OperationError
+from .schema import StandinSchema
+from .server import create_app, DEFAULT_DATACONNECT_DIR
+
+__all__ = ["StandinExecutor", "OperationError", "StandinSchema", "create_app", "DEFAULT_DATACONNECT_DIR"]
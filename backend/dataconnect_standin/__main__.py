@@ -0,0 +1,33 @@
+"""
+Run the Data Connect stand-in
+
+    python -m dataconnect_standin [--host 127.0.0.1] [--port 9399] [--database :memory:]
+
+Port 9399 is the emulator's default, so the backend's DEV endpoint talks to
+the stand-in without any configuration change.
+"""
+
+import argparse
+from pathlib import Path
+
+import uvicorn
+
+from .executor import StandinExecutor
+from .server import create_app, DEFAULT_DATACONNECT_DIR
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Data Connect stand-in (SQLite)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9399)
+    parser.add_argument("--dataconnect-dir", type=Path, default=DEFAULT_DATACONNECT_DIR)
+    parser.add_argument("--database", default=":memory:", help="SQLite database file (default: in-memory)")
+    args = parser.parse_args()
+
+    executor = StandinExecutor.from_directory(args.dataconnect_dir, args.database)
+    print(f"✅ Loaded {len(executor.schema.tables)} tables and {len(executor.operations)} operations from {args.dataconnect_dir}")
+    uvicorn.run(create_app(executor), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
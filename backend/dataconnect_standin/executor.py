@@ -0,0 +1,420 @@
+"""
+Operation executor for the Data Connect stand-in
+
+Runs the named connector operations against an SQLite database whose tables
+mirror dataconnect/schema. Supports the query and mutation shapes the
+connector uses:
+
+- <type>(id: ...) / <type>(key: ...)          single row by key
+- <types>(where, orderBy, limit, offset)      filtered list
+- <type>_insert / _insertMany / _upsert       inserts (returns key objects)
+- <type>_update / _updateMany                 updates
+- <type>_delete / _deleteMany                 deletes (returns row count)
+
+Nested selections on relation fields (e.g. manufacturer { name }) are
+resolved through the relation's foreign key.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
+from pathlib import Path
+import json
+import sqlite3
+import threading
+import uuid
+
+from .graphql import (
+    parse_operations,
+    OperationDefinition,
+    Selection,
+    Variable,
+    EnumValue,
+)
+from .schema import StandinSchema, Table, Column
+
+
+class OperationError(Exception):
+    """
+    Raised when an operation cannot be executed
+
+    status mirrors the Google API error status returned by the real service.
+    """
+
+    def __init__(self, message: str, status: str = "INVALID_ARGUMENT", code: int = 400):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+_FILTER_OPERATORS = {
+    "eq": "=",
+    "ne": "!=",
+    "gt": ">",
+    "ge": ">=",
+    "lt": "<",
+    "le": "<=",
+}
+
+_MUTATION_SUFFIXES = (
+    "_insertMany", "_insert", "_upsertMany", "_upsert",
+    "_updateMany", "_update", "_deleteMany", "_delete",
+)
+
+
+class StandinExecutor:
+    """
+    Executes connector operations against an SQLite database
+
+    A single connection is shared and guarded by a lock; each operation runs
+    in its own transaction, so @transaction mutations are atomic.
+    """
+
+    def __init__(self, schema: StandinSchema, operations: List[OperationDefinition], database: str = ":memory:"):
+        self.schema = schema
+        self.operations: Dict[str, OperationDefinition] = {op.name: op for op in operations}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(database, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        for table in schema.tables.values():
+            self._conn.execute(table.create_statement())
+
+    @classmethod
+    def from_directory(cls, dataconnect_dir: Path, database: str = ":memory:") -> "StandinExecutor":
+        """Load schema and connector operations from a dataconnect/ directory"""
+        dataconnect_dir = Path(dataconnect_dir)
+        schema = StandinSchema.load(dataconnect_dir)
+        operations = []
+        for path in sorted((dataconnect_dir / "connector").rglob("*.gql")):
+            operations.extend(parse_operations(path.read_text(encoding="utf-8")))
+        return cls(schema, operations, database)
+
+    # --- Public API ---
+
+    def execute(self, operation_name: str, variables: Optional[Dict[str, Any]], kind: str) -> Dict[str, Any]:
+        """
+        Execute a named operation
+
+        Args:
+            operation_name: Connector operation name
+            variables: Operation variables
+            kind: "query" or "mutation" (must match the operation)
+
+        Returns:
+            Dict: The `data` object of the response
+        """
+        operation = self.operations.get(operation_name)
+        if operation is None:
+            raise OperationError(f"Operation {operation_name} not found in connector", "NOT_FOUND", 404)
+        if operation.kind != kind:
+            raise OperationError(f"Operation {operation_name} is a {operation.kind}, not a {kind}")
+
+        resolved = self._bind_variables(operation, variables or {})
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                data = {}
+                for selection in operation.selections:
+                    if kind == "query":
+                        data[selection.response_key] = self._query_field(selection, resolved)
+                    else:
+                        data[selection.response_key] = self._mutation_field(selection, resolved)
+                self._conn.execute("COMMIT")
+                return data
+            except sqlite3.IntegrityError as e:
+                self._conn.execute("ROLLBACK")
+                if "UNIQUE" in str(e):
+                    raise OperationError(f"{operation_name}: {e}", "ALREADY_EXISTS", 409)
+                raise OperationError(f"{operation_name}: {e}")
+            except sqlite3.Error as e:
+                self._conn.execute("ROLLBACK")
+                raise OperationError(f"{operation_name}: {e}")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def insert(self, type_name: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a row directly (for seeding fixtures and benchmarks)"""
+        with self._lock:
+            return self._insert(self.schema.tables[type_name], row)
+
+    def insert_many(self, type_name: str, rows: List[Dict[str, Any]]) -> int:
+        """Insert many rows in one transaction (for seeding)"""
+        table = self.schema.tables[type_name]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for row in rows:
+                    self._insert(table, row)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return len(rows)
+
+    # --- Variables & values ---
+
+    def _bind_variables(self, operation: OperationDefinition, variables: Dict[str, Any]) -> Dict[str, Any]:
+        bound = {}
+        for definition in operation.variables:
+            if definition.name in variables:
+                bound[definition.name] = variables[definition.name]
+            elif definition.default is not None:
+                bound[definition.name] = definition.default
+            elif definition.type.non_null:
+                raise OperationError(f"Missing required variable ${definition.name}")
+            else:
+                bound[definition.name] = None
+        return bound
+
+    def _resolve(self, value: Any, variables: Dict[str, Any]) -> Any:
+        if isinstance(value, Variable):
+            return variables.get(value.name)
+        if isinstance(value, EnumValue):
+            return value.name
+        if isinstance(value, list):
+            return [self._resolve(v, variables) for v in value]
+        if isinstance(value, dict):
+            return {k: self._resolve(v, variables) for k, v in value.items()}
+        return value
+
+    @staticmethod
+    def _to_sql(column: Column, value: Any) -> Any:
+        if value is None:
+            return None
+        if column.is_list or (column.is_json and not isinstance(value, str)):
+            return json.dumps(value)
+        if column.scalar == "Boolean":
+            return 1 if value else 0
+        if column.scalar == "UUID":
+            try:
+                return str(uuid.UUID(str(value)))
+            except ValueError:
+                raise OperationError(f"Invalid UUID for {column.name}: {value}")
+        return value
+
+    @staticmethod
+    def _from_sql(column: Column, value: Any) -> Any:
+        if value is None:
+            return None
+        if column.is_list:
+            return json.loads(value)
+        if column.scalar == "Boolean":
+            return bool(value)
+        return value
+
+    @staticmethod
+    def _default(column: Column) -> Any:
+        if column.default_expr == "uuidV4()":
+            return str(uuid.uuid4())
+        if column.default_expr == "request.time":
+            return datetime.utcnow().isoformat(timespec="milliseconds") + "Z"
+        if column.default_expr is not None:
+            raise OperationError(f"Unsupported default expression: {column.default_expr}")
+        return column.default_value
+
+    # --- Queries ---
+
+    def _root(self, field_name: str) -> Tuple[Table, str]:
+        root = self.schema.root_fields.get(field_name)
+        if root is None:
+            raise OperationError(f"Unknown root field: {field_name}")
+        return root
+
+    def _query_field(self, selection: Selection, variables: Dict[str, Any]) -> Any:
+        table, cardinality = self._root(selection.name)
+        args = self._resolve(selection.args, variables)
+
+        if cardinality == "one":
+            key = args.get("key") or {k: args[k] for k in table.key if k in args}
+            if not key:
+                raise OperationError(f"{selection.name} requires id or key")
+            rows = self._select(table, where={k: {"eq": v} for k, v in key.items()}, limit=1)
+            return self._shape(table, rows[0], selection.selections) if rows else None
+
+        rows = self._select(
+            table,
+            where=args.get("where"),
+            order_by=args.get("orderBy"),
+            limit=args.get("limit"),
+            offset=args.get("offset"),
+        )
+        return [self._shape(table, row, selection.selections) for row in rows]
+
+    def _select(
+        self,
+        table: Table,
+        where: Optional[Dict[str, Any]] = None,
+        order_by: Optional[List[Dict[str, str]]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> List[sqlite3.Row]:
+        sql = f"SELECT * FROM {table.sql_name}"
+        params: List[Any] = []
+        if where:
+            clause = self._where(table, where, params)
+            if clause:
+                sql += f" WHERE {clause}"
+        if order_by:
+            terms = []
+            for entry in (order_by if isinstance(order_by, list) else [order_by]):
+                for name, direction in entry.items():
+                    self._column(table, name)
+                    terms.append(f'"{name}" {"DESC" if direction == "DESC" else "ASC"}')
+            sql += " ORDER BY " + ", ".join(terms)
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limit if limit is not None else -1, offset or 0])
+        return self._conn.execute(sql, params).fetchall()
+
+    def _column(self, table: Table, name: str) -> Column:
+        column = table.columns.get(name)
+        if column is None:
+            raise OperationError(f"{table.type_name} has no field {name}")
+        return column
+
+    def _where(self, table: Table, where: Dict[str, Any], params: List[Any]) -> str:
+        clauses = []
+        for name, condition in where.items():
+            if condition is None:
+                continue
+            if name in ("_and", "_or"):
+                parts = [self._where(table, sub, params) for sub in condition]
+                parts = [p for p in parts if p]
+                if parts:
+                    joiner = " AND " if name == "_and" else " OR "
+                    clauses.append("(" + joiner.join(parts) + ")")
+                continue
+            if name == "_not":
+                inner = self._where(table, condition, params)
+                if inner:
+                    clauses.append(f"NOT ({inner})")
+                continue
+
+            column = self._column(table, name)
+            for op, value in condition.items():
+                if op in _FILTER_OPERATORS:
+                    if value is None:
+                        continue
+                    clauses.append(f'"{name}" {_FILTER_OPERATORS[op]} ?')
+                    params.append(self._to_sql(column, value))
+                elif op in ("in", "nin"):
+                    values = [self._to_sql(column, v) for v in (value or [])]
+                    if not values:
+                        clauses.append("0" if op == "in" else "1")
+                        continue
+                    marks = ", ".join("?" for _ in values)
+                    clauses.append(f'"{name}" {"IN" if op == "in" else "NOT IN"} ({marks})')
+                    params.extend(values)
+                elif op == "isNull":
+                    clauses.append(f'"{name}" IS {"" if value else "NOT "}NULL')
+                else:
+                    raise OperationError(f"Unsupported filter operator: {op}")
+        return " AND ".join(clauses)
+
+    def _shape(self, table: Table, row: sqlite3.Row, selections: List[Selection]) -> Dict[str, Any]:
+        result = {}
+        for selection in selections:
+            if selection.name == "__typename":
+                result[selection.response_key] = table.type_name
+            elif selection.name in table.relations:
+                relation = table.relations[selection.name]
+                target = self.schema.tables[relation.target]
+                foreign_value = row[relation.foreign_key]
+                related = None
+                if foreign_value is not None:
+                    rows = self._select(target, where={target.key[0]: {"eq": foreign_value}}, limit=1)
+                    related = self._shape(target, rows[0], selection.selections) if rows else None
+                result[selection.response_key] = related
+            else:
+                column = self._column(table, selection.name)
+                result[selection.response_key] = self._from_sql(column, row[column.name])
+        return result
+
+    # --- Mutations ---
+
+    def _mutation_field(self, selection: Selection, variables: Dict[str, Any]) -> Any:
+        for suffix in _MUTATION_SUFFIXES:
+            if selection.name.endswith(suffix):
+                table, _ = self._root(selection.name[:-len(suffix)])
+                action = suffix[1:]
+                break
+        else:
+            raise OperationError(f"Unsupported mutation field: {selection.name}")
+
+        args = self._resolve(selection.args, variables)
+
+        if action in ("insert", "upsert"):
+            return self._insert(table, args.get("data") or {}, upsert=action == "upsert")
+        if action in ("insertMany", "upsertMany"):
+            return [self._insert(table, row, upsert=action == "upsertMany") for row in args.get("data") or []]
+        if action == "update":
+            return self._update(table, self._key_filter(table, args), args.get("data") or {}, single=True)
+        if action == "updateMany":
+            return self._update(table, args.get("where") or {}, args.get("data") or {}, single=False)
+        if action == "delete":
+            key = self._key_filter(table, args)
+            return self._delete(table, key, single=True)
+        # deleteMany
+        if not args.get("all") and not args.get("where"):
+            raise OperationError(f"{selection.name} requires where or all: true")
+        return self._delete(table, args.get("where") or {}, single=False)
+
+    def _key_filter(self, table: Table, args: Dict[str, Any]) -> Dict[str, Any]:
+        key = args.get("key") or {k: args[k] for k in table.key if k in args}
+        if not key:
+            raise OperationError(f"{table.singular} mutation requires id or key")
+        return {k: {"eq": v} for k, v in key.items()}
+
+    def _insert(self, table: Table, data: Dict[str, Any], upsert: bool = False) -> Dict[str, Any]:
+        row = {}
+        for name, column in table.columns.items():
+            if name in data and data[name] is not None:
+                row[name] = self._to_sql(column, data[name])
+            elif column.has_default:
+                row[name] = self._to_sql(column, self._default(column))
+            elif column.non_null:
+                raise OperationError(f"{table.type_name}.{name} is required")
+
+        unknown = set(data) - set(table.columns)
+        if unknown:
+            raise OperationError(f"{table.type_name} has no field(s): {', '.join(sorted(unknown))}")
+
+        names = ", ".join(f'"{n}"' for n in row)
+        marks = ", ".join("?" for _ in row)
+        verb = "INSERT OR REPLACE" if upsert else "INSERT"
+        self._conn.execute(f"{verb} INTO {table.sql_name} ({names}) VALUES ({marks})", list(row.values()))
+        return {k: row.get(k) for k in table.key}
+
+    def _update(self, table: Table, where: Dict[str, Any], data: Dict[str, Any], single: bool) -> Any:
+        if not data:
+            raise OperationError(f"{table.singular} update requires data")
+        assignments, params = [], []
+        for name, value in data.items():
+            column = self._column(table, name)
+            assignments.append(f'"{name}" = ?')
+            params.append(self._to_sql(column, value))
+        if "updatedAt" in table.columns and "updatedAt" not in data:
+            assignments.append('"updatedAt" = ?')
+            params.append(self._default(table.columns["updatedAt"]))
+
+        where_params: List[Any] = []
+        clause = self._where(table, where, where_params)
+        sql = f"UPDATE {table.sql_name} SET {', '.join(assignments)}"
+        if clause:
+            sql += f" WHERE {clause}"
+        count = self._conn.execute(sql, params + where_params).rowcount
+        if single:
+            return {k: where[k]["eq"] for k in table.key if k in where} if count else None
+        return count
+
+    def _delete(self, table: Table, where: Dict[str, Any], single: bool) -> Any:
+        params: List[Any] = []
+        clause = self._where(table, where, params)
+        sql = f"DELETE FROM {table.sql_name}"
+        if clause:
+            sql += f" WHERE {clause}"
+        count = self._conn.execute(sql, params).rowcount
+        if single:
+            return {k: where[k]["eq"] for k in table.key if k in where} if count else None
+        return count
@@ -0,0 +1,328 @@
+"""
+Minimal GraphQL reader for the Data Connect stand-in
+
+Parses the subset of GraphQL used by dataconnect/schema (type and enum
+definitions with directives) and dataconnect/connector (named queries and
+mutations with variables, arguments, aliases and selection sets).
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
+import json
+import re
+
+
+class GraphQLSyntaxError(ValueError):
+    """Raised when a .gql document cannot be parsed"""
+
+
+# --- AST ---
+
+@dataclass
+class TypeRef:
+    """Type reference: Name, Name!, [Name!]!"""
+    name: str
+    non_null: bool = False
+    is_list: bool = False
+
+
+@dataclass
+class Variable:
+    """$name reference inside an argument value"""
+    name: str
+
+
+@dataclass
+class EnumValue:
+    """Bare enum literal (ASC, BUSINESS_ADMIN, ...)"""
+    name: str
+
+
+@dataclass
+class Directive:
+    name: str
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class FieldDefinition:
+    name: str
+    type: TypeRef
+    directives: List[Directive] = field(default_factory=list)
+
+    def directive(self, name: str) -> Optional[Directive]:
+        return next((d for d in self.directives if d.name == name), None)
+
+
+@dataclass
+class TypeDefinition:
+    name: str
+    fields: List[FieldDefinition]
+    directives: List[Directive] = field(default_factory=list)
+
+    def directive(self, name: str) -> Optional[Directive]:
+        return next((d for d in self.directives if d.name == name), None)
+
+
+@dataclass
+class EnumDefinition:
+    name: str
+    values: List[str]
+
+
+@dataclass
+class Selection:
+    name: str
+    alias: Optional[str] = None
+    args: Dict[str, Any] = field(default_factory=dict)
+    selections: List["Selection"] = field(default_factory=list)
+
+    @property
+    def response_key(self) -> str:
+        return self.alias or self.name
+
+
+@dataclass
+class VariableDefinition:
+    name: str
+    type: TypeRef
+    default: Any = None
+
+
+@dataclass
+class OperationDefinition:
+    kind: str  # "query" or "mutation"
+    name: str
+    variables: List[VariableDefinition]
+    directives: List[Directive]
+    selections: List[Selection]
+
+
+# --- Tokenizer ---
+
+_TOKEN_RE = re.compile(r'''
+    (?P<block>"""(?:.|\n)*?""")
+  | (?P<string>"(?:\\.|[^"\\])*")
+  | (?P<comment>\#[^\n]*)
+  | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<name>[_A-Za-z][_0-9A-Za-z]*)
+  | (?P<punct>[{}()\[\]:!$@=,|&.])
+  | (?P<ws>\s+)
+''', re.VERBOSE)
+
+
+def tokenize(source: str) -> List[Tuple[str, str]]:
+    """Split a document into (kind, text) tokens, dropping comments and whitespace"""
+    tokens = []
+    pos = 0
+    while pos < len(source):
+        match = _TOKEN_RE.match(source, pos)
+        if not match:
+            line = source.count("\n", 0, pos) + 1
+            raise GraphQLSyntaxError(f"Unexpected character {source[pos]!r} on line {line}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        pos = match.end()
+        # Commas are insignificant in GraphQL
+        if kind in ("ws", "comment") or text == ",":
+            continue
+        tokens.append((kind, text))
+    return tokens
+
+
+# --- Parser ---
+
+class _Parser:
+    def __init__(self, source: str):
+        self.tokens = tokenize(source)
+        self.pos = 0
+
+    def peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def next(self) -> Tuple[str, str]:
+        token = self.peek()
+        if token[0] is None:
+            raise GraphQLSyntaxError("Unexpected end of document")
+        self.pos += 1
+        return token
+
+    def expect(self, text: str) -> None:
+        kind, value = self.next()
+        if value != text:
+            raise GraphQLSyntaxError(f"Expected {text!r}, got {value!r}")
+
+    def accept(self, text: str) -> bool:
+        if self.peek()[1] == text:
+            self.pos += 1
+            return True
+        return False
+
+    def name(self) -> str:
+        kind, value = self.next()
+        if kind != "name":
+            raise GraphQLSyntaxError(f"Expected a name, got {value!r}")
+        return value
+
+    # Shared pieces
+
+    def type_ref(self) -> TypeRef:
+        if self.accept("["):
+            inner = self.type_ref()
+            self.expect("]")
+            ref = TypeRef(name=inner.name, is_list=True)
+        else:
+            ref = TypeRef(name=self.name())
+        ref.non_null = self.accept("!")
+        return ref
+
+    def value(self) -> Any:
+        kind, text = self.peek()
+        if text == "$":
+            self.next()
+            return Variable(self.name())
+        if text == "[":
+            self.next()
+            items = []
+            while not self.accept("]"):
+                items.append(self.value())
+            return items
+        if text == "{":
+            self.next()
+            obj = {}
+            while not self.accept("}"):
+                key = self.name()
+                self.expect(":")
+                obj[key] = self.value()
+            return obj
+        self.next()
+        if kind == "string":
+            return json.loads(text)
+        if kind == "block":
+            return text[3:-3].strip()
+        if kind == "number":
+            return float(text) if any(c in text for c in ".eE") else int(text)
+        if kind == "name":
+            if text == "true":
+                return True
+            if text == "false":
+                return False
+            if text == "null":
+                return None
+            return EnumValue(text)
+        raise GraphQLSyntaxError(f"Unexpected value {text!r}")
+
+    def arguments(self) -> Dict[str, Any]:
+        args = {}
+        if self.accept("("):
+            while not self.accept(")"):
+                key = self.name()
+                self.expect(":")
+                args[key] = self.value()
+        return args
+
+    def directives(self) -> List[Directive]:
+        directives = []
+        while self.accept("@"):
+            directives.append(Directive(name=self.name(), args=self.arguments()))
+        return directives
+
+    def skip_description(self) -> None:
+        while self.peek()[0] in ("block", "string"):
+            self.next()
+
+    # Schema definitions
+
+    def schema(self) -> Tuple[List[TypeDefinition], List[EnumDefinition]]:
+        types, enums = [], []
+        while self.peek()[0] is not None:
+            self.skip_description()
+            if self.peek()[0] is None:
+                break
+            keyword = self.name()
+            if keyword == "type":
+                types.append(self.type_definition())
+            elif keyword == "enum":
+                enums.append(self.enum_definition())
+            elif keyword in ("scalar", "extend", "input", "interface", "union"):
+                raise GraphQLSyntaxError(f"Unsupported schema definition: {keyword}")
+            else:
+                raise GraphQLSyntaxError(f"Unexpected {keyword!r} in schema")
+        return types, enums
+
+    def type_definition(self) -> TypeDefinition:
+        name = self.name()
+        directives = self.directives()
+        self.expect("{")
+        fields = []
+        while not self.accept("}"):
+            self.skip_description()
+            field_name = self.name()
+            self.expect(":")
+            fields.append(FieldDefinition(name=field_name, type=self.type_ref(), directives=self.directives()))
+        return TypeDefinition(name=name, fields=fields, directives=directives)
+
+    def enum_definition(self) -> EnumDefinition:
+        name = self.name()
+        self.directives()
+        self.expect("{")
+        values = []
+        while not self.accept("}"):
+            self.skip_description()
+            values.append(self.name())
+            self.directives()
+        return EnumDefinition(name=name, values=values)
+
+    # Operations
+
+    def operations(self) -> List[OperationDefinition]:
+        operations = []
+        while self.peek()[0] is not None:
+            kind = self.name()
+            if kind not in ("query", "mutation"):
+                raise GraphQLSyntaxError(f"Unsupported operation type: {kind}")
+            name = self.name()
+            variables = []
+            if self.accept("("):
+                while not self.accept(")"):
+                    self.expect("$")
+                    var_name = self.name()
+                    self.expect(":")
+                    var_type = self.type_ref()
+                    default = self.value() if self.accept("=") else None
+                    self.directives()
+                    variables.append(VariableDefinition(name=var_name, type=var_type, default=default))
+            directives = self.directives()
+            operations.append(OperationDefinition(
+                kind=kind,
+                name=name,
+                variables=variables,
+                directives=directives,
+                selections=self.selection_set()
+            ))
+        return operations
+
+    def selection_set(self) -> List[Selection]:
+        self.expect("{")
+        selections = []
+        while not self.accept("}"):
+            name = self.name()
+            alias = None
+            if self.accept(":"):
+                alias, name = name, self.name()
+            args = self.arguments()
+            self.directives()
+            children = self.selection_set() if self.peek()[1] == "{" else []
+            selections.append(Selection(name=name, alias=alias, args=args, selections=children))
+        return selections
+
+
+def parse_schema(source: str) -> Tuple[List[TypeDefinition], List[EnumDefinition]]:
+    """Parse type and enum definitions from a schema document"""
+    return _Parser(source).schema()
+
+
+def parse_operations(source: str) -> List[OperationDefinition]:
+    """Parse named queries and mutations from a connector document"""
+    return _Parser(source).operations()
@@ -0,0 +1,192 @@
+"""
+Table model for the Data Connect stand-in
+
+Builds SQLite table definitions from the @table types in dataconnect/schema,
+following Data Connect's conventions: lowerCamel singular/plural root fields,
+an implicit UUID `id` key, and a `<field>Id` foreign-key column for every
+relation field.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .graphql import parse_schema, TypeDefinition, FieldDefinition
+
+
+# Scalars stored as INTEGER / REAL; everything else (UUID, String, Date, Timestamp, enums) is TEXT
+INTEGER_SCALARS = {"Int", "Int64", "Boolean"}
+REAL_SCALARS = {"Float"}
+
+
+def lower_camel(name: str) -> str:
+    return name[:1].lower() + name[1:]
+
+
+def pluralize(name: str) -> str:
+    """English plural used for list root fields (product -> products, business -> businesses)"""
+    if name.endswith(("s", "x", "z", "ch", "sh")):
+        return name + "es"
+    if name.endswith("y") and name[-2:-1] not in "aeiou":
+        return name[:-1] + "ies"
+    return name + "s"
+
+
+@dataclass
+class Column:
+    name: str
+    scalar: str
+    non_null: bool = False
+    is_list: bool = False
+    is_json: bool = False
+    default_expr: Optional[str] = None
+    default_value: Any = None
+
+    @property
+    def has_default(self) -> bool:
+        return self.default_expr is not None or self.default_value is not None
+
+    @property
+    def sql_type(self) -> str:
+        if self.is_list or self.is_json:
+            return "TEXT"
+        if self.scalar in INTEGER_SCALARS:
+            return "INTEGER"
+        if self.scalar in REAL_SCALARS:
+            return "REAL"
+        return "TEXT"
+
+
+@dataclass
+class Relation:
+    name: str
+    target: str          # target type name
+    foreign_key: str     # column holding the target's key
+    non_null: bool = False
+
+
+@dataclass
+class Table:
+    type_name: str
+    columns: Dict[str, Column] = field(default_factory=dict)
+    relations: Dict[str, Relation] = field(default_factory=dict)
+    key: List[str] = field(default_factory=lambda: ["id"])
+
+    @property
+    def singular(self) -> str:
+        return lower_camel(self.type_name)
+
+    @property
+    def plural(self) -> str:
+        return pluralize(self.singular)
+
+    @property
+    def sql_name(self) -> str:
+        return f'"{self.type_name}"'
+
+    def create_statement(self) -> str:
+        columns = []
+        for column in self.columns.values():
+            definition = f'"{column.name}" {column.sql_type}'
+            # Defaults are filled in by the executor, so NOT NULL can be enforced
+            if column.non_null:
+                definition += " NOT NULL"
+            columns.append(definition)
+        key = ", ".join(f'"{k}"' for k in self.key)
+        return f"CREATE TABLE IF NOT EXISTS {self.sql_name} ({', '.join(columns)}, PRIMARY KEY ({key}))"
+
+
+class StandinSchema:
+    """
+    All @table types of a Data Connect service, indexed by root field name
+    """
+
+    def __init__(self, tables: Dict[str, Table], enums: Dict[str, List[str]]):
+        self.tables = tables
+        self.enums = enums
+        # root field name -> (table, "one" | "many")
+        self.root_fields: Dict[str, Tuple[Table, str]] = {}
+        for table in tables.values():
+            self.root_fields[table.singular] = (table, "one")
+            self.root_fields[table.plural] = (table, "many")
+
+    @classmethod
+    def from_sources(cls, sources: List[str]) -> "StandinSchema":
+        """Build the schema from .gql document contents"""
+        type_defs: List[TypeDefinition] = []
+        enums: Dict[str, List[str]] = {}
+        for source in sources:
+            types, enum_defs = parse_schema(source)
+            type_defs.extend(types)
+            enums.update({e.name: e.values for e in enum_defs})
+
+        table_names = {t.name for t in type_defs if t.directive("table")}
+        tables = {t.name: cls._build_table(t) for t in type_defs if t.name in table_names}
+
+        # Second pass: relations need to know the target table's key type
+        for type_def in type_defs:
+            if type_def.name not in table_names:
+                continue
+            table = tables[type_def.name]
+            for field_def in type_def.fields:
+                if field_def.type.name in table_names and not field_def.type.is_list:
+                    cls._add_relation(table, field_def, tables[field_def.type.name])
+
+            table_directive = type_def.directive("table")
+            key = table_directive.args.get("key") if table_directive else None
+            if key:
+                key = key if isinstance(key, list) else [key]
+                table.key = [table.relations[k].foreign_key if k in table.relations else k for k in key]
+            elif "id" not in table.columns:
+                table.columns["id"] = Column(name="id", scalar="UUID", non_null=True, default_expr="uuidV4()")
+
+        return cls(tables, enums)
+
+    @classmethod
+    def load(cls, dataconnect_dir: Path) -> "StandinSchema":
+        """Load every .gql file under <dataconnect_dir>/schema"""
+        files = sorted((Path(dataconnect_dir) / "schema").rglob("*.gql"))
+        return cls.from_sources([f.read_text(encoding="utf-8") for f in files])
+
+    @staticmethod
+    def _build_table(type_def: TypeDefinition) -> Table:
+        table = Table(type_name=type_def.name)
+        for field_def in type_def.fields:
+            column = StandinSchema._column(field_def)
+            if column is not None:
+                table.columns[column.name] = column
+        return table
+
+    @staticmethod
+    def _column(field_def: FieldDefinition) -> Optional[Column]:
+        col = field_def.directive("col")
+        default = field_def.directive("default")
+        return Column(
+            name=field_def.name,
+            scalar=field_def.type.name,
+            non_null=field_def.type.non_null,
+            is_list=field_def.type.is_list,
+            is_json=bool(col and col.args.get("dataType") == "jsonb"),
+            default_expr=default.args.get("expr") if default else None,
+            default_value=default.args.get("value") if default else None,
+        )
+
+    @staticmethod
+    def _add_relation(table: Table, field_def: FieldDefinition, target: Table) -> None:
+        # The relation field itself is not a column
+        table.columns.pop(field_def.name, None)
+
+        foreign_key = f"{field_def.name}Id"
+        if foreign_key not in table.columns:
+            target_key = target.columns.get("id")
+            table.columns[foreign_key] = Column(
+                name=foreign_key,
+                scalar=target_key.scalar if target_key else "UUID",
+                non_null=field_def.type.non_null,
+            )
+        table.relations[field_def.name] = Relation(
+            name=field_def.name,
+            target=target.type_name,
+            foreign_key=foreign_key,
+            non_null=field_def.type.non_null,
+        )
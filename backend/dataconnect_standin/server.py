@@ -0,0 +1,85 @@
+"""
+HTTP front end for the Data Connect stand-in
+
+Serves the same REST surface as the Data Connect service and emulator:
+
+    POST /v1beta/projects/{p}/locations/{l}/services/{s}/connectors/{c}:executeQuery
+    POST /v1beta/projects/{p}/locations/{l}/services/{s}/connectors/{c}:executeMutation
+
+Request body: {"operationName": ..., "variables": {...}}
+Response body: {"data": {...}} or a Google API error object.
+
+@auth directives are not enforced; the Authorization header is ignored.
+"""
+
+from typing import Optional
+from pathlib import Path
+import logging
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from .executor import StandinExecutor, OperationError
+
+logger = logging.getLogger(__name__)
+
+# Repository dataconnect/ directory (schema + connector)
+DEFAULT_DATACONNECT_DIR = Path(__file__).resolve().parents[2] / "dataconnect"
+
+
+def _error(code: int, status: str, message: str) -> JSONResponse:
+    return JSONResponse({"error": {"code": code, "message": message, "status": status}}, status_code=code)
+
+
+def create_app(executor: Optional[StandinExecutor] = None, dataconnect_dir: Optional[Path] = None) -> Starlette:
+    """
+    Build the stand-in ASGI app
+
+    Args:
+        executor: Pre-built executor (e.g. already seeded); loaded from dataconnect_dir if omitted
+        dataconnect_dir: Directory containing schema/ and connector/
+
+    Returns:
+        Starlette: The ASGI application (executor available as app.state.executor)
+    """
+    if executor is None:
+        executor = StandinExecutor.from_directory(dataconnect_dir or DEFAULT_DATACONNECT_DIR)
+
+    async def execute(request: Request) -> JSONResponse:
+        # Path param captures "<connector>:<verb>"
+        connector, _, verb = request.path_params["target"].partition(":")
+        kind = {"executeQuery": "query", "executeMutation": "mutation"}.get(verb)
+        if kind is None:
+            return _error(404, "NOT_FOUND", f"Unknown method: {verb or request.url.path}")
+
+        try:
+            body = await request.json()
+        except ValueError:
+            return _error(400, "INVALID_ARGUMENT", "Request body is not valid JSON")
+
+        operation_name = body.get("operationName")
+        if not operation_name:
+            return _error(400, "INVALID_ARGUMENT", "operationName is required")
+
+        try:
+            data = executor.execute(operation_name, body.get("variables"), kind)
+        except OperationError as e:
+            logger.debug(f"Stand-in {operation_name} failed: {e}")
+            return _error(e.code, e.status, str(e))
+        return JSONResponse({"data": data})
+
+    async def health(request: Request) -> JSONResponse:
+        return JSONResponse({"status": "ok", "operations": len(executor.operations), "tables": len(executor.schema.tables)})
+
+    app = Starlette(routes=[
+        Route(
+            "/{version}/projects/{project}/locations/{location}/services/{service}/connectors/{target}",
+            execute,
+            methods=["POST"],
+        ),
+        Route("/health", health, methods=["GET"]),
+    ])
+    app.state.executor = executor
+    return app
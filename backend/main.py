@@ -5,16 +5,23 @@ Main entry point for the bizPharma backend API server.
 """
 
 import logging
-import json
-import time
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request, Response, Depends
+from fastapi import FastAPI, Depends
+from fastapi.responses import Response, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
 
 from config.settings import settings
 from config.firebase_config import firebase_config
 from core.security import get_current_user, get_optional_user
+from core.serialization import FastJSONResponse, JSON_BACKEND
+from core.middleware import RequestLoggingMiddleware, MetricsMiddleware, TracingMiddleware
+from core.metrics import metrics
+from core.tracing import tracer, instrument_fastapi
+from core.executors import blocking_executor, admin_executor
+from core.health import health_checker
+from core.token_verification import verified_token_cache
+from modules.shared.dataconnect_client import async_dataconnect_client
+from modules.shared.token_cache import access_token_cache
 
 # --- Verbose Logging Configuration ---
 logging.basicConfig(
@@ -23,34 +30,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger("bizPharma")
 
-class RequestResponseLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Log Request
-        # we read the body here to log it
-        request_body = await request.body()
-        logger.debug(f"Incoming Request: {request.method} {request.url}")
-        if request_body:
-            try:
-                body_json = json.loads(request_body)
-                logger.debug(f"Request Body: {json.dumps(body_json, indent=2)}")
-            except:
-                logger.debug(f"Request Body (raw): {request_body.decode(errors='ignore')}")
-
-        # CRITICAL FIX: The call to request.body() consumes the stream.
-        # We must re-create the receive channel so subsequent handlers (like FastAPI validation)
-        # can read the body again.
-        async def receive():
-            return {"type": "http.request", "body": request_body, "more_body": False}
-        request._receive = receive
-
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = (time.time() - start_time) * 1000
-
-        # Log Response
-        logger.debug(f"Response Status: {response.status_code} (took {process_time:.2f}ms)")
-        return response
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
@@ -65,19 +44,48 @@ async def lifespan(app: FastAPI):
     print(f" DC CONNECTOR       : {settings.DATA_CONNECT_CONNECTOR}")
     print(f" DC ENDPOINT        : {settings.DATA_CONNECT_ENDPOINT}")
     print(f" AUTH EMULATOR      : {settings.FIREBASE_AUTH_EMULATOR_HOST or 'OFF'}")
+    print(f" JSON BACKEND       : {JSON_BACKEND}")
+    print(f" LAZY IMPORTS       : {'ON' if settings.LAZY_IMPORTS else 'OFF'}")
+    print(f" TRACING            : {f'{settings.TRACE_EXPORTER} @ {settings.TRACE_SAMPLE_RATE:.0%}' if settings.TRACING_ENABLED else 'OFF'}")
     print("="*50 + "\n")
 
-    # Initialize Firebase Admin SDK
-    try:
-        firebase_config.initialize()
-        print("✅ Firebase Admin SDK initialized successfully")
-    except Exception as e:
-        print(f"❌ Firebase initialization failed: {e}")
+    # Initialize Firebase Admin SDK (on first use in lazy mode)
+    if settings.LAZY_IMPORTS:
+        print("⏳ Firebase Admin SDK deferred until first use")
+    else:
+        try:
+            firebase_config.initialize()
+            print("✅ Firebase Admin SDK initialized successfully")
+        except Exception as e:
+            print(f"❌ Firebase initialization failed: {e}")
     
+    # Open the shared Data Connect connection pool
+    await async_dataconnect_client.open()
+    print("✅ Data Connect connection pool opened")
+
+    # Keep the Data Connect access token fresh off the request path
+    access_token_cache.start()
+
+    # Keep ID token signing keys fresh so verification never fetches them inline
+    verified_token_cache.start()
+
+    # Event-loop lag sampling for /readyz
+    health_checker.start()
+
+    # Export finished traces off the request path
+    tracer.start()
+
     print("bizPharma API ready!\n")
     
     yield
     print("Shutting down bizPharma API...")
+    await health_checker.stop()
+    await tracer.stop()
+    await verified_token_cache.stop()
+    await access_token_cache.stop()
+    await async_dataconnect_client.aclose()
+    blocking_executor.shutdown()
+    admin_executor.shutdown()
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -86,6 +94,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # --- CORS Configuration ---
@@ -110,7 +119,12 @@ app.add_middleware(
 )
 
 # Middleware
-app.add_middleware(RequestResponseLoggingMiddleware)
+app.add_middleware(RequestLoggingMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+    instrument_fastapi()
 
 
 @app.get("/")
@@ -132,10 +146,37 @@ async def health_check():
         "status": "healthy",
         "app": settings.APP_NAME,
         "version": settings.APP_VERSION,
-        "firebase": "initialized" if firebase_config.is_initialized() else "not initialized",
+        "firebase": "initialized" if firebase_config.is_initialized() else ("deferred" if settings.LAZY_IMPORTS else "not initialized"),
     }
 
 
+@app.get("/livez")
+async def liveness_probe():
+    """Liveness probe: the process is up and its event loop is running"""
+    return health_checker.liveness()
+
+
+@app.get("/readyz")
+async def readiness_probe(response: Response):
+    """
+    Readiness probe for the load balancer
+    
+    503 while Data Connect is unreachable or slow, the service account token is
+    invalid, the Auth emulator is down, or the event loop is lagging.
+    """
+    report = await health_checker.readiness()
+    if not report["ready"]:
+        response.status_code = 503
+    return report
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        """Prometheus scrape endpoint (text exposition format 0.0.4)"""
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/api/v1/me")
 async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     """
@@ -5,16 +5,21 @@ Handles user registration, login, and Firebase user management via backend.
 Backend creates and manages Firebase users for enhanced security.
 """
 
-from firebase_admin import auth
 from typing import Optional, Dict
+import asyncio
+import logging
 import uuid
 
-from config.firebase_config import firebase_config
+from config.firebase_config import firebase_config, auth
 from datetime import date
-from ..shared.dataconnect_client import DataConnectClient
+from ..shared.dataconnect_client import async_dataconnect_client as data_connect_client, DataConnectError
+from core.permissions import permission_cache
+from core.tenant import tenant_resolver
+from core.executors import admin_executor
+from core.token_verification import verified_token_cache
+from .profile_cache import profile_cache
 
-# Global instance of shared client
-data_connect_client = DataConnectClient()
+logger = logging.getLogger(__name__)
 
 
 class AuthService:
@@ -58,8 +63,13 @@ class AuthService:
         """
         
         try:
+            # Firebase Admin calls are blocking HTTP round-trips: run them on the
+            # bounded admin executor and overlap the ones that don't depend on each other
+            # (steps 5 & 6 only: claims and the database rows must not commit independently).
+
             # Step 1: Create Firebase user
-            firebase_user = auth.create_user(
+            firebase_user = await admin_executor.run(
+                auth.create_user,
                 email=email,
                 password=password,
                 display_name=f"{first_name} {last_name}",
@@ -69,8 +79,8 @@ class AuthService:
             # Step 2: Generate business ID
             business_id = str(uuid.uuid4())
             
-            # Step 3: Set custom claims
-            auth.set_custom_user_claims(firebase_user.uid, {
+            # Step 3: Set custom claims (a failure here stops before any database rows exist)
+            await admin_executor.run(auth.set_custom_user_claims, firebase_user.uid, {
                 'business_id': business_id,
                 'role': 'admin',  # First user is always admin
                 'tier': 'trial'   # Start with trial tier
@@ -90,12 +100,15 @@ class AuthService:
                 auth_uid=firebase_user.uid,
                 user_profile_photo=profile_photo
             )
+            permission_cache.invalidate(uid=firebase_user.uid)
+            tenant_resolver.invalidate(firebase_user.uid)
+            profile_cache.invalidate(firebase_user.uid)
             
-            # Step 5: Generate custom token for client
-            custom_token = auth.create_custom_token(firebase_user.uid)
-            
-            # Step 6: Send verification email
-            verification_link = auth.generate_email_verification_link(email)
+            # Steps 5 & 6 (independent): custom token for client, verification email link
+            custom_token, verification_link = await asyncio.gather(
+                admin_executor.run(auth.create_custom_token, firebase_user.uid),
+                admin_executor.run(auth.generate_email_verification_link, email),
+            )
             # TODO: Send email via your email service
             
             return {
@@ -143,36 +156,59 @@ class AuthService:
         """
         Get user profile from Firebase and Data Connect
         
+        Profiles are served from profile_cache (PROFILE_CACHE_TTL seconds) and
+        invalidated whenever the user's claims are set.
+        
         Args:
             uid: Firebase user ID
             
         Returns:
-            User profile with custom claims
-        """
-        try:
-            # Get Firebase user
-            firebase_user = auth.get_user(uid)
-            
-            # Get custom claims
-            claims = firebase_user.custom_claims or {}
-            
-            # TODO: Get additional data from Data Connect
-            # user_data = await get_user_from_database(uid)
+            User profile with custom claims, Data Connect fields and its ETag
             
-            return {
-                'uid': firebase_user.uid,
-                'email': firebase_user.email,
-                'display_name': firebase_user.display_name,
-                'phone': firebase_user.phone_number,
-                'email_verified': firebase_user.email_verified,
-                'business_id': claims.get('business_id'),
-                'role': claims.get('role'),
-                'tier': claims.get('tier'),
-                'created_at': firebase_user.user_metadata.creation_timestamp
-            }
-        
-        except auth.UserNotFoundError:
+        Raises:
+            ValueError: If the user does not exist
+        """
+        return await profile_cache.get_or_load(uid, self._load_user_profile)
+    
+    async def _load_user_profile(self, uid: str) -> Dict:
+        # Firebase user and User row are independent round-trips
+        firebase_result, user_result = await asyncio.gather(
+            admin_executor.run(auth.get_user, uid),
+            data_connect_client.execute_query("GetUserByAuthId", {"id": uid}),
+            return_exceptions=True
+        )
+        if isinstance(firebase_result, auth.UserNotFoundError):
             raise ValueError("User not found")
+        if isinstance(firebase_result, BaseException):
+            raise firebase_result
+        
+        firebase_user = firebase_result
+        claims = firebase_user.custom_claims or {}
+        
+        if isinstance(user_result, DataConnectError):
+            # Serve the Firebase view rather than failing the profile
+            logger.warning(f"⚠️ Profile lookup in Data Connect failed for {uid}: {user_result}")
+            user_data = {}
+        elif isinstance(user_result, BaseException):
+            raise user_result
+        else:
+            user_data = (user_result.get('data') or {}).get('user') or {}
+        
+        return {
+            'uid': firebase_user.uid,
+            'email': firebase_user.email,
+            'display_name': firebase_user.display_name,
+            'first_name': user_data.get('firstName'),
+            'last_name': user_data.get('lastName'),
+            'phone': user_data.get('mobile') or firebase_user.phone_number,
+            'email_verified': firebase_user.email_verified,
+            'business_id': claims.get('business_id') or user_data.get('businessId'),
+            'role': claims.get('role') or user_data.get('role'),
+            'tier': claims.get('tier'),
+            'permissions': user_data.get('permissions') or [],
+            'is_active': user_data.get('isActive', True),
+            'created_at': firebase_user.user_metadata.creation_timestamp
+        }
     
     async def send_password_reset(self, email: str) -> str:
         """
@@ -185,7 +221,7 @@ class AuthService:
             Password reset link
         """
         try:
-            reset_link = auth.generate_password_reset_link(email)
+            reset_link = await admin_executor.run(auth.generate_password_reset_link, email)
             # TODO: Send email via your email service
             return reset_link
         
@@ -203,7 +239,7 @@ class AuthService:
             Decoded token with user info
         """
         try:
-            decoded_token = auth.verify_id_token(id_token)
+            decoded_token = await verified_token_cache.verify(id_token)
             return decoded_token
         except Exception as e:
             raise ValueError(f"Invalid token: {str(e)}")
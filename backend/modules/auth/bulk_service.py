@@ -0,0 +1,309 @@
+"""
+Bulk Provisioning Service
+
+Creates staff accounts for a business in bulk (pharmacy chain onboarding):
+
+0. Reject records the caller may not grant: roles or permissions beyond their
+   own, or locations outside their business (or their own location_ids)
+1. Look up existing accounts by email (get_users, 100 per call)
+2. Create Firebase users with their custom claims (import_users, 1000 per call)
+3. Insert User rows in batched Data Connect mutations (CreateUsersBulk)
+4. Generate password setup links concurrently under a rate limit
+
+Progress and per-record results are yielded as events so the router can
+stream them as NDJSON.
+"""
+
+from typing import Dict, Any, FrozenSet, List, Optional, AsyncIterator
+from dataclasses import dataclass, field
+import asyncio
+import logging
+import time
+import uuid
+
+from config.firebase_config import auth
+
+from config.settings import settings
+from core.executors import admin_executor, RateLimiter
+from core.permissions import ungrantable
+from core.serialization import json_dumps
+from ..shared.dataconnect_client import async_dataconnect_client as data_connect_client, DataConnectError
+from .schemas import StaffRecord
+
+logger = logging.getLogger(__name__)
+
+
+# Firebase Admin API limits
+GET_USERS_BATCH_SIZE = 100
+IMPORT_USERS_BATCH_SIZE = 1000
+MAX_CLAIMS_BYTES = 1000
+
+
+@dataclass
+class _Provisioned:
+    """Working state for one requested account"""
+    index: int
+    record: StaffRecord
+    uid: Optional[str] = None
+    status: str = "pending"   # pending -> created | skipped | failed
+    error: Optional[str] = None
+    invite_link: Optional[str] = None
+    claims: Dict[str, Any] = field(default_factory=dict)
+
+    def result(self) -> Dict[str, Any]:
+        data = {
+            "event": "result",
+            "index": self.index,
+            "email": self.record.email,
+            "status": self.status,
+            "uid": self.uid if self.status == "created" else None,
+        }
+        if self.error:
+            data["error"] = self.error
+        if self.invite_link:
+            data["invite_link"] = self.invite_link
+        return data
+
+
+class BulkProvisioningService:
+    """
+    Bulk staff account provisioning
+
+    Records that fail at any step are reported individually and never stop
+    the rest of the batch. Firebase accounts whose User row could not be
+    written are deleted again so a retry starts clean.
+    """
+
+    def __init__(self):
+        self.db_batch_size = settings.BULK_PROVISION_DB_BATCH_SIZE
+        self.db_concurrency = settings.BULK_PROVISION_DB_CONCURRENCY
+        self.invite_rate = settings.BULK_PROVISION_INVITE_RATE
+
+    async def provision(
+        self,
+        business_id: str,
+        records: List[StaffRecord],
+        granted: FrozenSet[str],
+        caller_location_ids: Optional[FrozenSet[str]] = None,
+        tier: Optional[str] = None,
+        send_invites: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Provision staff accounts, yielding progress events
+
+        Events:
+            {"event": "started", "total": N}
+            {"event": "progress", "stage": "lookup|import|database|invites", "done": n, "total": m}
+            {"event": "result", "index": i, "email": ..., "status": "created|skipped|failed", ...}
+            {"event": "completed", "created": c, "skipped": s, "failed": f, "elapsed_ms": ...}
+
+        Args:
+            business_id: Business the accounts belong to
+            records: Staff records to create
+            granted: The caller's compiled permissions (bounds the roles and grants they may assign)
+            caller_location_ids: The caller's location_ids claim (None = every location)
+            tier: Business tier, copied into custom claims
+            send_invites: Generate password setup links for created accounts
+        """
+        start = time.perf_counter()
+        items = [_Provisioned(index=i, record=r) for i, r in enumerate(records)]
+        yield {"event": "started", "total": len(items)}
+
+        # Duplicates inside the request
+        seen: Dict[str, int] = {}
+        for item in items:
+            email = item.record.email.lower()
+            if email in seen:
+                item.status, item.error = "skipped", f"Duplicate of record {seen[email]}"
+            else:
+                seen[email] = item.index
+
+        # 0. Roles, grants and locations the caller may assign
+        pending = [i for i in items if i.status == "pending"]
+        await self._check_grants(pending, business_id, granted, caller_location_ids)
+
+        # 1. Existing accounts
+        pending = [i for i in items if i.status == "pending"]
+        async for event in self._skip_existing(pending):
+            yield event
+
+        # 2. Firebase accounts with claims
+        pending = [i for i in items if i.status == "pending"]
+        async for event in self._import_accounts(pending, business_id, tier):
+            yield event
+
+        # 3. User rows, then 4. invite links; results stream per database batch
+        pending = [i for i in items if i.status == "pending"]
+        for item in items:
+            if item.status != "pending":
+                yield item.result()
+
+        async for event in self._write_users(pending, business_id, send_invites):
+            yield event
+
+        counts = {status: sum(1 for i in items if i.status == status) for status in ("created", "skipped", "failed")}
+        elapsed = (time.perf_counter() - start) * 1000
+        logger.info(f"👥 Bulk provisioning for {business_id}: {counts} in {elapsed:.0f}ms")
+        yield {"event": "completed", **counts, "elapsed_ms": round(elapsed, 1)}
+
+    async def _check_grants(
+        self,
+        items: List[_Provisioned],
+        business_id: str,
+        granted: FrozenSet[str],
+        caller_location_ids: Optional[FrozenSet[str]]
+    ) -> None:
+        for item in items:
+            beyond = ungrantable(granted, item.record.role.value, item.record.permissions)
+            if beyond:
+                item.status, item.error = "failed", f"Cannot grant permissions you do not hold: {sorted(beyond)}"
+            elif caller_location_ids is not None and not item.record.location_ids:
+                item.status, item.error = "failed", "location_ids required: you can only assign your own locations"
+
+        located = [i for i in items if i.status == "pending" and i.record.location_ids]
+        if not located:
+            return
+        try:
+            result = await data_connect_client.execute_query("ListLocationsByBusiness", {"businessId": business_id})
+            business_locations = {loc["id"] for loc in (result.get("data") or {}).get("locations") or []}
+        except DataConnectError as e:
+            logger.error(f"❌ Location lookup failed for {business_id}: {e}")
+            for item in located:
+                item.status, item.error = "failed", f"Location lookup failed: {e}"
+            return
+
+        allowed = business_locations if caller_location_ids is None else business_locations & caller_location_ids
+        for item in located:
+            unknown = sorted(set(item.record.location_ids) - allowed)
+            if unknown:
+                item.status, item.error = "failed", f"Locations not in your scope: {unknown}"
+
+    async def _skip_existing(self, items: List[_Provisioned]) -> AsyncIterator[Dict[str, Any]]:
+        done = 0
+        for offset in range(0, len(items), GET_USERS_BATCH_SIZE):
+            chunk = items[offset:offset + GET_USERS_BATCH_SIZE]
+            try:
+                found = await admin_executor.run(
+                    auth.get_users, [auth.EmailIdentifier(i.record.email) for i in chunk]
+                )
+                existing = {u.email.lower() for u in found.users if u.email}
+            except Exception as e:
+                logger.error(f"❌ Account lookup failed: {e}")
+                for item in chunk:
+                    item.status, item.error = "failed", f"Account lookup failed: {e}"
+                existing = set()
+
+            for item in chunk:
+                if item.record.email.lower() in existing:
+                    item.status, item.error = "skipped", "Email already registered"
+            done += len(chunk)
+            yield {"event": "progress", "stage": "lookup", "done": done, "total": len(items)}
+
+    async def _import_accounts(
+        self,
+        items: List[_Provisioned],
+        business_id: str,
+        tier: Optional[str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        # Claims go into the import itself, so no per-user set_custom_user_claims round-trips
+        importable = []
+        for item in items:
+            claims = {"business_id": business_id, "role": item.record.role.value}
+            if tier:
+                claims["tier"] = tier
+            if item.record.location_ids:
+                claims["location_ids"] = item.record.location_ids
+            if len(json_dumps(claims)) > MAX_CLAIMS_BYTES:
+                item.status, item.error = "failed", "Custom claims exceed 1000 bytes (too many location_ids)"
+                continue
+            item.uid = uuid.uuid4().hex
+            item.claims = claims
+            importable.append(item)
+
+        done = 0
+        for offset in range(0, len(importable), IMPORT_USERS_BATCH_SIZE):
+            chunk = importable[offset:offset + IMPORT_USERS_BATCH_SIZE]
+            users = [
+                auth.ImportUserRecord(
+                    uid=item.uid,
+                    email=item.record.email,
+                    email_verified=False,
+                    display_name=f"{item.record.first_name} {item.record.last_name}",
+                    custom_claims=item.claims,
+                )
+                for item in chunk
+            ]
+            try:
+                result = await admin_executor.run(auth.import_users, users)
+                for error in result.errors:
+                    chunk[error.index].status, chunk[error.index].error = "failed", f"Account creation failed: {error.reason}"
+            except Exception as e:
+                logger.error(f"❌ import_users failed: {e}")
+                for item in chunk:
+                    item.status, item.error = "failed", f"Account creation failed: {e}"
+            done += len(chunk)
+            yield {"event": "progress", "stage": "import", "done": done, "total": len(importable)}
+
+    async def _write_users(
+        self,
+        items: List[_Provisioned],
+        business_id: str,
+        send_invites: bool
+    ) -> AsyncIterator[Dict[str, Any]]:
+        batches = [items[i:i + self.db_batch_size] for i in range(0, len(items), self.db_batch_size)]
+        semaphore = asyncio.Semaphore(self.db_concurrency)
+        limiter = RateLimiter(rate=self.invite_rate)
+
+        async def write_batch(batch: List[_Provisioned]) -> List[_Provisioned]:
+            async with semaphore:
+                await self._insert_batch(batch, business_id)
+            if send_invites:
+                await asyncio.gather(*(self._invite(item, limiter) for item in batch if item.status == "created"))
+            return batch
+
+        done = 0
+        for finished in asyncio.as_completed([write_batch(b) for b in batches]):
+            batch = await finished
+            done += len(batch)
+            yield {"event": "progress", "stage": "database", "done": done, "total": len(items)}
+            for item in batch:
+                yield item.result()
+
+    async def _insert_batch(self, batch: List[_Provisioned], business_id: str) -> None:
+        rows = [
+            {
+                "id": item.uid,
+                "businessId": business_id,
+                "email": item.record.email,
+                "firstName": item.record.first_name,
+                "lastName": item.record.last_name,
+                "mobile": item.record.phone.strip(),
+                "role": item.record.role.value,
+                "permissions": item.record.permissions,
+                "isActive": True,
+            }
+            for item in batch
+        ]
+        try:
+            await data_connect_client.execute_mutation("CreateUsersBulk", {"users": rows})
+        except DataConnectError as e:
+            logger.error(f"❌ CreateUsersBulk failed for {len(batch)} users: {e}")
+            for item in batch:
+                item.status, item.error = "failed", f"User record creation failed: {e}"
+            # Roll back the Firebase accounts so the records can be retried
+            try:
+                await admin_executor.run(auth.delete_users, [item.uid for item in batch])
+            except Exception as cleanup_error:
+                logger.error(f"❌ Failed to delete orphaned Firebase accounts: {cleanup_error}")
+            return
+
+        for item in batch:
+            item.status = "created"
+
+    async def _invite(self, item: _Provisioned, limiter: RateLimiter) -> None:
+        try:
+            async with limiter:
+                item.invite_link = await admin_executor.run(auth.generate_password_reset_link, item.record.email)
+        except Exception as e:
+            # The account exists; the invite can be re-sent with /password-reset
+            item.error = f"Invite link generation failed: {e}"
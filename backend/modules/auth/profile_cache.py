@@ -0,0 +1,105 @@
+"""
+User Profile Cache
+
+TTL + LRU cache of merged user profiles (Firebase user record, custom claims
+and the Data Connect User row) with a content ETag, so clients polling
+/api/v1/auth/profile/{uid} are served from memory and revalidate with
+If-None-Match instead of downloading an unchanged profile.
+"""
+
+from typing import Dict, Any, Optional, Callable, Awaitable
+import asyncio
+import hashlib
+
+from cachetools import TTLCache
+
+from config.settings import settings
+from core.metrics import metrics
+from core.serialization import json_dumps_canonical
+
+
+def profile_etag(profile: Dict[str, Any]) -> str:
+    """Strong ETag over the canonical JSON of a profile"""
+    digest = hashlib.sha1(json_dumps_canonical(profile).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+class ProfileCache:
+    """
+    Merged profile cache keyed by uid
+
+    Entries expire after PROFILE_CACHE_TTL seconds; the least recently used
+    entries are evicted beyond PROFILE_CACHE_SIZE. invalidate() must be called
+    whenever a user's claims or User row change; a load invalidated while in
+    flight is not cached.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        self._entries: TTLCache = TTLCache(
+            maxsize=maxsize or settings.PROFILE_CACHE_SIZE,
+            ttl=ttl or settings.PROFILE_CACHE_TTL
+        )
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+    async def get_or_load(
+        self,
+        uid: str,
+        loader: Callable[[str], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Get a cached profile, loading it with loader(uid) on a miss
+
+        Concurrent misses for the same uid share one load. The returned dict
+        carries its ETag under "etag" and must be treated as read-only.
+        """
+        profile = self._entries.get(uid)
+        if profile is not None:
+            self.hits += 1
+            return profile
+
+        self.misses += 1
+        future = self._inflight.get(uid)
+        if future is None:
+            future = asyncio.ensure_future(self._load(uid, loader))
+            self._inflight[uid] = future
+            future.add_done_callback(lambda f, k=uid: self._forget(k, f))
+        return await asyncio.shield(future)
+
+    async def _load(self, uid: str, loader: Callable[[str], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        profile = await loader(uid)
+        profile = {**profile, "etag": profile_etag(profile)}
+        # Not if the user was invalidated while the load was in flight
+        if self._inflight.get(uid) is asyncio.current_task():
+            self._entries[uid] = profile
+        return profile
+
+    def _forget(self, uid: str, future: asyncio.Future) -> None:
+        if self._inflight.get(uid) is future:
+            del self._inflight[uid]
+
+    def invalidate(self, uid: str) -> None:
+        """Drop a user's cached profile (and any load already in flight)"""
+        self._inflight.pop(uid, None)
+        if self._entries.pop(uid, None) is not None:
+            self.invalidated += 1
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "invalidated": self.invalidated,
+            "size": len(self._entries),
+            "maxsize": self._entries.maxsize,
+        }
+
+
+# Global instance shared by AuthService and onboarding
+profile_cache = ProfileCache()
+metrics.register_cache("profile", profile_cache.stats)
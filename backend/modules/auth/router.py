@@ -5,21 +5,29 @@ FastAPI endpoints for user authentication via backend.
 Backend creates and manages Firebase users for enhanced security.
 """
 
-from fastapi import APIRouter, HTTPException, status
-from typing import Dict
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Dict, Optional
 
+from core.security import require_permissions, get_tenant_context
+from core.permissions import permission_cache
+from core.serialization import json_dumps
+from core.tenant import TenantContext
 from .schemas import (
     RegisterRequest,
     LoginRequest,
     AuthResponse,
     UserProfileResponse,
-    PasswordResetRequest
+    PasswordResetRequest,
+    BulkProvisionRequest
 )
 from .auth_service import AuthService
+from .bulk_service import BulkProvisioningService
 
 
 router = APIRouter()
 auth_service = AuthService()
+bulk_service = BulkProvisioningService()
 
 
 @router.post("/register", response_model=AuthResponse)
@@ -163,30 +171,85 @@ async def request_password_reset(request: PasswordResetRequest):
         )
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
 @router.get("/profile/{uid}", response_model=UserProfileResponse)
-async def get_user_profile(uid: str):
+async def get_user_profile(
+    uid: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Get user profile by UID
     
-    Returns Firebase user data and custom claims.
+    Returns Firebase user data, custom claims and the Data Connect user record.
+    Responses carry an ETag; send it back as If-None-Match to get
+    304 Not Modified while the profile is unchanged.
     """
     try:
         profile = await auth_service.get_user_profile(uid)
-        
-        return UserProfileResponse(
-            uid=profile['uid'],
-            email=profile['email'],
-            first_name=profile.get('display_name', '').split()[0] if profile.get('display_name') else '',
-            last_name=profile.get('display_name', '').split()[-1] if profile.get('display_name') else '',
-            phone=profile.get('phone'),
-            email_verified=profile['email_verified'],
-            created_at=profile['created_at'],
-            business_id=profile.get('business_id'),
-            role=profile.get('role')
-        )
-    
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    
+    cache_headers = {"ETag": profile['etag'], "Cache-Control": "private, no-cache"}
+    if _etag_matches(if_none_match, profile['etag']):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    response.headers.update(cache_headers)
+    
+    display_name = (profile.get('display_name') or '').split()
+    return UserProfileResponse(
+        uid=profile['uid'],
+        email=profile['email'],
+        first_name=profile.get('first_name') or (display_name[0] if display_name else ''),
+        last_name=profile.get('last_name') or (display_name[-1] if display_name else ''),
+        phone=profile.get('phone'),
+        email_verified=profile['email_verified'],
+        created_at=profile['created_at'],
+        business_id=profile.get('business_id'),
+        role=profile.get('role')
+    )
+
+
+@router.post("/bulk-provision")
+async def bulk_provision_users(
+    request: BulkProvisionRequest,
+    tenant: TenantContext = Depends(get_tenant_context),
+    current_user: Dict = require_permissions("users:create")
+):
+    """
+    Create staff accounts in bulk for the caller's business
+
+    Streams NDJSON events: progress per stage, one result per record
+    (created / skipped / failed, with invite link when requested) and a
+    final summary. Failed records never abort the rest of the request.
+    Records with a role, permissions or locations the caller does not hold
+    themselves fail individually.
+
+    Requires: users:create permission
+    """
+    # Already resolved (and cached) by require_permissions
+    granted = await permission_cache.get(tenant.uid, tenant.business_id, claimed_role=tenant.role)
+
+    async def ndjson_events():
+        async for event in bulk_service.provision(
+            business_id=tenant.business_id,
+            records=request.users,
+            granted=granted,
+            caller_location_ids=tenant.location_ids,
+            tier=tenant.tier,
+            send_invites=request.send_invites
+        ):
+            yield json_dumps(event) + b"\n"
+
+    return StreamingResponse(ndjson_events(), media_type="application/x-ndjson")
@@ -5,8 +5,27 @@ Request and response models for authentication endpoints.
 """
 
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
+from enum import Enum
+
+
+class UserRole(str, Enum):
+    """Staff roles (mirrors dataconnect UserRole)"""
+    BUSINESS_ADMIN = "BUSINESS_ADMIN"
+    WAREHOUSE_MANAGER = "WAREHOUSE_MANAGER"
+    PROCUREMENT_MANAGER = "PROCUREMENT_MANAGER"
+    SALES_MANAGER = "SALES_MANAGER"
+    STORE_MANAGER = "STORE_MANAGER"
+    CASHIER_POS_OPERATOR = "CASHIER_POS_OPERATOR"
+    DISTRICT_AREA_MANAGER = "DISTRICT_AREA_MANAGER"
+    BILLING_SPECIALIST_ACCOUNTANT = "BILLING_SPECIALIST_ACCOUNTANT"
+    CLINICAL_SERVICES_COORDINATOR = "CLINICAL_SERVICES_COORDINATOR"
+    DATA_ANALYST = "DATA_ANALYST"
+    OPERATIONS_MANAGER = "OPERATIONS_MANAGER"
+    FRONT_END_SUPERVISOR = "FRONT_END_SUPERVISOR"
+    RECEIVING_STOCK_CLERK = "RECEIVING_STOCK_CLERK"
+    DELIVERY_LOGISTICS_COORDINATOR = "DELIVERY_LOGISTICS_COORDINATOR"
 
 
 class RegisterRequest(BaseModel):
@@ -79,3 +98,36 @@ class PasswordChangeRequest(BaseModel):
     """Password change request"""
     old_password: str
     new_password: str = Field(min_length=6)
+
+
+class StaffRecord(BaseModel):
+    """One staff account in a bulk provisioning request"""
+    email: EmailStr
+    first_name: str = Field(min_length=1, max_length=100)
+    last_name: str = Field(min_length=1, max_length=100)
+    phone: str = Field(max_length=15)
+    role: UserRole
+    permissions: Optional[List[str]] = None
+    location_ids: Optional[List[str]] = None
+
+
+class BulkProvisionRequest(BaseModel):
+    """Bulk staff provisioning request (accounts are created in the caller's business)"""
+    users: List[StaffRecord] = Field(min_length=1, max_length=5000)
+    send_invites: bool = Field(default=True, description="Generate password setup links for created accounts")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "users": [
+                    {
+                        "email": "cashier1@pharmacy.com",
+                        "first_name": "Ali",
+                        "last_name": "Khan",
+                        "phone": "+923001234567",
+                        "role": "CASHIER_POS_OPERATOR"
+                    }
+                ],
+                "send_invites": True
+            }
+        }
@@ -4,10 +4,18 @@ Inventory Router
 FastAPI endpoints for inventory operations.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from typing import Dict, Optional
 
-from core.security import get_current_user
+from core.security import get_current_user, get_tenant_context
+from core.tenant import TenantContext
+from core.serialization import json_dumps
+from ..shared.dataconnect_client import (
+    async_dataconnect_client,
+    DataConnectError,
+    DataConnectUnavailableError
+)
 from .schemas import (
     FEFOSelectionRequest,
     FEFOSelectionResponse,
@@ -110,3 +118,51 @@ async def get_inventory_stats(current_user: Dict = Depends(get_current_user)):
         "expiring_soon": 8,
         "total_batches": 3420
     }
+
+
+@router.get("/levels/stream")
+async def stream_inventory_levels(
+    location_id: str,
+    page_size: int = Query(500, ge=1, le=5000),
+    current_user: TenantContext = Depends(get_tenant_context)
+):
+    """
+    Stream a location's inventory levels as NDJSON (one row per line)
+
+    Rows are fetched page by page from Data Connect and written as they
+    arrive, so warehouses with 100k+ rows are never held in memory at once.
+    Only locations of the caller's business (and within their location_ids
+    claim, if any) can be streamed.
+
+    Pages use limit/offset (UUID ids have no range filter for keyset paging),
+    so the database skips offset rows per page: a full scan is O(n²/page_size)
+    rows read. Raise page_size for very large locations.
+    """
+    if not current_user.can_access_location(location_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No access to this location"
+        )
+
+    query_name = "ListInventoryByLocationPage"
+    variables = {"businessId": current_user.business_id, "locationId": location_id}
+
+    # Fetch the first page up front so upstream failures still get a proper status
+    try:
+        first_page, cursor = await async_dataconnect_client.fetch_page(query_name, variables, page_size)
+    except DataConnectUnavailableError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except DataConnectError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Inventory fetch failed: {str(e)}"
+        )
+
+    async def ndjson_rows():
+        yield b"".join(json_dumps(row) + b"\n" for row in first_page)
+        if cursor is None:
+            return
+        async for page in async_dataconnect_client.iter_pages(query_name, variables, page_size, cursor=cursor):
+            yield b"".join(json_dumps(row) + b"\n" for row in page)
+
+    return StreamingResponse(ndjson_rows(), media_type="application/x-ndjson")
@@ -0,0 +1,18 @@
+"""
+Pricing errors
+
+Kept apart from the engine so the router can map them to HTTP statuses
+without importing NumPy (the engine is built lazily).
+"""
+
+
+class PricingNotFoundError(LookupError):
+    """
+    Raised when products in a cart have no ProductPricing row
+    """
+
+
+class BusinessRequiredError(PermissionError):
+    """
+    Raised when a cart is priced without a business outside DEV
+    """
@@ -0,0 +1,425 @@
+"""
+Price Book
+
+In-memory columnar index of ProductPricing rows per business, so pricing a
+cart needs no Data Connect round trip:
+
+- A business's book is loaded once with ListPricingByLocation: one array per
+  price column (walk-in, bronze ... platinum, retail) plus the tax rate, and
+  a product id -> row dict. Base and tier price lookups are O(1).
+- Whenever rows change, a product x tier matrix of resolved prices is
+  materialized for them: a tier without its own price (null column) pays the
+  next lower tier's price, down to walk-in. Pricing a customer's tier is then
+  a direct index into the matrix.
+- Each row's volumeDiscounts JSONB is compiled into a VolumeLadder once,
+  when the row is applied (see volume_discounts.py), and its
+  promotionalDiscounts are indexed in the book's PromotionIndex (see
+  promotions.py).
+- Every PRICE_BOOK_REFRESH_INTERVAL seconds the next request triggers a
+  background ListPricingUpdatedSince refresh from the book's updatedAt
+  watermark; requests keep being served from the current arrays meanwhile.
+- Deleted rows are only seen by a full reload, done in the background every
+  PRICE_BOOK_FULL_RELOAD_INTERVAL seconds.
+- A product can have several rows (scheduled and expired prices); it is
+  priced from the row in effect today (effectiveDate through expiryDate).
+  Rows not in effect are kept, and the book re-selects on the first request
+  of the day a kept row takes effect or the current one expires.
+- Products missing from the book (priced after the last refresh) are
+  point-fetched with ListPricingForProducts and added. Products still
+  missing are not fetched again for PRICE_BOOK_REFRESH_INTERVAL seconds.
+
+ProductPricing has no location column, so books are per business.
+"""
+
+from typing import Dict, Any, Awaitable, Callable, Iterable, List, Optional, Sequence, Set, Tuple
+from datetime import date, datetime, timedelta
+import asyncio
+import logging
+import time
+
+import numpy as np
+from cachetools import LRUCache, TTLCache
+
+from config.settings import settings
+from core.metrics import metrics
+from ..shared.dataconnect_client import async_dataconnect_client
+from .schemas import CustomerTier
+from .promotions import PromotionIndex, parse_product_promotions, today_utc
+from .tiers import TIER_COLUMNS, BASE_COLUMN, TIER_INDEX
+from .volume_discounts import VolumeLadder, compile_ladder
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[str], Awaitable["BusinessPriceBook"]]
+
+
+class BusinessPriceBook:
+    """
+    Columnar prices for one business
+
+    Rows are append-only: a product keeps its row index for the life of the
+    book, so indexes taken before an await stay valid after a refresh. A
+    product whose prices are all scheduled or expired keeps its row but
+    leaves index until a row takes effect.
+
+    tier_prices holds the stored columns (NaN where null); tier_matrix holds
+    the resolved price per tier and tier_discount_pcts its discount below
+    walk-in (0 where the tier price is not below walk-in), both indexed
+    [TIER_INDEX[tier], row].
+    """
+
+    def __init__(self, business_id: str, capacity: int = 64):
+        self.business_id = business_id
+        # Product id -> row, for products with a row in effect
+        self.index: Dict[str, int] = {}
+        # Product id -> row, for every product ever priced (a product keeps its row)
+        self._slots: Dict[str, int] = {}
+        # Product id -> ProductPricing rows by id (scheduled, current and expired)
+        self._candidates: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # Product id -> next date its current row can change, and the earliest of those
+        self._transitions: Dict[str, date] = {}
+        self.next_transition: Optional[date] = None
+        self.tier_prices = np.full((len(TIER_COLUMNS), capacity), np.nan)
+        self.tier_matrix = np.full((len(TIER_COLUMNS), capacity), np.nan)
+        self.tier_discount_pcts = np.zeros((len(TIER_COLUMNS), capacity))
+        self.retail_prices = np.full(capacity, np.nan)
+        self.tax_rates = np.zeros(capacity)
+        # Compiled volumeDiscounts per row (None: the product has no ladder of its own)
+        self.ladders: List[Optional[VolumeLadder]] = []
+        # Product-scoped promotions from promotionalDiscounts
+        self.promotions = PromotionIndex()
+        self.size = 0
+        # Largest updatedAt applied, as returned by Data Connect (sent back verbatim)
+        self.watermark: Optional[str] = None
+        self._watermark_at: Optional[datetime] = None
+        self.loaded_at = time.monotonic()
+        self.refreshed_at = self.loaded_at
+
+    def _grow(self, needed: int) -> None:
+        capacity = self.retail_prices.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        tier_prices = np.full((len(TIER_COLUMNS), capacity), np.nan)
+        tier_prices[:, :self.size] = self.tier_prices[:, :self.size]
+        tier_matrix = np.full((len(TIER_COLUMNS), capacity), np.nan)
+        tier_matrix[:, :self.size] = self.tier_matrix[:, :self.size]
+        tier_discount_pcts = np.zeros((len(TIER_COLUMNS), capacity))
+        tier_discount_pcts[:, :self.size] = self.tier_discount_pcts[:, :self.size]
+        retail_prices = np.full(capacity, np.nan)
+        retail_prices[:self.size] = self.retail_prices[:self.size]
+        tax_rates = np.zeros(capacity)
+        tax_rates[:self.size] = self.tax_rates[:self.size]
+        self.tier_prices, self.retail_prices, self.tax_rates = tier_prices, retail_prices, tax_rates
+        self.tier_matrix, self.tier_discount_pcts = tier_matrix, tier_discount_pcts
+
+    def upsert(self, rows: Sequence[Dict[str, Any]], advance_watermark: bool = True, today: Optional[date] = None) -> int:
+        """
+        Apply ProductPricing rows
+
+        Every row is kept as a candidate for its product; the product is priced
+        from its current candidate (see _current).
+
+        Args:
+            rows: Rows selecting id, productId, the TIER_COLUMNS, retailPrice, taxRate,
+                  volumeDiscounts, promotionalDiscounts, effectiveDate, expiryDate and updatedAt
+            advance_watermark: False for point fetches, which do not cover every change
+            today: UTC date to select current rows for (defaults to today)
+
+        Returns:
+            int: Number of rows applied
+        """
+        changed = set()
+        for row in rows:
+            product_id = row["productId"]
+            self._candidates.setdefault(product_id, {})[row.get("id") or product_id] = row
+            changed.add(product_id)
+
+            updated_at = row.get("updatedAt")
+            if advance_watermark and updated_at:
+                parsed = datetime.fromisoformat(updated_at)
+                if self._watermark_at is None or parsed > self._watermark_at:
+                    self.watermark, self._watermark_at = updated_at, parsed
+
+        self._apply(changed, today or today_utc())
+        return len(rows)
+
+    def roll(self, today: Optional[date] = None) -> int:
+        """
+        Re-select current rows for products whose scheduled prices took effect or expired since the last call
+
+        Returns:
+            int: Number of products re-selected
+        """
+        today = today or today_utc()
+        if self.next_transition is None or today < self.next_transition:
+            return 0
+        due = [product_id for product_id, day in self._transitions.items() if day <= today]
+        self._apply(due, today)
+        self.next_transition = min(self._transitions.values(), default=None)
+        return len(due)
+
+    @staticmethod
+    def _window(row: Dict[str, Any]) -> Tuple[date, Optional[date]]:
+        effective = row.get("effectiveDate")
+        expiry = row.get("expiryDate")
+        return (
+            date.fromisoformat(effective) if effective else date.min,
+            date.fromisoformat(expiry) if expiry else None,
+        )
+
+    def _current(self, product_id: str, today: date) -> Tuple[Optional[Dict[str, Any]], Optional[date]]:
+        """
+        The product's row in effect today and the next date that can change it
+
+        A row is in effect from its effectiveDate through its expiryDate (both
+        inclusive, UTC dates); when several are, the latest effectiveDate wins,
+        then the latest updatedAt.
+        """
+        current, current_key = None, None
+        transition: Optional[date] = None
+        for row in self._candidates.get(product_id, {}).values():
+            effective, expiry = self._window(row)
+            if effective > today:
+                transition = effective if transition is None else min(transition, effective)
+                continue
+            if expiry is not None and expiry < today:
+                continue
+            if expiry is not None:
+                ends = expiry + timedelta(days=1)
+                transition = ends if transition is None else min(transition, ends)
+            key = (effective, row.get("updatedAt") or "")
+            if current_key is None or key > current_key:
+                current, current_key = row, key
+        return current, transition
+
+    def _apply(self, product_ids: Iterable[str], today: date) -> None:
+        """Price products from their current rows; a product without one leaves the index"""
+        product_ids = list(product_ids)
+        self._grow(self.size + len(product_ids))
+        touched = []
+        for product_id in product_ids:
+            row, transition = self._current(product_id, today)
+            if transition is None:
+                self._transitions.pop(product_id, None)
+            else:
+                self._transitions[product_id] = transition
+                if self.next_transition is None or transition < self.next_transition:
+                    self.next_transition = transition
+
+            if row is None:
+                self.index.pop(product_id, None)
+                self.promotions.replace(product_id, [])
+                continue
+
+            i = self._slots.get(product_id)
+            ladder = compile_ladder(row.get("volumeDiscounts"))
+            if i is None:
+                i = self.size
+                self._slots[product_id] = i
+                self.size += 1
+                self.ladders.append(ladder)
+            else:
+                self.ladders[i] = ladder
+            self.index[product_id] = i
+            self.promotions.replace(product_id, parse_product_promotions(product_id, row.get("promotionalDiscounts")))
+            touched.append(i)
+            for column, name in enumerate(TIER_COLUMNS):
+                value = row.get(name)
+                self.tier_prices[column, i] = np.nan if value is None else value
+            self.retail_prices[i] = np.nan if row.get("retailPrice") is None else row["retailPrice"]
+            self.tax_rates[i] = row.get("taxRate") or 0.0
+
+        if touched:
+            self._materialize(np.array(touched, dtype=np.int64))
+
+    def _materialize(self, rows: np.ndarray) -> None:
+        """Resolve the tier matrix for changed rows; a null tier price inherits the next lower tier's"""
+        stored = self.tier_prices[:, rows]
+        resolved = stored.copy()
+        for column in range(1, len(TIER_COLUMNS)):
+            resolved[column] = np.where(np.isnan(stored[column]), resolved[column - 1], stored[column])
+        base = resolved[BASE_COLUMN]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            discounts = np.where(base > 0, np.maximum((base - resolved) / base * 100, 0.0), 0.0)
+        self.tier_matrix[:, rows] = resolved
+        self.tier_discount_pcts[:, rows] = discounts
+
+    def rows(self, product_ids: Sequence[str]) -> np.ndarray:
+        """Row index per product id (-1 where the product is not in the book)"""
+        index = self.index
+        return np.fromiter((index.get(product_id, -1) for product_id in product_ids), dtype=np.int64, count=len(product_ids))
+
+    def base_price(self, product_id: str) -> Optional[float]:
+        """Walk-in price of one product, None if it is not in the book"""
+        i = self.index.get(product_id)
+        return None if i is None else float(self.tier_matrix[BASE_COLUMN, i])
+
+    def tier_price(self, product_id: str, tier: CustomerTier) -> Optional[float]:
+        """Resolved price of one product for a tier, None if it is not in the book"""
+        i = self.index.get(product_id)
+        return None if i is None else float(self.tier_matrix[TIER_INDEX[tier], i])
+
+
+class PriceBook:
+    """
+    Price books for every active business, kept warm in the background
+
+    Concurrent loads and refreshes of the same business share one upstream
+    call; the least recently used books are evicted beyond
+    PRICE_BOOK_MAX_BUSINESSES.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: Optional[float] = None,
+        full_reload_interval: Optional[float] = None,
+        max_businesses: Optional[int] = None
+    ):
+        self.refresh_interval = refresh_interval if refresh_interval is not None else settings.PRICE_BOOK_REFRESH_INTERVAL
+        self.full_reload_interval = full_reload_interval or settings.PRICE_BOOK_FULL_RELOAD_INTERVAL
+        self._books: LRUCache = LRUCache(maxsize=max_businesses or settings.PRICE_BOOK_MAX_BUSINESSES)
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        # (business id, product id) pairs a point fetch found no pricing for
+        self._unpriced: TTLCache = TTLCache(maxsize=settings.PRICE_BOOK_MAX_UNPRICED, ttl=self.refresh_interval)
+        # Background refreshes in flight (the event loop only keeps weak references)
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.rows_refreshed = 0
+        self.point_fetches = 0
+        self.refresh_errors = 0
+
+    async def get(self, business_id: str) -> BusinessPriceBook:
+        """
+        The business's price book, loading it on first use
+
+        A stale book is returned as is while it refreshes in the background.
+
+        Raises:
+            DataConnectError: If the initial load fails
+        """
+        book = self._books.get(business_id)
+        if book is None:
+            self.misses += 1
+            return await self._single_flight("load", business_id, self._load)
+
+        self.hits += 1
+        book.roll()
+        now = time.monotonic()
+        if now - book.refreshed_at >= self.refresh_interval:
+            if now - book.loaded_at >= self.full_reload_interval:
+                self._background("load", business_id, self._load)
+            else:
+                self._background("refresh", business_id, self._refresh)
+        return book
+
+    async def lookup(self, business_id: str, product_ids: Sequence[str]) -> Tuple[BusinessPriceBook, np.ndarray]:
+        """
+        Row indexes for a cart, point-fetching products the book has not seen
+
+        Returns:
+            (book, rows) with rows[i] == -1 where the product has no pricing
+        """
+        book = await self.get(business_id)
+        rows = book.rows(product_ids)
+        if (rows < 0).any():
+            missing = sorted({
+                product_id for product_id, i in zip(product_ids, rows.tolist())
+                if i < 0 and (business_id, product_id) not in self._unpriced
+            })
+            if missing:
+                self.point_fetches += 1
+                result = await async_dataconnect_client.execute_query(
+                    "ListPricingForProducts",
+                    {"businessId": business_id, "productIds": missing}
+                )
+                fetched = ((result or {}).get("data") or {}).get("productPricings") or []
+                if fetched:
+                    book.upsert(fetched, advance_watermark=False)
+                for product_id in missing:
+                    if product_id not in book.index:
+                        self._unpriced[(business_id, product_id)] = True
+                rows = book.rows(product_ids)
+        return book, rows
+
+    # --- Loading ---
+
+    async def _single_flight(self, kind: str, business_id: str, loader: Loader) -> BusinessPriceBook:
+        key = (kind, business_id)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(loader(business_id))
+            self._inflight[key] = future
+            future.add_done_callback(lambda f, k=key: self._inflight.pop(k, None))
+        return await asyncio.shield(future)
+
+    def _background(self, kind: str, business_id: str, loader: Loader) -> None:
+        if (kind, business_id) in self._inflight:
+            return
+
+        async def run() -> None:
+            try:
+                await self._single_flight(kind, business_id, loader)
+            except Exception as e:
+                self.refresh_errors += 1
+                # Retry after another interval rather than on every request
+                book = self._books.get(business_id)
+                if book is not None:
+                    book.refreshed_at = time.monotonic()
+                logger.warning(f"⚠️ Price book {kind} failed for {business_id}, serving current prices: {e}")
+
+        task = asyncio.ensure_future(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _load(self, business_id: str) -> BusinessPriceBook:
+        start = time.perf_counter()
+        result = await async_dataconnect_client.execute_query("ListPricingByLocation", {"businessId": business_id})
+        rows = ((result or {}).get("data") or {}).get("productPricings") or []
+        book = BusinessPriceBook(business_id, capacity=max(64, len(rows)))
+        book.upsert(rows)
+        self._books[business_id] = book
+        logger.info(f"📒 Price book loaded for {business_id}: {len(book.index)} products ({(time.perf_counter() - start) * 1000:.0f}ms)")
+        return book
+
+    async def _refresh(self, business_id: str) -> BusinessPriceBook:
+        book = self._books.get(business_id)
+        if book is None or book.watermark is None:
+            return await self._load(business_id)
+        # ge, not gt: rows committed later with the same timestamp are not
+        # skipped, and re-applying the boundary rows is harmless
+        result = await async_dataconnect_client.execute_query(
+            "ListPricingUpdatedSince",
+            {"businessId": business_id, "since": book.watermark}
+        )
+        rows = ((result or {}).get("data") or {}).get("productPricings") or []
+        book.upsert(rows)
+        book.refreshed_at = time.monotonic()
+        self.refreshes += 1
+        self.rows_refreshed += len(rows)
+        return book
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "size": len(self._books),
+            "products": sum(len(book.index) for book in list(self._books.values())),
+            "unpriced": len(self._unpriced),
+            "refreshes": self.refreshes,
+            "rows_refreshed": self.rows_refreshed,
+            "point_fetches": self.point_fetches,
+            "refresh_errors": self.refresh_errors,
+        }
+
+
+# Global instance used by the pricing engine
+price_book = PriceBook()
+metrics.register_cache("price_book", price_book.stats)
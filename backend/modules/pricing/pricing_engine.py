@@ -2,28 +2,57 @@
 Pricing Engine
 
 Calculates customer-specific pricing based on:
-- Customer tier (Platinum, Gold, Silver, Bronze, Regular)
+- Customer tier (Platinum, Diamond, Gold, Silver, Bronze, Walk-in)
 - Custom price overrides
 - Volume discounts
 - Promotional discounts
 - Base pricing
+
+Carts are priced as a batch: the customer tier is resolved once, base and
+tier prices are gathered from the business's in-memory price book (see
+price_book.py), and the rules are evaluated over NumPy arrays for all lines
+at once. Tier prices are the stored ProductPricing tier columns, read from
+the book's precomputed tier matrix. Single-item
+pricing goes through the same path with a cart of one.
 """
 
-from typing import Optional, Dict
-from decimal import Decimal
+from typing import Optional, List, Sequence, Tuple
 from datetime import datetime
+import asyncio
+import logging
+
+import numpy as np
 
+from config.settings import settings
+from ..shared.dataconnect_client import DataConnectError
+from .errors import PricingNotFoundError, BusinessRequiredError
+from .price_book import price_book, BusinessPriceBook
+from .promotions import best_unit_discounts
+from .tiers import BASE_COLUMN, TIER_INDEX
+from .volume_discounts import VolumeLadder, unit_discounts
 from .schemas import (
     PriceCalculationResponse,
+    BulkPriceResponse,
     PricingRule,
     CustomerTier
 )
 
+logger = logging.getLogger(__name__)
+
+# Rule codes used in the evaluation arrays, in priority order
+RULES = (
+    PricingRule.CUSTOMER_OVERRIDE,
+    PricingRule.TIER_PRICING,
+    PricingRule.VOLUME_DISCOUNT,
+    PricingRule.PROMOTIONAL_DISCOUNT,
+    PricingRule.BASE_PRICE,
+)
+
 
 class PricingEngine:
     """
     Dynamic pricing engine with tier-based and rule-based pricing
-    
+
     Priority hierarchy:
     1. Customer-specific override (highest)
     2. Tier-specific pricing
@@ -31,133 +60,222 @@ class PricingEngine:
     4. Promotional discount
     5. Base price (lowest)
     """
-    
-    # Tier discount percentages
-    TIER_DISCOUNTS = {
-        CustomerTier.PLATINUM: 15.0,  # 15% discount
-        CustomerTier.GOLD: 10.0,      # 10% discount
-        CustomerTier.SILVER: 5.0,     # 5% discount
-        CustomerTier.BRONZE: 2.0,     # 2% discount
-        CustomerTier.REGULAR: 0.0,    # No discount
+
+    # Demo prices used in DEV when a product has no ProductPricing row
+    DEFAULT_BASE_PRICES = {
+        "PROD-001": 100.0,
+        "PROD-002": 250.0,
+        "PROD-003": 75.0,
     }
-    
+    DEFAULT_BASE_PRICE = 100.0
+    # Demo tier price discounts (%) by TIER_INDEX; Diamond has no demo price and inherits Gold
+    DEFAULT_TIER_DISCOUNTS = np.array([0.0, 2.0, 5.0, 10.0, 10.0, 15.0])
+
+    # Demo volume ladder for lines on demo prices: 2% for 20+, 5% for 50+, 10% for 100+ units
+    DEFAULT_VOLUME_LADDER = VolumeLadder([
+        {"minimumQuantity": 20, "discountPercent": 2.0},
+        {"minimumQuantity": 50, "discountPercent": 5.0},
+        {"minimumQuantity": 100, "discountPercent": 10.0},
+    ])
+
     async def calculate_price(
         self,
         product_id: str,
         customer_id: str,
         location_id: str,
-        quantity: int = 1
+        quantity: int = 1,
+        business_id: Optional[str] = None,
+        coupon_code: Optional[str] = None
     ) -> PriceCalculationResponse:
         """
         Calculate final price for customer
-        
+
         Args:
             product_id: Product ID
             customer_id: Customer ID
             location_id: Location/store ID
             quantity: Quantity to purchase
-            
+            business_id: Tenant whose price book applies
+            coupon_code: Coupon presented by the customer, if any
+
         Returns:
             PriceCalculationResponse with pricing breakdown
+
+        Raises:
+            PricingNotFoundError: If the product has no pricing
+            BusinessRequiredError: If business_id is missing outside DEV
         """
-        
-        # TODO: Fetch actual data from Firebase Data Connect
-        # Mock data for demonstration
-        
-        # Get base price from database
-        base_price = await self._get_base_price(product_id, location_id)
-        
-        # Get customer tier
-        customer_tier = await self._get_customer_tier(customer_id)
-        
-        # Priority 1: Check for customer-specific override
-        custom_price = await self._get_custom_price(product_id, customer_id)
-        if custom_price:
-            final_price = custom_price
-            discount_pct = ((base_price - custom_price) / base_price) * 100
-            
-            return self._build_response(
-                product_id=product_id,
-                customer_id=customer_id,
-                quantity=quantity,
-                base_price=base_price,
-                final_price=final_price,
-                pricing_rule=PricingRule.CUSTOMER_OVERRIDE,
-                discount_percentage=discount_pct,
-                customer_tier=customer_tier
-            )
-        
-        # Priority 2: Check tier pricing
-        tier_discount = self.TIER_DISCOUNTS.get(customer_tier, 0.0)
-        if tier_discount > 0:
-            final_price = base_price * (1 - tier_discount / 100)
-            
-            return self._build_response(
-                product_id=product_id,
-                customer_id=customer_id,
-                quantity=quantity,
-                base_price=base_price,
-                final_price=final_price,
-                pricing_rule=PricingRule.TIER_PRICING,
-                discount_percentage=tier_discount,
-                customer_tier=customer_tier
-            )
-        
-        # Priority 3: Check volume discount
-        volume_discount = await self._get_volume_discount(product_id, quantity)
-        
-        # Priority 4: Check promotional discount
-        promo_discount = await self._get_promotional_discount(product_id, location_id)
-        
-        # Apply best discount
-        best_discount = max(volume_discount, promo_discount)
-        
-        if best_discount > 0:
-            final_price = base_price * (1 - best_discount / 100)
-            pricing_rule = (
-                PricingRule.VOLUME_DISCOUNT 
-                if volume_discount > promo_discount 
-                else PricingRule.PROMOTIONAL_DISCOUNT
-            )
-            
-            return self._build_response(
-                product_id=product_id,
-                customer_id=customer_id,
-                quantity=quantity,
-                base_price=base_price,
-                final_price=final_price,
-                pricing_rule=pricing_rule,
-                discount_percentage=best_discount,
-                customer_tier=customer_tier
-            )
-        
-        # Priority 5: Base price (no discounts)
-        return self._build_response(
-            product_id=product_id,
+        result = await self.calculate_bulk(customer_id, location_id, [(product_id, quantity)], business_id, coupon_code)
+        return result.items[0]
+
+    async def calculate_bulk(
+        self,
+        customer_id: str,
+        location_id: str,
+        items: Sequence[Tuple[str, int]],
+        business_id: Optional[str] = None,
+        coupon_code: Optional[str] = None
+    ) -> BulkPriceResponse:
+        """
+        Price a whole cart in one pass
+
+        Args:
+            customer_id: Customer ID
+            location_id: Location/store ID
+            items: (product_id, quantity) pairs, in cart order
+            business_id: Tenant whose price book applies
+            coupon_code: Coupon presented by the customer, if any
+
+        Returns:
+            BulkPriceResponse with one line per item and cart totals
+
+        Raises:
+            PricingNotFoundError: If any product has no pricing
+            BusinessRequiredError: If business_id is missing outside DEV
+        """
+        if not business_id and settings.ENV != "DEV":
+            # Demo prices and ladders are for local development only
+            raise BusinessRequiredError("Pricing requires a business")
+
+        product_ids = [product_id for product_id, _ in items]
+        quantities = np.fromiter((quantity for _, quantity in items), dtype=np.int64, count=len(items))
+
+        customer_tier, custom_prices = await asyncio.gather(
+            self._get_customer_tier(customer_id),
+            self._get_custom_prices(product_ids, customer_id),
+        )
+        book, base_prices, tier_prices, tier_discounts, ladders = await self._get_prices(
+            product_ids, location_id, business_id, customer_tier
+        )
+        volume_discounts = self._get_volume_discounts(ladders, quantities, base_prices)
+        promo_discounts, coupon_lines = self._get_promotional_discounts(
+            book, product_ids, location_id, base_prices, coupon_code
+        )
+
+        final_prices, rules, discount_pcts = self._evaluate(
+            base_prices,
+            custom_prices,
+            tier_prices,
+            tier_discounts,
+            volume_discounts,
+            promo_discounts,
+        )
+        return self._build_bulk_response(
             customer_id=customer_id,
-            quantity=quantity,
-            base_price=base_price,
-            final_price=base_price,
-            pricing_rule=PricingRule.BASE_PRICE,
-            discount_percentage=0.0,
-            customer_tier=customer_tier
+            customer_tier=customer_tier,
+            product_ids=product_ids,
+            quantities=quantities,
+            base_prices=base_prices,
+            final_prices=final_prices,
+            rules=rules,
+            discount_pcts=discount_pcts,
+            coupon_code=coupon_code.strip().upper() if coupon_code else None,
+            coupon_lines=coupon_lines,
         )
-    
+
+    def _evaluate(
+        self,
+        base: np.ndarray,
+        custom: np.ndarray,
+        tier: np.ndarray,
+        tier_discount: np.ndarray,
+        volume: np.ndarray,
+        promo: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Apply the priority hierarchy to every line at once
+
+        Args:
+            base: Base unit prices
+            custom: Customer override prices (NaN where none)
+            tier: Customer's tier unit prices
+            tier_discount: Tier price discount percentage below base per line
+            volume: Volume discount per unit per line
+            promo: Promotional discount per unit per line
+
+        Returns:
+            (final unit prices, indexes into RULES, discount percentages)
+        """
+        has_override = ~np.isnan(custom)
+        has_tier = tier < base
+        best = np.maximum(volume, promo)
+        has_discount = best > 0
+        conditions = [has_override, has_tier, has_discount]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            override_pct = np.where(base > 0, (base - custom) / base * 100, 0.0)
+            best_pct = np.where(base > 0, best / base * 100, 0.0)
+
+        final_prices = np.select(
+            conditions,
+            [custom, tier, base - best],
+            default=base,
+        )
+        rules = np.select(conditions, [0, 1, np.where(volume > promo, 2, 3)], default=4)
+        discount_pcts = np.select(conditions, [override_pct, tier_discount, best_pct], default=0.0)
+        return final_prices, rules, discount_pcts
+
     async def _get_base_price(
         self,
         product_id: str,
-        location_id: str
+        location_id: str,
+        business_id: Optional[str] = None
     ) -> float:
         """Get base price for product at location"""
-        # TODO: Query ProductPricing table via Firebase Data Connect
-        # Mock data
-        mock_prices = {
-            "PROD-001": 100.0,
-            "PROD-002": 250.0,
-            "PROD-003": 75.0,
-        }
-        return mock_prices.get(product_id, 100.0)
-    
+        _, base_prices, _, _, _ = await self._get_prices([product_id], location_id, business_id, CustomerTier.REGULAR)
+        return float(base_prices[0])
+
+    async def _get_prices(
+        self,
+        product_ids: List[str],
+        location_id: str,
+        business_id: Optional[str],
+        customer_tier: CustomerTier
+    ) -> Tuple[Optional[BusinessPriceBook], np.ndarray, np.ndarray, np.ndarray, List[Optional[VolumeLadder]]]:
+        """
+        Base (walk-in) and tier unit prices for a cart, read from the business's price book
+
+        Returns:
+            (book, base prices, tier prices, tier discount percentages, volume ladders):
+            the book is None when it was not used; a None ladder means no volume discount
+
+        Raises:
+            PricingNotFoundError: If a product has no pricing (outside DEV)
+            DataConnectError: If the price book cannot be loaded (outside DEV)
+        """
+        tier = TIER_INDEX[customer_tier]
+        base_prices = np.full(len(product_ids), np.nan)
+        tier_prices = np.full(len(product_ids), np.nan)
+        tier_discounts = np.zeros(len(product_ids))
+        ladders: List[Optional[VolumeLadder]] = [None] * len(product_ids)
+        book: Optional[BusinessPriceBook] = None
+        if business_id:
+            try:
+                book, rows = await price_book.lookup(business_id, product_ids)
+                found = rows >= 0
+                book_rows = rows[found]
+                base_prices[found] = book.tier_matrix[BASE_COLUMN, book_rows]
+                tier_prices[found] = book.tier_matrix[tier, book_rows]
+                tier_discounts[found] = book.tier_discount_pcts[tier, book_rows]
+                ladders = [book.ladders[i] if i >= 0 else None for i in rows.tolist()]
+            except DataConnectError as e:
+                if settings.ENV != "DEV":
+                    raise
+                logger.warning(f"⚠️ Data Connect unavailable, using demo prices: {e}")
+
+        missing = np.isnan(base_prices)
+        if missing.any():
+            missing_ids = sorted({product_id for product_id, m in zip(product_ids, missing.tolist()) if m})
+            if settings.ENV != "DEV":
+                raise PricingNotFoundError(f"No pricing for products: {', '.join(missing_ids)}")
+            for i in np.flatnonzero(missing).tolist():
+                base_prices[i] = self.DEFAULT_BASE_PRICES.get(product_ids[i], self.DEFAULT_BASE_PRICE)
+                ladders[i] = self.DEFAULT_VOLUME_LADDER
+            tier_discounts[missing] = self.DEFAULT_TIER_DISCOUNTS[tier]
+            tier_prices[missing] = base_prices[missing] * (1 - self.DEFAULT_TIER_DISCOUNTS[tier] / 100)
+
+        return book, base_prices, tier_prices, tier_discounts, ladders
+
     async def _get_customer_tier(self, customer_id: str) -> CustomerTier:
         """Get customer tier classification"""
         # TODO: Query Customer table
@@ -168,72 +286,113 @@ class PricingEngine:
             "CUST-003": CustomerTier.SILVER,
         }
         return mock_tiers.get(customer_id, CustomerTier.REGULAR)
-    
-    async def _get_custom_price(
+
+    async def _get_custom_prices(
         self,
-        product_id: str,
+        product_ids: List[str],
         customer_id: str
-    ) -> Optional[float]:
-        """Check for customer-specific price override"""
-        # TODO: Query ProductPricing table for customer_id override
-        # Return None if no override exists
-        return None
-    
-    async def _get_volume_discount(
+    ) -> np.ndarray:
+        """Customer-specific price overrides per line (NaN where none)"""
+        # TODO: Query ProductPricing table for customer_id overrides
+        return np.full(len(product_ids), np.nan)
+
+    def _get_volume_discounts(
         self,
-        product_id: str,
-        quantity: int
-    ) -> float:
-        """Calculate volume discount percentage based on quantity"""
-        # TODO: Query VolumeDiscount table
-        # Mock volume discount rules
-        if quantity >= 100:
-            return 10.0  # 10% for 100+ units
-        elif quantity >= 50:
-            return 5.0   # 5% for 50+ units
-        elif quantity >= 20:
-            return 2.0   # 2% for 20+ units
-        return 0.0
-    
-    async def _get_promotional_discount(
+        ladders: List[Optional[VolumeLadder]],
+        quantities: np.ndarray,
+        base_prices: np.ndarray
+    ) -> np.ndarray:
+        """
+        Volume discount per unit per line
+
+        Only products with a volumeDiscounts ladder of their own (or DEV demo
+        prices) get one.
+        """
+        return unit_discounts(ladders, quantities, base_prices)
+
+    def _get_promotional_discounts(
         self,
-        product_id: str,
-        location_id: str
-    ) -> float:
-        """Get active promotional discount for product"""
-        # TODO: Query PromotionalDiscount table
-        # Check valid_from and valid_to dates
-        # Mock: No active promotions
-        return 0.0
-    
-    def _build_response(
+        book: Optional[BusinessPriceBook],
+        product_ids: List[str],
+        location_id: str,
+        base_prices: np.ndarray,
+        coupon_code: Optional[str] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best active promotional discount per unit per line
+
+        Considers the products' own promotionalDiscounts from the business's
+        price book, plus the coupon's promotions when one is given.
+
+        Returns:
+            (discount per unit, whether the coupon gave it) per line
+        """
+        indexes = [book.promotions] if book is not None else []
+        return best_unit_discounts(indexes, product_ids, location_id, base_prices, coupon_code)
+
+    def _build_bulk_response(
         self,
-        product_id: str,
         customer_id: str,
-        quantity: int,
-        base_price: float,
-        final_price: float,
-        pricing_rule: PricingRule,
-        discount_percentage: float,
-        customer_tier: CustomerTier
-    ) -> PriceCalculationResponse:
-        """Build price calculation response"""
-        
-        total_amount = final_price * quantity
-        base_total = base_price * quantity
-        savings = base_total - total_amount
-        discount_amount = base_price - final_price
-        
-        return PriceCalculationResponse(
-            product_id=product_id,
+        customer_tier: CustomerTier,
+        product_ids: List[str],
+        quantities: np.ndarray,
+        base_prices: np.ndarray,
+        final_prices: np.ndarray,
+        rules: np.ndarray,
+        discount_pcts: np.ndarray,
+        coupon_code: Optional[str] = None,
+        coupon_lines: Optional[np.ndarray] = None
+    ) -> BulkPriceResponse:
+        """
+        Build the price calculation responses for every line in one pass
+
+        Totals are computed as arrays and the models are constructed without
+        re-validation, since every field comes from already-typed arrays.
+        """
+        totals = final_prices * quantities
+        savings = (base_prices - final_prices) * quantities
+        discount_amounts = base_prices - final_prices
+        calculated_at = datetime.utcnow()
+        # Lines priced by the coupon's promotion
+        if coupon_code and coupon_lines is not None:
+            coupon_lines = coupon_lines & (rules == RULES.index(PricingRule.PROMOTIONAL_DISCOUNT))
+        else:
+            coupon_lines = np.zeros(len(product_ids), dtype=bool)
+
+        items = [
+            PriceCalculationResponse.model_construct(
+                product_id=product_id,
+                customer_id=customer_id,
+                quantity=quantity,
+                base_price=base_price,
+                final_price=final_price,
+                total_amount=total_amount,
+                pricing_rule=RULES[rule],
+                discount_percentage=discount_pct if discount_pct > 0 else None,
+                discount_amount=discount_amount if discount_amount > 0 else None,
+                customer_tier=customer_tier,
+                savings=saving,
+                coupon_code=coupon_code if coupon else None,
+                calculated_at=calculated_at
+            )
+            for product_id, quantity, base_price, final_price, total_amount, rule, discount_pct, discount_amount, saving, coupon
+            in zip(
+                product_ids,
+                quantities.tolist(),
+                base_prices.tolist(),
+                final_prices.tolist(),
+                totals.tolist(),
+                rules.tolist(),
+                discount_pcts.tolist(),
+                discount_amounts.tolist(),
+                savings.tolist(),
+                coupon_lines.tolist(),
+            )
+        ]
+
+        return BulkPriceResponse.model_construct(
             customer_id=customer_id,
-            quantity=quantity,
-            base_price=base_price,
-            final_price=final_price,
-            total_amount=total_amount,
-            pricing_rule=pricing_rule,
-            discount_percentage=discount_percentage if discount_percentage > 0 else None,
-            discount_amount=discount_amount if discount_amount > 0 else None,
-            customer_tier=customer_tier,
-            savings=savings
+            items=items,
+            total_amount=float(totals.sum()),
+            total_savings=float(savings.sum())
         )
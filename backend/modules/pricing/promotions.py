@@ -0,0 +1,294 @@
+"""
+Promotional Discounts
+
+Active promotions are indexed by (product, location), so pricing a cart looks
+up only the promotions that can apply to its lines instead of scanning every
+promotion:
+
+- A promotion without products or locations is stored under a None key and
+  applies to every line; product- and location-scoped promotions are stored
+  under each (product, location) pair they cover.
+- Promotions enter the index on their startDate and leave it after their
+  endDate (both inclusive, UTC dates). Future and current promotions are
+  queued once in a heap of date boundaries; advancing to a new day pops only
+  the boundaries that passed, so activation and expiry never rescan.
+- Coupon promotions are kept out of the automatic index and resolved through
+  a hash of the uppercased coupon code.
+
+Promotions come from ProductPricing.promotionalDiscounts (JSONB): a list of
+promotions for one product, using the PromotionalDiscount table's field names
+plus optional locationIds, indexed in the business's price book when the row
+is applied. The PromotionalDiscount table itself is not used: it has no
+business, product or location link, so its rows would discount every
+tenant's products.
+"""
+
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+import heapq
+import itertools
+import logging
+
+import numpy as np
+
+from core.serialization import json_loads
+
+logger = logging.getLogger(__name__)
+
+ScopeKey = Tuple[Optional[str], Optional[str]]
+
+# Heap boundary kinds; expiries sort before activations on the same day
+_END, _START = 0, 1
+
+
+def today_utc() -> date:
+    return datetime.utcnow().date()
+
+
+@dataclass(frozen=True)
+class Promotion:
+    """One promotion, normalized from a table row or a JSONB entry"""
+    key: str
+    name: str
+    discount_percent: float
+    discount_amount: float
+    start_date: date
+    end_date: date
+    coupon_code: Optional[str] = None
+    product_ids: Optional[Tuple[str, ...]] = None
+    location_ids: Optional[Tuple[str, ...]] = None
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any], key: str, product_id: Optional[str] = None) -> "Promotion":
+        coupon = row.get("couponCode") if row.get("requiresCouponCode") else None
+        locations = row.get("locationIds")
+        return cls(
+            key=key,
+            name=row.get("name") or "",
+            discount_percent=float(row.get("discountPercent") or 0.0),
+            discount_amount=float(row.get("discountAmount") or 0.0),
+            start_date=date.fromisoformat(row["startDate"]),
+            end_date=date.fromisoformat(row["endDate"]),
+            coupon_code=coupon.strip().upper() if coupon else None,
+            product_ids=(product_id,) if product_id else None,
+            location_ids=tuple(locations) if locations else None,
+        )
+
+    def is_live(self, day: date) -> bool:
+        return self.start_date <= day <= self.end_date
+
+    def covers(self, product_id: str, location_id: Optional[str]) -> bool:
+        return (
+            (self.product_ids is None or product_id in self.product_ids)
+            and (self.location_ids is None or location_id in self.location_ids)
+        )
+
+    def scope_keys(self) -> List[ScopeKey]:
+        products: Iterable[Optional[str]] = self.product_ids or (None,)
+        locations: Iterable[Optional[str]] = self.location_ids or (None,)
+        return [(product_id, location_id) for product_id in products for location_id in locations]
+
+    def unit_discounts(self, base_prices: np.ndarray) -> np.ndarray:
+        """Discount per unit: the larger of the percent and the fixed amount, capped at the price"""
+        return np.minimum(base_prices, np.maximum(base_prices * self.discount_percent / 100, self.discount_amount))
+
+
+class PromotionIndex:
+    """
+    Active promotions by (product, location) plus a coupon hash
+
+    Promotions are replaced by key; superseded heap boundaries are skipped
+    when they surface (lazy deletion).
+    """
+
+    def __init__(self):
+        self._active: Dict[ScopeKey, Dict[str, Promotion]] = {}
+        self._boundaries: List[Tuple[date, int, int, Promotion]] = []
+        self._members: Dict[str, Promotion] = {}
+        self._coupons: Dict[str, Dict[str, Promotion]] = {}
+        # Owner (e.g. product id) -> keys of the promotions it contributed
+        self._owned: Dict[str, List[str]] = {}
+        self._seq = itertools.count()
+        self._day = today_utc()
+
+        # Metrics
+        self.activated = 0
+        self.expired = 0
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def add(self, promotion: Promotion) -> None:
+        """Index a promotion (replacing one with the same key); expired ones are ignored"""
+        self.remove(promotion.key)
+        if promotion.end_date < self._day:
+            return
+        self._members[promotion.key] = promotion
+        if promotion.coupon_code:
+            self._coupons.setdefault(promotion.coupon_code, {})[promotion.key] = promotion
+            return
+        if promotion.start_date <= self._day:
+            self._activate(promotion)
+        else:
+            heapq.heappush(self._boundaries, (promotion.start_date, _START, next(self._seq), promotion))
+        heapq.heappush(self._boundaries, (promotion.end_date + timedelta(days=1), _END, next(self._seq), promotion))
+
+    def remove(self, key: str) -> None:
+        promotion = self._members.pop(key, None)
+        if promotion is None:
+            return
+        if promotion.coupon_code:
+            coupons = self._coupons.get(promotion.coupon_code, {})
+            coupons.pop(key, None)
+            if not coupons:
+                self._coupons.pop(promotion.coupon_code, None)
+        else:
+            self._deactivate(promotion)
+
+    def replace(self, owner: str, promotions: Sequence[Promotion]) -> None:
+        """Swap the promotions contributed by one owner (e.g. a product's JSONB list)"""
+        for key in self._owned.pop(owner, ()):
+            self.remove(key)
+        for promotion in promotions:
+            self.add(promotion)
+        if promotions:
+            self._owned[owner] = [promotion.key for promotion in promotions]
+
+    def _activate(self, promotion: Promotion) -> None:
+        for scope in promotion.scope_keys():
+            self._active.setdefault(scope, {})[promotion.key] = promotion
+
+    def _deactivate(self, promotion: Promotion) -> None:
+        for scope in promotion.scope_keys():
+            promotions = self._active.get(scope)
+            if promotions is not None and promotions.get(promotion.key) is promotion:
+                del promotions[promotion.key]
+                if not promotions:
+                    del self._active[scope]
+
+    def advance(self, day: Optional[date] = None) -> None:
+        """Apply the start/end boundaries that passed since the last call"""
+        day = day or today_utc()
+        if day <= self._day:
+            return
+        self._day = day
+        while self._boundaries and self._boundaries[0][0] <= day:
+            _, kind, _, promotion = heapq.heappop(self._boundaries)
+            if self._members.get(promotion.key) is not promotion:
+                continue
+            if kind == _START:
+                self._activate(promotion)
+                self.activated += 1
+            else:
+                self._members.pop(promotion.key, None)
+                self._deactivate(promotion)
+                self.expired += 1
+
+    def candidates(self, product_id: str, location_id: Optional[str]) -> Iterable[Promotion]:
+        """Active automatic promotions that can apply to one line"""
+        for scope in ((product_id, location_id), (product_id, None)):
+            promotions = self._active.get(scope)
+            if promotions:
+                yield from promotions.values()
+
+    def global_promotions(self, location_id: Optional[str]) -> List[Promotion]:
+        """Active automatic promotions that apply to every product (at this location)"""
+        promotions = list(self._active.get((None, None), {}).values())
+        if location_id is not None:
+            promotions.extend(self._active.get((None, location_id), {}).values())
+        return promotions
+
+    def coupon(self, code: str) -> List[Promotion]:
+        """Promotions redeemable today with a coupon code (case-insensitive)"""
+        return [p for p in self._coupons.get(code.strip().upper(), {}).values() if p.is_live(self._day)]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "promotions": len(self._members),
+            "active_scopes": len(self._active),
+            "pending_boundaries": len(self._boundaries),
+            "coupon_codes": len(self._coupons),
+            "activated": self.activated,
+            "expired": self.expired,
+        }
+
+
+def parse_product_promotions(product_id: str, raw: Union[str, List[Dict[str, Any]], None]) -> List[Promotion]:
+    """Promotions from a ProductPricing.promotionalDiscounts JSONB value"""
+    if not raw:
+        return []
+    try:
+        entries = json_loads(raw) if isinstance(raw, str) else raw
+        if not isinstance(entries, list):
+            raise ValueError("expected a list of promotions")
+        return [
+            Promotion.from_row(entry, key=f"{product_id}:{entry.get('id', i)}", product_id=product_id)
+            for i, entry in enumerate(entries)
+        ]
+    except (ValueError, TypeError, KeyError) as e:
+        logger.warning(f"⚠️ Ignoring malformed promotions for product {product_id}: {e}")
+        return []
+
+
+def best_unit_discounts(
+    indexes: Sequence[PromotionIndex],
+    product_ids: Sequence[str],
+    location_id: Optional[str],
+    base_prices: np.ndarray,
+    coupon_code: Optional[str] = None,
+    day: Optional[date] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Best promotional discount per unit for a cart
+
+    Promotions that apply to every product are evaluated once over the whole
+    cart; product-scoped ones only for the lines whose product has any.
+
+    Args:
+        indexes: Promotion indexes to consult (e.g. the business's price book's)
+        product_ids: Product per line
+        location_id: Selling location
+        base_prices: Base unit price per line
+        coupon_code: Coupon presented with the cart, if any
+
+    Returns:
+        (discount per unit, whether the coupon's promotion gave it) per line
+    """
+    best = np.zeros(len(product_ids))
+    by_coupon = np.zeros(len(product_ids), dtype=bool)
+
+    def apply(promotion: Promotion, lines: Optional[np.ndarray] = None, coupon: bool = False) -> None:
+        prices = base_prices if lines is None else base_prices[lines]
+        discounts = promotion.unit_discounts(prices)
+        current = best if lines is None else best[lines]
+        better = discounts > current
+        if lines is None:
+            best[better] = discounts[better]
+            by_coupon[better] = coupon
+        else:
+            best[lines[better]] = discounts[better]
+            by_coupon[lines[better]] = coupon
+
+    for index in indexes:
+        index.advance(day)
+        for promotion in index.global_promotions(location_id):
+            apply(promotion)
+        scoped: Dict[str, Tuple[Promotion, List[int]]] = {}
+        for i, product_id in enumerate(product_ids):
+            for promotion in index.candidates(product_id, location_id):
+                scoped.setdefault(promotion.key, (promotion, []))[1].append(i)
+        for promotion, lines in scoped.values():
+            apply(promotion, np.array(lines, dtype=np.int64))
+
+        if coupon_code:
+            for promotion in index.coupon(coupon_code):
+                lines = np.array(
+                    [i for i, product_id in enumerate(product_ids) if promotion.covers(product_id, location_id)],
+                    dtype=np.int64,
+                )
+                if len(lines):
+                    apply(promotion, lines, coupon=True)
+
+    return best, by_coupon
+
@@ -7,18 +7,28 @@ FastAPI endpoints for pricing operations.
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import Dict, List
 
+from core.lazy import lazy_instance
 from core.security import get_current_user
+from .errors import PricingNotFoundError, BusinessRequiredError
+from .tiers import TIER_COLUMNS, TIER_INDEX
 from .schemas import (
     PriceCalculationRequest,
     PriceCalculationResponse,
     BulkPriceRequest,
     BulkPriceResponse
 )
-from .pricing_engine import PricingEngine
 
 
 router = APIRouter()
-pricing_engine = PricingEngine()
+
+
+def _create_pricing_engine():
+    from .pricing_engine import PricingEngine
+    return PricingEngine()
+
+
+# Built on first use with LAZY_IMPORTS
+pricing_engine = lazy_instance(_create_pricing_engine, label="PricingEngine")
 
 
 @router.post("/calculate", response_model=PriceCalculationResponse)
@@ -43,11 +53,17 @@ async def calculate_price(
             product_id=request.product_id,
             customer_id=request.customer_id,
             location_id=request.location_id,
-            quantity=request.quantity
+            quantity=request.quantity,
+            business_id=current_user.get("business_id"),
+            coupon_code=request.coupon_code
         )
         
         return result
     
+    except PricingNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except BusinessRequiredError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -63,32 +79,22 @@ async def calculate_bulk_prices(
     """
     Calculate prices for multiple products at once
     
-    Useful for calculating total cart value or generating quotes.
+    Useful for calculating total cart value or generating quotes. The cart is
+    priced in one pass: one pricing query and one tier lookup for all lines.
     """
     try:
-        items_response = []
-        total_amount = 0.0
-        total_savings = 0.0
-        
-        for item in request.items:
-            price_result = await pricing_engine.calculate_price(
-                product_id=item.get("product_id"),
-                customer_id=request.customer_id,
-                location_id=request.location_id,
-                quantity=item.get("quantity", 1)
-            )
-            
-            items_response.append(price_result)
-            total_amount += price_result.total_amount
-            total_savings += price_result.savings
-        
-        return BulkPriceResponse(
+        return await pricing_engine.calculate_bulk(
             customer_id=request.customer_id,
-            items=items_response,
-            total_amount=total_amount,
-            total_savings=total_savings
+            location_id=request.location_id,
+            items=[(item.product_id, item.quantity) for item in request.items],
+            business_id=current_user.get("business_id"),
+            coupon_code=request.coupon_code
         )
     
+    except PricingNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except BusinessRequiredError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -99,17 +105,18 @@ async def calculate_bulk_prices(
 @router.get("/tiers")
 async def get_tier_discounts(current_user: Dict = Depends(get_current_user)):
     """
-    Get tier discount configuration
+    Get tier pricing configuration
     
-    Returns discount percentages for each customer tier.
+    Each tier pays the product's own price for that tier (ProductPricing
+    column); when it is not set, the next lower tier's price applies.
+    discount is the tier's nominal percentage (the DEV demo discount), kept
+    for existing clients; actual discounts depend on each product's prices.
     """
+    tiers = sorted(TIER_INDEX.items(), key=lambda item: item[1], reverse=True)
     return {
         "tiers": {
-            "PLATINUM": {"discount": 15.0, "description": "15% on all products"},
-            "GOLD": {"discount": 10.0, "description": "10% on all products"},
-            "SILVER": {"discount": 5.0, "description": "5% on all products"},
-            "BRONZE": {"discount": 2.0, "description": "2% on all products"},
-            "REGULAR": {"discount": 0.0, "description": "Standard pricing"}
+            tier.value: _tier_configuration(index)
+            for tier, index in tiers
         }
     }
 
@@ -122,14 +129,26 @@ async def get_customer_tier(
     """
     Get customer's current tier classification
     
-    Returns tier and applicable discount percentage.
+    Returns tier, the ProductPricing column its prices come from and its
+    nominal discount percentage (see /tiers).
     """
     # TODO: Query actual customer tier from database
     tier = await pricing_engine._get_customer_tier(customer_id)
-    discount = pricing_engine.TIER_DISCOUNTS.get(tier, 0.0)
+    index = TIER_INDEX[tier]
     
     return {
         "customer_id": customer_id,
         "tier": tier,
-        "discount_percentage": discount
+        "discount_percentage": float(pricing_engine.DEFAULT_TIER_DISCOUNTS[index]),
+        "price_column": TIER_COLUMNS[index]
+    }
+
+
+def _tier_configuration(index: int) -> Dict:
+    discount = float(pricing_engine.DEFAULT_TIER_DISCOUNTS[index])
+    return {
+        "discount": discount,
+        "description": f"{TIER_COLUMNS[index]} (nominal {discount:g}%)" if index else "Standard pricing",
+        "price_column": TIER_COLUMNS[index],
+        "falls_back_to": TIER_COLUMNS[index - 1] if index > 0 else None,
     }
@@ -20,13 +20,24 @@ class PricingRule(str, Enum):
 
 
 class CustomerTier(str, Enum):
-    """Customer tier classification"""
+    """
+    Customer tier classification
+
+    REGULAR is the Data Connect CustomerTier WALK_IN; "WALK_IN" parses to it.
+    """
     PLATINUM = "PLATINUM"
+    DIAMOND = "DIAMOND"
     GOLD = "GOLD"
     SILVER = "SILVER"
     BRONZE = "BRONZE"
     REGULAR = "REGULAR"
 
+    @classmethod
+    def _missing_(cls, value):
+        if value == "WALK_IN":
+            return cls.REGULAR
+        return None
+
 
 class PriceCalculationRequest(BaseModel):
     """Request to calculate customer-specific price"""
@@ -34,6 +45,7 @@ class PriceCalculationRequest(BaseModel):
     customer_id: str
     location_id: str
     quantity: int = Field(ge=1, description="Quantity to purchase")
+    coupon_code: Optional[str] = Field(None, description="Coupon code for a coupon-only promotion")
     
     class Config:
         json_schema_extra = {
@@ -61,6 +73,7 @@ class PriceCalculationResponse(BaseModel):
     pricing_rule: PricingRule
     discount_percentage: Optional[float] = None
     discount_amount: Optional[float] = None
+    coupon_code: Optional[str] = Field(None, description="Coupon whose promotion priced this line")
     
     # Additional info
     customer_tier: Optional[CustomerTier] = None
@@ -70,11 +83,18 @@ class PriceCalculationResponse(BaseModel):
     calculated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class BulkPriceItem(BaseModel):
+    """One cart line in a bulk price request"""
+    product_id: str
+    quantity: int = Field(1, ge=1, description="Quantity to purchase")
+
+
 class BulkPriceRequest(BaseModel):
     """Request to calculate prices for multiple products"""
     customer_id: str
     location_id: str
-    items: List[dict] = Field(description="List of {product_id, quantity}")
+    items: List[BulkPriceItem] = Field(description="List of {product_id, quantity}")
+    coupon_code: Optional[str] = Field(None, description="Coupon code applied to the whole cart")
 
 
 class BulkPriceResponse(BaseModel):
@@ -0,0 +1,23 @@
+"""
+Pricing tiers
+
+Customer tier -> ProductPricing price column mapping. Kept apart from the
+price book so the router can describe tiers without importing NumPy (the
+engine is built lazily).
+"""
+
+from .schemas import CustomerTier
+
+# Price columns held per product, lowest tier first
+TIER_COLUMNS = ("walkInPrice", "bronzePrice", "silverPrice", "goldPrice", "diamondPrice", "platinumPrice")
+BASE_COLUMN = 0
+
+# Customer tier -> row of the tier matrix (REGULAR is the Data Connect WALK_IN tier)
+TIER_INDEX = {
+    CustomerTier.REGULAR: 0,
+    CustomerTier.BRONZE: 1,
+    CustomerTier.SILVER: 2,
+    CustomerTier.GOLD: 3,
+    CustomerTier.DIAMOND: 4,
+    CustomerTier.PLATINUM: 5,
+}
@@ -0,0 +1,121 @@
+"""
+Volume Discount Ladders
+
+A ladder is a product's volume discount rungs (minimumQuantity plus a
+discountPercent and/or a fixed per-unit discountAmount) compiled into sorted
+arrays: a quantity's rung is found by binary search instead of walking
+thresholds.
+
+Ladders come from ProductPricing.volumeDiscounts (JSONB): a list of rungs
+for one product, compiled once when the price book applies the row.
+Identical JSON shares one compiled ladder. The VolumeDiscount table is not
+used: it has no business column, so its rows would apply to every tenant.
+"""
+
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Union
+from bisect import bisect_right
+from functools import lru_cache
+import logging
+
+import numpy as np
+
+from core.serialization import json_dumps_canonical, json_loads
+
+logger = logging.getLogger(__name__)
+
+
+class VolumeLadder:
+    """
+    Compiled volume discount rungs, sorted by minimumQuantity
+
+    A quantity earns the highest rung whose minimumQuantity it reaches. The
+    unit discount is the larger of the rung's percent of the base price and
+    its fixed discountAmount, capped at the base price.
+    """
+
+    __slots__ = ("min_quantities", "percents", "amounts", "_bounds")
+
+    def __init__(self, rungs: Iterable[Dict[str, Any]]):
+        compiled = sorted(
+            (int(rung["minimumQuantity"]), float(rung.get("discountPercent") or 0.0), float(rung.get("discountAmount") or 0.0))
+            for rung in rungs
+            if rung.get("minimumQuantity") is not None
+        )
+        self.min_quantities = np.array([rung[0] for rung in compiled], dtype=np.int64)
+        self.percents = np.array([rung[1] for rung in compiled])
+        self.amounts = np.array([rung[2] for rung in compiled])
+        self._bounds = self.min_quantities.tolist()
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def unit_discount(self, quantity: int, base_price: float) -> float:
+        """Discount per unit for one line"""
+        i = bisect_right(self._bounds, quantity) - 1
+        if i < 0:
+            return 0.0
+        return float(min(base_price, max(base_price * self.percents[i] / 100, self.amounts[i])))
+
+    def unit_discounts(self, quantities: np.ndarray, base_prices: np.ndarray) -> np.ndarray:
+        """Discount per unit for many lines at once (same ladder)"""
+        i = np.searchsorted(self.min_quantities, quantities, side="right") - 1
+        rung = np.maximum(i, 0)
+        discounts = np.minimum(base_prices, np.maximum(base_prices * self.percents[rung] / 100, self.amounts[rung]))
+        return np.where(i >= 0, discounts, 0.0)
+
+
+@lru_cache(maxsize=4096)
+def _compile(raw: str) -> Optional[VolumeLadder]:
+    try:
+        rungs = json_loads(raw)
+        if not isinstance(rungs, list):
+            raise ValueError("expected a list of rungs")
+        ladder = VolumeLadder(rungs)
+    except (ValueError, TypeError, KeyError) as e:
+        logger.warning(f"⚠️ Ignoring malformed volume discount ladder {raw[:100]!r}: {e}")
+        return None
+    return ladder if len(ladder) else None
+
+
+def compile_ladder(raw: Union[str, List[Dict[str, Any]], None]) -> Optional[VolumeLadder]:
+    """
+    Compile a volumeDiscounts JSONB value (JSON text or already decoded)
+
+    Returns:
+        The shared compiled ladder, or None when empty or malformed
+    """
+    if not raw:
+        return None
+    if not isinstance(raw, str):
+        raw = json_dumps_canonical(raw)
+    return _compile(raw)
+
+
+def unit_discounts(
+    ladders: Sequence[Optional[VolumeLadder]],
+    quantities: np.ndarray,
+    base_prices: np.ndarray
+) -> np.ndarray:
+    """
+    Volume discount per unit for a cart
+
+    Lines are grouped by ladder so each distinct ladder is searched once for
+    all of its lines.
+
+    Args:
+        ladders: Product ladder per line (None for no discount)
+        quantities: Quantity per line
+        base_prices: Base unit price per line
+    """
+    discounts = np.zeros(len(ladders))
+    groups: Dict[int, List[int]] = {}
+    by_id: Dict[int, VolumeLadder] = {}
+    for i, ladder in enumerate(ladders):
+        if ladder is not None:
+            groups.setdefault(id(ladder), []).append(i)
+            by_id[id(ladder)] = ladder
+    for key, lines in groups.items():
+        lines = np.array(lines, dtype=np.int64)
+        discounts[lines] = by_id[key].unit_discounts(quantities[lines], base_prices[lines])
+    return discounts
+
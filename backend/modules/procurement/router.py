@@ -7,6 +7,7 @@ FastAPI endpoints for procurement operations including 3-way matching and approv
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import Dict
 
+from core.lazy import lazy_instance
 from core.security import get_current_user, require_permissions
 from .schemas import (
     MatchingRequest,
@@ -14,11 +15,18 @@ from .schemas import (
     ApprovalRequest,
     ApprovalResponse
 )
-from .matching_service import MatchingService
 
 
 router = APIRouter()
-matching_service = MatchingService()
+
+
+def _create_matching_service():
+    from .matching_service import MatchingService
+    return MatchingService()
+
+
+# Built on first use with LAZY_IMPORTS
+matching_service = lazy_instance(_create_matching_service, label="MatchingService")
 
 
 @router.post("/invoices/match", response_model=MatchingResponse)
@@ -7,12 +7,24 @@ Handles business profile and configuration management.
 from typing import Dict, Optional
 from datetime import datetime
 import uuid
+import logging
+
+from config.settings import settings
 
 from ..schemas import (
     BusinessProfileUpdate,
     BusinessProfileResponse
 )
-from ...shared.dataconnect_client import DataConnectClient
+from ...shared.dataconnect_client import async_dataconnect_client, DataConnectError
+
+logger = logging.getLogger(__name__)
+
+
+class BusinessNotFoundError(LookupError):
+    """
+    Raised when a business id has no Business row
+    """
+
 
 class BusinessService:
     """
@@ -22,34 +34,22 @@ class BusinessService:
     async def get_profile(self, business_id: str) -> BusinessProfileResponse:
         """
         Get business profile from Data Connect
+
+        Raises:
+            BusinessNotFoundError: If the business does not exist
+            DataConnectError: If Data Connect fails (outages are surfaced, not masked)
         """
         try:
-            dataconnect_client = DataConnectClient()
-
-            # Execute query to get business by ID
-            result = dataconnect_client.execute_mutation(
+            # Execute query to get business by ID (served from the query cache when warm)
+            result = await async_dataconnect_client.execute_query(
                 "GetBusinessById",
-                {"businessId": business_id}
+                {"id": business_id}
             )
-
-            if result and 'business' in result:
-                business_data = result['business']
-                return BusinessProfileResponse(
-                    business_id=business_data['id'],
-                    business_name=business_data['name'],
-                    tax_id=business_data.get('taxId', ''),
-                    email=business_data.get('email', 'admin@bizpharma.app'),
-                    phone=business_data.get('phone', '+923001234567'),
-                    created_at=datetime.fromisoformat(business_data['createdAt']),
-                    updated_at=datetime.fromisoformat(business_data['updatedAt']),
-                    status=business_data.get('status', 'active'),
-                    subscription_tier=business_data.get('tier', 'free')
-                )
-            else:
-                raise Exception("Business not found in Data Connect")
-
-        except Exception as e:
-            # Fallback to mock data if Data Connect fails
+        except DataConnectError as e:
+            if settings.ENV != "DEV":
+                raise
+            # Local dev without the emulator running: keep serving the demo profile
+            logger.warning(f"⚠️ Data Connect unavailable, using demo business profile: {e}")
             return BusinessProfileResponse(
                 business_id=business_id,
                 business_name="BizPharma Demo",
@@ -62,6 +62,22 @@ class BusinessService:
                 subscription_tier="gold"
             )
 
+        business_data = (result or {}).get('data', {}).get('business')
+        if not business_data:
+            raise BusinessNotFoundError("Business not found")
+
+        return BusinessProfileResponse(
+            business_id=business_data['id'],
+            business_name=business_data['name'],
+            tax_id=business_data.get('taxId', ''),
+            email=business_data.get('email', 'admin@bizpharma.app'),
+            phone=business_data.get('phone') or '+923001234567',
+            created_at=datetime.fromisoformat(business_data['createdAt']),
+            updated_at=datetime.fromisoformat(business_data['updatedAt']),
+            status='active' if business_data.get('isActive', True) else 'inactive',
+            subscription_tier=business_data.get('tier', 'free')
+        )
+
     async def update_profile(
         self,
         business_id: str,
@@ -71,8 +87,6 @@ class BusinessService:
         Update business profile in Data Connect
         """
         try:
-            dataconnect_client = DataConnectClient()
-
             # Execute mutation to update business
             update_vars = {
                 "businessId": business_id,
@@ -85,7 +99,7 @@ class BusinessService:
                 "timezone": data.timezone
             }
 
-            result = dataconnect_client.execute_mutation(
+            result = await async_dataconnect_client.execute_mutation(
                 "UpdateBusinessProfile",
                 update_vars
             )
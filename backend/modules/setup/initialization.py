@@ -3,10 +3,14 @@ setup_initialization.py
 """
 import uuid
 from typing import Dict
-from firebase_admin import auth
+from config.firebase_config import auth
 from datetime import datetime
 from .schemas import SetupInitializeRequest, BusinessProfileResponse
-from ..shared.dataconnect_client import DataConnectClient
+from ..shared.dataconnect_client import async_dataconnect_client
+from core.permissions import permission_cache
+from core.tenant import tenant_resolver
+from core.executors import admin_executor
+from ..auth.profile_cache import profile_cache
 
 async def initialize_business(user_id: str, data: SetupInitializeRequest) -> BusinessProfileResponse:
     """
@@ -17,9 +21,6 @@ async def initialize_business(user_id: str, data: SetupInitializeRequest) -> Bus
     """
     business_id = str(uuid.uuid4())
 
-    # Create Data Connect client
-    dataconnect_client = DataConnectClient()
-
     # Create business and admin user in Cloud SQL
     try:
         # Sanitize data for production safety (safeguard)
@@ -28,7 +29,7 @@ async def initialize_business(user_id: str, data: SetupInitializeRequest) -> Bus
             sanitized_phone = sanitized_phone[:15]
             print(f"⚠️ Truncated phone number for schema compatibility: {data.phone} -> {sanitized_phone}")
 
-        await dataconnect_client.create_business_and_admin(
+        await async_dataconnect_client.create_business_and_admin(
             business_id=business_id,
             business_name=data.business_name,
             user_email=data.email or "user@example.com",
@@ -45,11 +46,15 @@ async def initialize_business(user_id: str, data: SetupInitializeRequest) -> Bus
 
     # Set custom claims so subsequent requests work
     # This is REAL logic, not mock
-    auth.set_custom_user_claims(user_id, {
+    await admin_executor.run(auth.set_custom_user_claims, user_id, {
         'business_id': business_id,
         'role': 'admin',
         'tier': 'free'
     })
+    # The user's role/business just changed
+    permission_cache.invalidate(uid=user_id)
+    tenant_resolver.invalidate(user_id)
+    profile_cache.invalidate(user_id)
 
     return BusinessProfileResponse(
         business_id=business_id,
@@ -14,7 +14,8 @@ from .schemas import (
     LocationCreate,
     LocationResponse
 )
-from .business.service import BusinessService
+from .business.service import BusinessService, BusinessNotFoundError
+from ..shared.dataconnect_client import DataConnectError, DataConnectUnavailableError
 from .locations.service import LocationService
 
 
@@ -47,8 +48,15 @@ async def get_business_profile(
     business_id = current_user.get("business_id")
     if not business_id:
         raise HTTPException(400, "User not associated with a business")
-        
-    return await business_service.get_profile(business_id)
+
+    try:
+        return await business_service.get_profile(business_id)
+    except BusinessNotFoundError as e:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, str(e))
+    except DataConnectUnavailableError as e:
+        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, str(e))
+    except DataConnectError as e:
+        raise HTTPException(status.HTTP_502_BAD_GATEWAY, f"Failed to load business profile: {str(e)}")
 
 
 @router.put("/business", response_model=BusinessProfileResponse)
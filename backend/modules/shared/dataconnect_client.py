@@ -2,20 +2,70 @@
 Data Connect Client for Cloud SQL operations
 """
 
-from typing import Dict, Any, Optional
-import requests
-import json
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
+import asyncio
+import base64
+import time
+import httpx
 from datetime import datetime
 from config.settings import settings
-from google.auth import jwt
-from google.auth.transport import requests as auth_requests 
+from core.serialization import json_dumps, json_dumps_pretty, json_loads
+from core.lazy import lazy_import
+from core.metrics import metrics
+from core.tracing import tracer
 import logging
 
+from .token_cache import access_token_cache
+from .query_cache import query_cache
+from .single_flight import query_flight
+from .resilience import RetryPolicy, CircuitBreaker, LatencyTracker, is_transient
+
+# Only the legacy synchronous client uses requests
+requests = lazy_import("requests")
+
+# Upstream latency per operation, including retries and hedging (cache hits are not calls)
+dataconnect_request_duration = metrics.histogram(
+    "dataconnect_request_duration_seconds",
+    "Data Connect operation latency",
+    ("operation", "kind", "outcome"),
+)
+
 logger = logging.getLogger(__name__)
 
-class DataConnectClient:
+
+class DataConnectError(Exception):
     """
-    Client for interacting with Firebase Data Connect
+    Raised when a Data Connect operation fails
+
+    Carries the HTTP status and raw response body (when available) so callers
+    can tell an upstream outage apart from a rejected request.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        operation_name: Optional[str] = None,
+        status_code: Optional[int] = None,
+        body: Optional[str] = None
+    ):
+        super().__init__(message)
+        self.operation_name = operation_name
+        self.status_code = status_code
+        self.body = body
+
+
+class DataConnectUnavailableError(DataConnectError):
+    """
+    Raised without calling upstream while the endpoint's circuit breaker is open
+    """
+
+
+class BaseDataConnectClient:
+    """
+    Connector addressing and request building shared by the blocking and async clients
+
+    The two clients expose the same operation names but different call
+    conventions (plain vs coroutine methods), so neither derives from the other.
     """
 
     def __init__(self):
@@ -24,126 +74,163 @@ class DataConnectClient:
         self.location = settings.DATA_CONNECT_LOCATION
         self.service = settings.DATA_CONNECT_SERVICE
         self.connector = settings.DATA_CONNECT_CONNECTOR
+        self.cache = query_cache if settings.DATA_CONNECT_QUERY_CACHE_ENABLED else None
 
-    def _get_access_token(self) -> str:
-        """
-        Get access token for Data Connect API using ADC or Service Account
-        """
-        try:
-            import google.auth
-            import google.auth.transport.requests
-
-            # Use Application Default Credentials (works on Cloud Run & Local with gcloud auth application-default login)
-            scopes = ['https://www.googleapis.com/auth/cloud-platform']
-            creds, project = google.auth.default(scopes=scopes)
-            
-            # Refresh token
-            auth_req = google.auth.transport.requests.Request()
-            creds.refresh(auth_req)
-            
-            return creds.token
-
-        except Exception as e:
-            logger.error(f"⚠️ Failed to get real access token: {e}")
-            # Fallback only for local dev without credentials
-            if settings.ENV == "DEV":
-                return "mock-token-fallback"
-            raise e
-
-    def execute_mutation(self, mutation_name: str, variables: Dict[str, Any], id_token: Optional[str] = None) -> Dict[str, Any]:
+    def _operation_url(self, verb: str) -> str:
         """
-        Execute a Data Connect mutation
+        Build the connector URL for an operation verb (executeQuery / executeMutation)
         """
-        if id_token:
-            access_token = id_token
-        else:
-            access_token = self._get_access_token()
-
         # Always use v1beta for now as Data Connect is in Preview
         api_version = "v1beta"
-        url = f"{self.endpoint}/{api_version}/projects/{self.project_id}/locations/{self.location}/services/{self.service}/connectors/{self.connector}:executeMutation"
+        return f"{self.endpoint}/{api_version}/projects/{self.project_id}/locations/{self.location}/services/{self.service}/connectors/{self.connector}:{verb}"
+
+    @staticmethod
+    def _build_request(operation_name: str, variables: Dict[str, Any], access_token: str) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Build the headers and JSON payload for a named operation
 
+        Returns:
+            Tuple of (headers, payload)
+        """
         headers = {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json",
         }
-
         payload = {
-            "operationName": mutation_name,
+            "operationName": operation_name,
             "variables": variables
         }
+        return headers, payload
+
+    @staticmethod
+    def _business_and_admin_variables(
+        business_id: str,
+        business_name: str,
+        user_email: str,
+        user_first_name: str,
+        user_last_name: str,
+        user_mobile: str,
+        auth_uid: str,
+        user_profile_photo: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Variables for the CreateBusinessAndAdmin mutation
+        """
+        return {
+            "businessId": business_id,
+            "businessName": business_name,
+            "userEmail": user_email,
+            "userFirstName": user_first_name,
+            "userLastName": user_last_name,
+            "userMobile": user_mobile,
+            "userProfilePhoto": user_profile_photo,
+            "authUid": auth_uid,
+            "today": datetime.utcnow().strftime("%Y-%m-%d")
+        }
+
+
+class DataConnectClient(BaseDataConnectClient):
+    """
+    Client for interacting with Firebase Data Connect
+    """
+
+    def _get_access_token(self) -> str:
+        """
+        Get access token for Data Connect API using ADC or Service Account
+
+        Served from the process-wide token cache, which refreshes in the background.
+        """
+        return access_token_cache.get_token()
+
+    def execute_mutation(self, mutation_name: str, variables: Dict[str, Any], id_token: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Execute a Data Connect mutation
+        """
+        access_token = id_token or self._get_access_token()
+        url = self._operation_url("executeMutation")
+        headers, payload = self._build_request(mutation_name, variables, access_token)
 
         try:
             logger.debug(f"🚀 EXECUTING GQL: {mutation_name}")
             logger.debug(f"   URL: {url}")
             
             # Safe logging of payload
-            logger.debug(f"   PAYLOAD: {json.dumps(payload, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"   PAYLOAD: {json_dumps_pretty(payload)}")
 
-            response = requests.post(url, headers=headers, json=payload)
+            response = requests.post(url, headers=headers, data=json_dumps(payload))
             
             # Log Data Connect response details
             logger.debug(f"📥 Data Connect Response [{response.status_code}]")
-            try:
-                response_json = response.json()
-                logger.debug(f"   RESPONSE BODY: {json.dumps(response_json, indent=2)}")
-            except:
-                logger.debug(f"   RESPONSE BODY (raw): {response.text}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"   RESPONSE BODY: {response.text}")
 
             response.raise_for_status()
-            return response.json()
+            result = json_loads(response.content)
+            if self.cache is not None:
+                self.cache.invalidate(mutation_name, variables)
+            return result
         except requests.exceptions.RequestException as e:
             error_msg = f"Data Connect mutation failed: {str(e)}"
             if hasattr(e, 'response') and e.response is not None:
                 error_msg += f" | Body: {e.response.text}"
             logger.error(f"❌ {error_msg}")
-            raise Exception(error_msg)
+            raise DataConnectError(
+                error_msg,
+                operation_name=mutation_name,
+                status_code=e.response.status_code if e.response is not None else None,
+                body=e.response.text if e.response is not None else None
+            )
 
     def execute_query(self, query_name: str, variables: Dict[str, Any], id_token: Optional[str] = None) -> Dict[str, Any]:
         """
         Execute a Data Connect query
-        """
-        if id_token:
-            access_token = id_token
-        else:
-            access_token = self._get_access_token()
-
-        # Always use v1beta for now
-        api_version = "v1beta"
-        url = f"{self.endpoint}/{api_version}/projects/{self.project_id}/locations/{self.location}/services/{self.service}/connectors/{self.connector}:executeQuery"
 
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-        }
+        Reference queries registered in query_cache are served read-through
+        when sent with the service account.
+        """
+        cache = self.cache if not id_token else None
+        if cache is not None:
+            cached = cache.get(query_name, variables)
+            if cached is not None:
+                return cached
 
-        payload = {
-            "operationName": query_name,
-            "variables": variables
-        }
+        access_token = id_token or self._get_access_token()
+        url = self._operation_url("executeQuery")
+        headers, payload = self._build_request(query_name, variables, access_token)
+        reservation = cache.reserve(query_name, variables) if cache is not None else None
 
         try:
             logger.debug(f"🔍 EXECUTING GQL QUERY: {query_name}")
             logger.debug(f"   URL: {url}")
-            logger.debug(f"   PAYLOAD: {json.dumps(payload, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"   PAYLOAD: {json_dumps_pretty(payload)}")
 
-            response = requests.post(url, headers=headers, json=payload)
+            response = requests.post(url, headers=headers, data=json_dumps(payload))
             
             logger.debug(f"📥 Data Connect Response [{response.status_code}]")
-            try:
-                response_json = response.json()
-                logger.debug(f"   RESPONSE BODY: {json.dumps(response_json, indent=2)}")
-            except:
-                logger.debug(f"   RESPONSE BODY (raw): {response.text}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"   RESPONSE BODY: {response.text}")
 
             response.raise_for_status()
-            return response.json()
+            result = json_loads(response.content)
+            if cache is not None:
+                cache.set(query_name, variables, result, reservation)
+            return result
         except requests.exceptions.RequestException as e:
             error_msg = f"Data Connect query failed: {str(e)}"
             if hasattr(e, 'response') and e.response is not None:
                 error_msg += f" | Body: {e.response.text}"
             logger.error(f"❌ {error_msg}")
-            raise Exception(error_msg)
+            raise DataConnectError(
+                error_msg,
+                operation_name=query_name,
+                status_code=e.response.status_code if e.response is not None else None,
+                body=e.response.text if e.response is not None else None
+            )
+        finally:
+            if cache is not None:
+                cache.release(reservation)
 
     async def create_business_and_admin(
         self,
@@ -160,20 +247,476 @@ class DataConnectClient:
         """
         Execute the CreateBusinessAndAdmin mutation
         """
-        variables = {
-            "businessId": business_id,
-            "businessName": business_name,
-            "userEmail": user_email,
-            "userFirstName": user_first_name,
-            "userLastName": user_last_name,
-            "userMobile": user_mobile,
-            "userProfilePhoto": user_profile_photo,
-            "authUid": auth_uid,
-            "today": datetime.utcnow().strftime("%Y-%m-%d")
-        }
+        variables = self._business_and_admin_variables(
+            business_id, business_name, user_email, user_first_name,
+            user_last_name, user_mobile, auth_uid, user_profile_photo
+        )
 
         try:
             result = self.execute_mutation("CreateBusinessAndAdmin", variables, id_token=id_token)
             return result
         except Exception as e:
-            raise Exception(f"Failed to create business and admin: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Failed to create business and admin: {str(e)}")
+
+
+class AsyncDataConnectClient(BaseDataConnectClient):
+    """
+    Non-blocking Data Connect client for use on the request path
+
+    Wraps a single shared httpx.AsyncClient so every query and mutation reuses
+    pooled keep-alive connections (HTTP/2 where the endpoint negotiates it)
+    instead of opening a new TCP/TLS connection per call. The pool is opened in
+    the application lifespan and closed on shutdown.
+
+    Every call goes to the single Data Connect host, so the pool limits below
+    are effectively per-host limits.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        super().__init__()
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self.flight = query_flight if settings.DATA_CONNECT_COALESCE_QUERIES else None
+
+        # Resilience: retries for idempotent queries, a breaker per endpoint,
+        # and optional hedged reads once the latency window is warm
+        self.retry_policy = RetryPolicy(
+            max_attempts=settings.DATA_CONNECT_RETRY_ATTEMPTS,
+            base_delay=settings.DATA_CONNECT_RETRY_BASE_DELAY,
+            max_delay=settings.DATA_CONNECT_RETRY_MAX_DELAY,
+        )
+        self.breakers: Dict[str, CircuitBreaker] = {
+            verb: CircuitBreaker(
+                name=verb,
+                failure_threshold=settings.DATA_CONNECT_BREAKER_FAILURE_THRESHOLD,
+                reset_timeout=settings.DATA_CONNECT_BREAKER_RESET_TIMEOUT,
+            )
+            for verb in ("executeQuery", "executeMutation")
+        }
+        self.read_latency = LatencyTracker()
+        self.hedge_reads = settings.DATA_CONNECT_HEDGE_READS
+
+        # Metrics
+        self.retries = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Check if the connection pool is open"""
+        return self._client is not None and not self._client.is_closed
+
+    async def open(self) -> httpx.AsyncClient:
+        """
+        Open the shared connection pool
+
+        Returns:
+            httpx.AsyncClient: The pooled HTTP client
+        """
+        if self.is_open:
+            return self._client
+
+        limits = httpx.Limits(
+            max_connections=settings.DATA_CONNECT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.DATA_CONNECT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.DATA_CONNECT_KEEPALIVE_EXPIRY,
+        )
+        self._client = httpx.AsyncClient(
+            http2=settings.DATA_CONNECT_HTTP2,
+            limits=limits,
+            timeout=httpx.Timeout(settings.DATA_CONNECT_TIMEOUT),
+            transport=self._transport,
+        )
+        logger.debug(
+            f"🔌 Data Connect pool opened (http2={settings.DATA_CONNECT_HTTP2}, "
+            f"max_connections={settings.DATA_CONNECT_MAX_CONNECTIONS})"
+        )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.debug("🔌 Data Connect pool closed")
+
+    async def ping(self, timeout: Optional[float] = None) -> float:
+        """
+        Check that the Data Connect endpoint is reachable through the pool
+
+        Any HTTP response counts as reachable (the service root has no handler).
+
+        Returns:
+            float: Round-trip time in seconds
+
+        Raises:
+            httpx.HTTPError: If the endpoint cannot be reached
+        """
+        client = await self.open()
+        start = time.perf_counter()
+        await client.get(f"{self.endpoint}/", timeout=timeout)
+        return time.perf_counter() - start
+
+    async def _execute(
+        self,
+        verb: str,
+        operation_name: str,
+        variables: Dict[str, Any],
+        id_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Run an operation through the circuit breaker, retry policy and hedging
+
+        Queries are idempotent: they are retried on transient failures and may be
+        hedged. Mutations are sent exactly once.
+
+        Raises:
+            DataConnectUnavailableError: If the endpoint's circuit is open
+            DataConnectError: If the operation fails
+        """
+        kind = "query" if verb == "executeQuery" else "mutation"
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            with tracer.span(f"dataconnect.{kind} {operation_name}", {"dataconnect.operation": operation_name}):
+                result = await self._execute_with_retries(verb, operation_name, variables, id_token)
+            outcome = "ok"
+            return result
+        finally:
+            dataconnect_request_duration.observe(time.perf_counter() - start, operation_name, kind, outcome)
+
+    async def _execute_with_retries(
+        self,
+        verb: str,
+        operation_name: str,
+        variables: Dict[str, Any],
+        id_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        breaker = self.breakers[verb]
+        idempotent = verb == "executeQuery"
+        attempts = self.retry_policy.max_attempts if idempotent else 1
+
+        for attempt in range(attempts):
+            if not breaker.allow():
+                raise DataConnectUnavailableError(
+                    f"Data Connect {verb} circuit is open, failing fast",
+                    operation_name=operation_name,
+                    status_code=503
+                )
+
+            started = time.perf_counter()
+            try:
+                if idempotent and self.hedge_reads:
+                    result = await self._hedged_post(verb, operation_name, variables, id_token)
+                else:
+                    result = await self._post(verb, operation_name, variables, id_token)
+            except DataConnectError as e:
+                if not is_transient(e):
+                    # The request was rejected, the endpoint itself is healthy
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if attempt + 1 >= attempts:
+                    raise
+                self.retries += 1
+                delay = self.retry_policy.backoff(attempt)
+                logger.warning(f"🔁 Retrying {operation_name} in {delay * 1000:.0f}ms (attempt {attempt + 2}/{attempts})")
+                await asyncio.sleep(delay)
+                continue
+            except asyncio.CancelledError:
+                # Caller went away (or a hedge was cancelled): no outcome, free the probe slot
+                breaker.release()
+                raise
+            except Exception:
+                # Anything unexpected (e.g. a 200 with an undecodable body) counts against the endpoint
+                breaker.record_failure()
+                raise
+
+            breaker.record_success()
+            if idempotent:
+                self.read_latency.record(time.perf_counter() - started)
+            return result
+
+    async def _hedged_post(
+        self,
+        verb: str,
+        operation_name: str,
+        variables: Dict[str, Any],
+        id_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a read, and a duplicate if the first has not answered by the p95 latency
+
+        The first successful response wins and the loser is cancelled.
+        """
+        p95 = self.read_latency.percentile(95)
+        if p95 is None:
+            return await self._post(verb, operation_name, variables, id_token)
+
+        hedge_delay = max(p95, settings.DATA_CONNECT_HEDGE_MIN_DELAY)
+        primary = asyncio.ensure_future(self._post(verb, operation_name, variables, id_token))
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        self.hedges_sent += 1
+        logger.debug(f"🪝 HEDGING {operation_name} after {hedge_delay * 1000:.0f}ms")
+        hedge = asyncio.ensure_future(self._post(verb, operation_name, variables, id_token))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedges_won += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _post(
+        self,
+        verb: str,
+        operation_name: str,
+        variables: Dict[str, Any],
+        id_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        POST a named operation to the connector over the pooled client
+        """
+        if id_token:
+            access_token = id_token
+        else:
+            with tracer.span("dataconnect.access_token"):
+                access_token = await access_token_cache.get_token_async()
+
+        client = await self.open()
+        url = self._operation_url(verb)
+        headers, payload = self._build_request(operation_name, variables, access_token)
+
+        kind = "mutation" if verb == "executeMutation" else "query"
+
+        try:
+            logger.debug(f"🚀 EXECUTING GQL ({kind}): {operation_name}")
+            logger.debug(f"   URL: {url}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"   PAYLOAD: {json_dumps_pretty(payload)}")
+
+            with tracer.span("dataconnect.post", {"http.url": url}, kind="client") as span:
+                traceparent = tracer.current_traceparent()
+                if traceparent:
+                    headers["traceparent"] = traceparent
+                response = await client.post(url, headers=headers, content=json_dumps(payload))
+                span.set_attribute("http.status_code", response.status_code)
+
+            logger.debug(f"📥 Data Connect Response [{response.status_code}] ({response.http_version})")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"   RESPONSE BODY: {response.text}")
+
+            response.raise_for_status()
+            return json_loads(response.content)
+        except httpx.HTTPStatusError as e:
+            error_msg = f"Data Connect {kind} failed: {str(e)} | Body: {e.response.text}"
+            logger.error(f"❌ {error_msg}")
+            raise DataConnectError(
+                error_msg,
+                operation_name=operation_name,
+                status_code=e.response.status_code,
+                body=e.response.text
+            )
+        except httpx.HTTPError as e:
+            error_msg = f"Data Connect {kind} failed: {type(e).__name__}: {str(e)}"
+            logger.error(f"❌ {error_msg}")
+            raise DataConnectError(error_msg, operation_name=operation_name)
+
+    async def execute_mutation(self, mutation_name: str, variables: Dict[str, Any], id_token: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Execute a Data Connect mutation
+        """
+        result = await self._execute("executeMutation", mutation_name, variables, id_token=id_token)
+        if self.cache is not None:
+            self.cache.invalidate(mutation_name, variables)
+        return result
+
+    async def execute_query(self, query_name: str, variables: Dict[str, Any], id_token: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Execute a Data Connect query
+
+        Reference queries registered in query_cache are served read-through
+        when sent with the service account (a caller's ID token bypasses the
+        cache, as its results may be scoped to that caller). Concurrent
+        identical queries (same variables and caller token) share a single
+        upstream call.
+        """
+        cache = self.cache if not id_token else None
+        if cache is not None:
+            cached = cache.get(query_name, variables)
+            if cached is not None:
+                return cached
+
+        async def fetch() -> Dict[str, Any]:
+            reservation = cache.reserve(query_name, variables) if cache is not None else None
+            try:
+                result = await self._execute("executeQuery", query_name, variables, id_token=id_token)
+                if cache is not None:
+                    cache.set(query_name, variables, result, reservation)
+                return result
+            finally:
+                if cache is not None:
+                    cache.release(reservation)
+
+        if self.flight is None:
+            return await fetch()
+
+        key = query_cache.make_key(query_name, variables) + (id_token or "",)
+        return await self.flight.do(key, fetch)
+
+    @staticmethod
+    def encode_cursor(offset: int) -> str:
+        """Encode a page position as an opaque cursor"""
+        return base64.urlsafe_b64encode(f"o:{offset}".encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: Optional[str]) -> int:
+        """
+        Decode a cursor produced by encode_cursor
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        if not cursor:
+            return 0
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            kind, _, value = raw.partition(":")
+            if kind != "o" or int(value) < 0:
+                raise ValueError
+            return int(value)
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError(f"Invalid pagination cursor: {cursor}")
+
+    async def fetch_page(
+        self,
+        query_name: str,
+        variables: Dict[str, Any],
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        id_token: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Fetch one page of a paginated connector query
+
+        The query must accept $limit and $offset and select a single list field
+        in a stable order (see ListInventoryByLocationPage). Pages bypass the
+        query cache and coalescing but keep retries and the circuit breaker.
+
+        Args:
+            query_name: Paginated query operation name
+            variables: Query variables, without limit/offset
+            page_size: Rows per page (defaults to DATA_CONNECT_PAGE_SIZE)
+            cursor: Cursor returned with the previous page, None for the first
+
+        Returns:
+            Tuple of (rows, next_cursor); next_cursor is None on the last page
+        """
+        page_size = page_size or settings.DATA_CONNECT_PAGE_SIZE
+        offset = self.decode_cursor(cursor)
+
+        result = await self._execute(
+            "executeQuery",
+            query_name,
+            {**variables, "limit": page_size, "offset": offset},
+            id_token=id_token
+        )
+        if result.get("errors"):
+            raise DataConnectError(
+                f"Data Connect query {query_name} returned errors: {result['errors']}",
+                operation_name=query_name,
+                body=json_dumps(result["errors"]).decode()
+            )
+
+        data = result.get("data") or {}
+        rows = next(iter(data.values()), None) or []
+        next_cursor = self.encode_cursor(offset + len(rows)) if len(rows) == page_size else None
+        return rows, next_cursor
+
+    async def iter_pages(
+        self,
+        query_name: str,
+        variables: Dict[str, Any],
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        id_token: Optional[str] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Lazily yield pages of a paginated query
+
+        Only one page is held in memory at a time; the next page is requested
+        when the consumer asks for it.
+
+        Usage:
+            async for rows in client.iter_pages("ListInventoryByLocationPage", {"businessId": biz, "locationId": loc}):
+                ...
+        """
+        while True:
+            rows, cursor = await self.fetch_page(query_name, variables, page_size, cursor, id_token=id_token)
+            if rows:
+                yield rows
+            if cursor is None:
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters for the request path: token cache, query cache, coalescing and resilience
+        """
+        p95 = self.read_latency.percentile(95)
+        return {
+            "token": access_token_cache.stats(),
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "coalescing": self.flight.stats() if self.flight is not None else None,
+            "resilience": {
+                "retries": self.retries,
+                "hedges_sent": self.hedges_sent,
+                "hedges_won": self.hedges_won,
+                "read_p95_ms": round(p95 * 1000, 2) if p95 is not None else None,
+                "breakers": {verb: breaker.stats() for verb, breaker in self.breakers.items()},
+            },
+        }
+
+    async def create_business_and_admin(
+        self,
+        business_id: str,
+        business_name: str,
+        user_email: str,
+        user_first_name: str,
+        user_last_name: str,
+        user_mobile: str,
+        auth_uid: str,
+        id_token: Optional[str] = None,
+        user_profile_photo: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute the CreateBusinessAndAdmin mutation
+        """
+        variables = self._business_and_admin_variables(
+            business_id, business_name, user_email, user_first_name,
+            user_last_name, user_mobile, auth_uid, user_profile_photo
+        )
+
+        try:
+            return await self.execute_mutation("CreateBusinessAndAdmin", variables, id_token=id_token)
+        except DataConnectError as e:
+            raise DataConnectError(
+                f"Failed to create business and admin: {str(e)}",
+                operation_name=e.operation_name,
+                status_code=e.status_code,
+                body=e.body
+            )
+
+
+# Shared pooled client, opened/closed by the application lifespan in main.py
+async_dataconnect_client = AsyncDataConnectClient()
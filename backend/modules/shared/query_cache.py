@@ -0,0 +1,314 @@
+"""
+Query Result Cache for Data Connect
+
+Read-through cache for reference queries that rarely change (business profile,
+locations, pricing, product catalog). Entries are bounded by LRU size and a
+per-query TTL, and are invalidated per business when a related mutation runs.
+
+Only results fetched with the service account are cached: queries sent with a
+caller's ID token may be filtered by that caller's @auth rules, so the clients
+bypass the cache for them (see AsyncDataConnectClient.execute_query).
+"""
+
+from typing import Dict, Any, Callable, Optional, List, Tuple, Set
+from dataclasses import dataclass, field
+import threading
+import logging
+
+from cachetools import TLRUCache
+
+from config.settings import settings
+from core.metrics import metrics
+from core.serialization import json_dumps_canonical
+
+logger = logging.getLogger(__name__)
+
+
+# Cacheable queries: operation name -> (variable holding the business id, TTL seconds)
+CACHEABLE_QUERIES: Dict[str, Tuple[str, int]] = {
+    "GetBusinessById": ("id", 300),
+    "ListLocationsByBusiness": ("businessId", 300),
+    "ListProductsByBusiness": ("businessId", 120),
+}
+
+# Invalidation registry: mutation name -> queries it makes stale.
+# Scoped by the mutation's businessId variable; a mutation without one
+# (e.g. the purge utilities) drops the listed queries for every business.
+INVALIDATION_REGISTRY: Dict[str, List[str]] = {
+    "CreateBusinessAndAdmin": ["GetBusinessById"],
+    "CreateBusiness": ["GetBusinessById"],
+    "UpdateBusinessProfile": ["GetBusinessById"],
+    "CreateLocation": ["ListLocationsByBusiness"],
+    "CreateProduct": ["ListProductsByBusiness"],
+    "DeleteAllBusinesses": list(CACHEABLE_QUERIES),
+}
+
+
+ScopeKey = Tuple[str, Optional[str]]
+
+
+@dataclass
+class _Scope:
+    """Cache keys of one (query name, business id), plus fills in flight for it"""
+    keys: Set[tuple] = field(default_factory=set)
+    # Bumped on invalidation; a fill reserved under an older generation is not stored
+    generation: int = 0
+    pending: int = 0
+
+
+@dataclass(frozen=True)
+class Reservation:
+    """Handed out by QueryResultCache.reserve() before an upstream fetch"""
+    scope: ScopeKey
+    generation: int
+
+
+class _Entries(TLRUCache):
+    """TLRUCache that reports keys it evicts or expires on its own"""
+
+    def __init__(self, maxsize: int, ttu: Callable, on_drop: Callable[[tuple], None]):
+        super().__init__(maxsize=maxsize, ttu=ttu)
+        self._on_drop = on_drop
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._on_drop(key)
+        return key, value
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for key, _ in expired:
+            self._on_drop(key)
+        return expired
+
+
+class QueryResultCache:
+    """
+    LRU + TTL cache of Data Connect query results
+
+    Keyed by operation name plus canonicalized variables. Cached results are
+    shared between callers and must be treated as read-only.
+
+    A fetch reserves its scope first (reserve / set / release): if a mutation
+    invalidates the scope while the fetch is in flight, its result is not
+    stored, so a pre-mutation read cannot repopulate the cache afterwards.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        cacheable: Optional[Dict[str, Tuple[str, int]]] = None,
+        invalidations: Optional[Dict[str, List[str]]] = None
+    ):
+        self.cacheable = cacheable if cacheable is not None else CACHEABLE_QUERIES
+        self.invalidations = invalidations if invalidations is not None else INVALIDATION_REGISTRY
+
+        self._entries = _Entries(maxsize=maxsize, ttu=self._expires_at, on_drop=self._forget)
+        # (query name, business id) -> cache keys and fill generation, for scoped
+        # invalidation. A scope is dropped once it has no entries and no fills.
+        self._scopes: Dict[ScopeKey, _Scope] = {}
+        self._key_scopes: Dict[tuple, ScopeKey] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+    def _expires_at(self, key: tuple, value: Any, now: float) -> float:
+        _, ttl = self.cacheable[key[0]]
+        return now + ttl
+
+    @staticmethod
+    def make_key(operation_name: str, variables: Optional[Dict[str, Any]]) -> tuple:
+        """
+        Build a cache key from operation name and canonicalized variables
+
+        Variables are serialized with sorted keys so equivalent dicts share a key.
+        """
+        canonical = json_dumps_canonical(variables or {})
+        return (operation_name, canonical)
+
+    def is_cacheable(self, operation_name: str) -> bool:
+        """Check if a query is registered as cacheable"""
+        return operation_name in self.cacheable
+
+    def _business_id(self, operation_name: str, variables: Optional[Dict[str, Any]]) -> Optional[str]:
+        scope_var, _ = self.cacheable[operation_name]
+        value = (variables or {}).get(scope_var)
+        return str(value) if value is not None else None
+
+    def _scope(self, operation_name: str, variables: Optional[Dict[str, Any]]) -> ScopeKey:
+        return (operation_name, self._business_id(operation_name, variables))
+
+    def _forget(self, key: tuple) -> None:
+        """Unlink a key that left the cache (caller holds the lock)"""
+        scope_key = self._key_scopes.pop(key, None)
+        scope = self._scopes.get(scope_key)
+        if scope is None:
+            return
+        scope.keys.discard(key)
+        if not scope.keys and not scope.pending:
+            del self._scopes[scope_key]
+
+    def get(self, operation_name: str, variables: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result
+
+        Returns:
+            Optional[Dict]: Cached response, or None on a miss / uncacheable query
+        """
+        if not self.is_cacheable(operation_name):
+            return None
+
+        key = self.make_key(operation_name, variables)
+        with self._lock:
+            result = self._entries.get(key)
+
+        if result is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        logger.debug(f"🗄️  CACHE HIT: {operation_name}")
+        return result
+
+    def reserve(self, operation_name: str, variables: Optional[Dict[str, Any]]) -> Optional[Reservation]:
+        """
+        Register a fetch about to go upstream
+
+        Returns:
+            Optional[Reservation]: Pass to set() and then release(); None for uncacheable queries
+        """
+        if not self.is_cacheable(operation_name):
+            return None
+        scope_key = self._scope(operation_name, variables)
+        with self._lock:
+            scope = self._scopes.setdefault(scope_key, _Scope())
+            scope.pending += 1
+            return Reservation(scope_key, scope.generation)
+
+    def release(self, reservation: Optional[Reservation]) -> None:
+        """Finish a fetch started with reserve(), whether or not it succeeded"""
+        if reservation is None:
+            return
+        with self._lock:
+            scope = self._scopes.get(reservation.scope)
+            if scope is None:
+                return
+            scope.pending -= 1
+            if not scope.keys and not scope.pending:
+                del self._scopes[reservation.scope]
+
+    def set(
+        self,
+        operation_name: str,
+        variables: Optional[Dict[str, Any]],
+        result: Dict[str, Any],
+        reservation: Optional[Reservation] = None
+    ) -> None:
+        """
+        Store a successful query result
+
+        With a reservation, the result is dropped if the scope was invalidated
+        after reserve().
+        """
+        if not self.is_cacheable(operation_name):
+            return
+        if not isinstance(result, dict) or result.get("errors"):
+            return
+
+        key = self.make_key(operation_name, variables)
+        scope_key = self._scope(operation_name, variables)
+        with self._lock:
+            scope = self._scopes.get(scope_key)
+            if reservation is not None and (scope is None or scope.generation != reservation.generation):
+                logger.debug(f"🗄️  CACHE SKIP: {operation_name} was invalidated during the fetch")
+                return
+            # Inserting may evict or expire other keys (and their empty scopes)
+            self._entries[key] = result
+            self._scopes.setdefault(scope_key, _Scope()).keys.add(key)
+            self._key_scopes[key] = scope_key
+
+    def invalidate(self, mutation_name: str, variables: Optional[Dict[str, Any]]) -> int:
+        """
+        Drop cached queries made stale by a mutation
+
+        Args:
+            mutation_name: Mutation that just succeeded
+            variables: Its variables (businessId scopes the invalidation)
+
+        Returns:
+            int: Number of cache entries dropped
+        """
+        queries = self.invalidations.get(mutation_name)
+        if not queries:
+            return 0
+
+        business_id = (variables or {}).get("businessId")
+        business_id = str(business_id) if business_id is not None else None
+
+        with self._lock:
+            dropped = self._drop_scopes(
+                lambda query_name, scope_business: query_name in queries
+                and (business_id is None or scope_business == business_id)
+            )
+
+        if dropped:
+            self.invalidated += dropped
+            logger.debug(f"🗄️  CACHE INVALIDATED by {mutation_name}: {dropped} entries")
+        return dropped
+
+    def invalidate_business(self, business_id: str) -> int:
+        """Drop every cached query for one business"""
+        business_id = str(business_id)
+        with self._lock:
+            dropped = self._drop_scopes(lambda _, scope_business: scope_business == business_id)
+        self.invalidated += dropped
+        return dropped
+
+    def _drop_scopes(self, matches: Callable[[str, Optional[str]], bool]) -> int:
+        """Drop the entries of matching scopes and fence their in-flight fills (caller holds the lock)"""
+        dropped = 0
+        for scope_key, scope in list(self._scopes.items()):
+            if not matches(*scope_key):
+                continue
+            for key in scope.keys:
+                self._key_scopes.pop(key, None)
+                if self._entries.pop(key, None) is not None:
+                    dropped += 1
+            scope.keys.clear()
+            if scope.pending:
+                scope.generation += 1
+            else:
+                del self._scopes[scope_key]
+        return dropped
+
+    def clear(self) -> None:
+        """Drop all cached results"""
+        with self._lock:
+            self._entries.clear()
+            self._key_scopes.clear()
+            for scope_key, scope in list(self._scopes.items()):
+                scope.keys.clear()
+                if scope.pending:
+                    scope.generation += 1
+                else:
+                    del self._scopes[scope_key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidated": self.invalidated,
+            "size": len(self._entries),
+            "maxsize": self._entries.maxsize,
+        }
+
+
+# Global instance shared by every Data Connect client in the process
+query_cache = QueryResultCache(maxsize=settings.DATA_CONNECT_QUERY_CACHE_SIZE)
+metrics.register_cache("dataconnect_query", query_cache.stats)
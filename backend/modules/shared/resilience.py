@@ -0,0 +1,134 @@
+"""
+Resilience primitives for Data Connect calls
+
+- RetryPolicy: bounded retries with full-jitter exponential backoff
+- CircuitBreaker: fails fast while an endpoint is down, probes for recovery
+- LatencyTracker: rolling latency window used to pick the hedge delay
+"""
+
+from typing import Dict, Any, Optional, FrozenSet
+from dataclasses import dataclass, field
+from collections import deque
+import random
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# HTTP statuses that indicate a transient upstream problem
+TRANSIENT_STATUS_CODES: FrozenSet[int] = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def is_transient(exc: Exception) -> bool:
+    """
+    Check if a failed call is worth retrying / counts against the breaker
+
+    Transport errors carry no status code; 4xx responses other than
+    408/429 are the caller's fault and are not transient.
+    """
+    status_code = getattr(exc, "status_code", None)
+    return status_code is None or status_code in TRANSIENT_STATUS_CODES
+
+
+@dataclass
+class RetryPolicy:
+    """Retry schedule for idempotent operations"""
+    max_attempts: int = 3
+    base_delay: float = 0.1   # seconds
+    max_delay: float = 2.0    # seconds
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full-jitter delay before retry number `attempt` (0-based)
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one endpoint
+
+    CLOSED: calls pass through.
+    OPEN: calls are rejected until reset_timeout has elapsed.
+    HALF_OPEN: a single probe is let through; success closes, failure re-opens.
+    """
+    name: str
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0  # seconds
+
+    state: str = field(default="CLOSED", init=False)
+    failures: int = field(default=0, init=False)
+    opened_at: float = field(default=0.0, init=False)
+    _probe_in_flight: bool = field(default=False, init=False, repr=False)
+
+    # Metrics
+    times_opened: int = field(default=0, init=False)
+    rejected: int = field(default=0, init=False)
+
+    def allow(self) -> bool:
+        """Check if a call may proceed"""
+        if self.state == "CLOSED":
+            return True
+
+        if self.state == "OPEN":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state = "HALF_OPEN"
+            self._probe_in_flight = False
+
+        # HALF_OPEN: only one probe at a time
+        if self._probe_in_flight:
+            self.rejected += 1
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        if self.state != "CLOSED":
+            logger.info(f"🟢 Circuit {self.name} closed")
+        self.state = "CLOSED"
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Give up a call's slot without an outcome (e.g. it was cancelled)"""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "HALF_OPEN" or self.failures >= self.failure_threshold:
+            if self.state != "OPEN":
+                self.times_opened += 1
+                logger.warning(f"🔴 Circuit {self.name} opened after {self.failures} failures")
+            self.state = "OPEN"
+            self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies (seconds)"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency at the given percentile, or None until enough samples exist"""
+        if len(self._samples) < 20:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
@@ -0,0 +1,75 @@
+"""
+Single-flight Request Coalescing
+
+Collapses concurrent identical Data Connect queries into one upstream call and
+fans the result (or error) out to every waiter.
+"""
+
+from typing import Dict, Any, Awaitable, Callable, Hashable, TypeVar
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key
+
+    The first caller starts the upstream call as a task; callers arriving while
+    it is in flight await the same task. The upstream call is shielded, so a
+    cancelled caller (e.g. a dropped client connection) does not cancel it for
+    the others. Results are shared between callers and must be treated as
+    read-only.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        # Metrics
+        self.calls = 0
+        self.collapsed = 0
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn once per key among concurrent callers
+
+        Args:
+            key: Identity of the call (operation name + canonical variables + caller)
+            fn: Zero-argument coroutine function performing the upstream call
+
+        Returns:
+            The shared result of fn()
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        else:
+            self.collapsed += 1
+            logger.debug(f"🔗 COALESCED: {key[0] if isinstance(key, tuple) else key}")
+
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """Coalescing counters"""
+        return {
+            "calls": self.calls,
+            "collapsed": self.collapsed,
+            "in_flight": len(self._inflight),
+        }
+
+
+# Global instance shared by every async Data Connect client in the process
+query_flight = SingleFlight()
@@ -0,0 +1,220 @@
+"""
+Access Token Cache for Data Connect
+
+Keeps Google OAuth credentials in memory and refreshes them in the background
+before they expire, so queries and mutations never pay for a token-endpoint
+round-trip on the request path.
+"""
+
+from typing import Dict, Any, Optional, List
+from datetime import datetime, timedelta
+import asyncio
+import threading
+import logging
+
+from config.settings import settings
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Token returned in DEV when no Application Default Credentials are available
+MOCK_TOKEN = "mock-token-fallback"
+
+
+class AccessTokenCache:
+    """
+    Process-wide cache of the service account access token
+
+    - Callers get the cached token while it has more than EXPIRY_SKEW left.
+    - A background task refreshes the token REFRESH_MARGIN seconds before expiry.
+    - Concurrent callers that find the token missing share one in-flight refresh.
+    - In DEV, a failed refresh hands out MOCK_TOKEN; the background task keeps
+      retrying every RETRY_DELAY seconds and drops the fallback once a real
+      token arrives.
+    """
+
+    # Never hand out a token with less than this much lifetime left
+    EXPIRY_SKEW = timedelta(seconds=30)
+
+    # Delay before retrying a failed background refresh (seconds)
+    RETRY_DELAY = 30
+
+    def __init__(
+        self,
+        scopes: Optional[List[str]] = None,
+        refresh_margin: Optional[int] = None
+    ):
+        self.scopes = scopes or ['https://www.googleapis.com/auth/cloud-platform']
+        self.refresh_margin = timedelta(
+            seconds=refresh_margin if refresh_margin is not None else settings.DATA_CONNECT_TOKEN_REFRESH_MARGIN
+        )
+
+        self._creds = None
+        self._fallback_token: Optional[str] = None
+        self._lock = threading.Lock()
+        self._inflight: Optional[asyncio.Future] = None
+        self._background_task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.inline_refreshes = 0
+        self.background_refreshes = 0
+        self.failures = 0
+
+    def _current_token(self) -> Optional[str]:
+        """Return the cached token if it is still usable, None otherwise"""
+        if self._fallback_token:
+            return self._fallback_token
+
+        creds = self._creds
+        if creds is None or not creds.token:
+            return None
+        if creds.expiry and creds.expiry - datetime.utcnow() <= self.EXPIRY_SKEW:
+            return None
+        return creds.token
+
+    def _refresh_blocking(self, background: bool = False) -> str:
+        """
+        Refresh credentials (blocking). Serialized across threads.
+        """
+        with self._lock:
+            # Another caller may have refreshed while we waited on the lock
+            if not background:
+                token = self._current_token()
+                if token:
+                    return token
+
+            try:
+                import google.auth
+                import google.auth.transport.requests
+
+                if self._creds is None:
+                    # Use Application Default Credentials (works on Cloud Run & Local with gcloud auth application-default login)
+                    self._creds, _ = google.auth.default(scopes=self.scopes)
+
+                self._creds.refresh(google.auth.transport.requests.Request())
+
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"⚠️ Failed to get real access token: {e}")
+                # Fallback only for local dev without credentials
+                if settings.ENV == "DEV":
+                    self._fallback_token = MOCK_TOKEN
+                    return self._fallback_token
+                raise
+
+            if self._fallback_token:
+                logger.info("🔑 Real access token obtained, dropping the DEV fallback token")
+                self._fallback_token = None
+
+            if background:
+                self.background_refreshes += 1
+            else:
+                self.inline_refreshes += 1
+
+            logger.debug(f"🔑 Access token refreshed (expires {self._creds.expiry})")
+            return self._creds.token
+
+    def has_valid_token(self) -> bool:
+        """Check if a usable token is cached (no refresh is attempted)"""
+        return self._current_token() is not None
+
+    def get_token(self) -> str:
+        """
+        Get a valid access token (blocking)
+
+        Returns:
+            str: OAuth access token for the Data Connect API
+        """
+        token = self._current_token()
+        if token:
+            self.hits += 1
+            return token
+
+        self.misses += 1
+        return self._refresh_blocking()
+
+    async def get_token_async(self) -> str:
+        """
+        Get a valid access token without blocking the event loop
+
+        Concurrent callers that miss the cache await the same refresh.
+
+        Returns:
+            str: OAuth access token for the Data Connect API
+        """
+        token = self._current_token()
+        if token:
+            self.hits += 1
+            return token
+
+        self.misses += 1
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(asyncio.to_thread(self._refresh_blocking))
+        return await asyncio.shield(self._inflight)
+
+    def _seconds_until_refresh(self) -> float:
+        """Seconds to sleep before the next background refresh"""
+        creds = self._creds
+        if creds is None or creds.expiry is None:
+            return self.RETRY_DELAY
+        due = creds.expiry - self.refresh_margin - datetime.utcnow()
+        return max(due.total_seconds(), 1.0)
+
+    async def _refresh_loop(self) -> None:
+        """Keep the token fresh until cancelled"""
+        while True:
+            try:
+                await asyncio.to_thread(self._refresh_blocking, True)
+            except Exception as e:
+                logger.error(f"❌ Background token refresh failed: {e}")
+                await asyncio.sleep(self.RETRY_DELAY)
+                continue
+
+            if self._fallback_token:
+                # Credentials were unavailable (DEV): keep trying for a real token
+                await asyncio.sleep(self.RETRY_DELAY)
+                continue
+
+            await asyncio.sleep(self._seconds_until_refresh())
+
+    def start(self) -> None:
+        """Start the background refresh task (call from the app lifespan)"""
+        if self._background_task is None or self._background_task.done():
+            self._background_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop the background refresh task"""
+        if self._background_task is not None:
+            self._background_task.cancel()
+            try:
+                await self._background_task
+            except asyncio.CancelledError:
+                pass
+            self._background_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache counters
+
+        inline_refreshes should stay flat once the background task is running.
+        """
+        expires_in = None
+        if self._creds is not None and self._creds.expiry is not None:
+            expires_in = int((self._creds.expiry - datetime.utcnow()).total_seconds())
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "inline_refreshes": self.inline_refreshes,
+            "background_refreshes": self.background_refreshes,
+            "failures": self.failures,
+            "expires_in": expires_in,
+            "fallback": self._fallback_token is not None,
+        }
+
+
+# Global instance shared by every Data Connect client in the process
+access_token_cache = AccessTokenCache()
+metrics.register_cache("access_token", access_token_cache.stats)
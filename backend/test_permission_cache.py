@@ -0,0 +1,89 @@
+"""
+Permission cache tests
+
+Run with pytest or directly: python test_permission_cache.py
+"""
+
+import asyncio
+import uuid
+
+from core import permissions
+from core.permissions import PermissionCache
+
+BUSINESS_ID = str(uuid.uuid4())
+
+
+class FakeUserRecords:
+    """Stands in for core.users.user_records; lookups wait until released"""
+
+    def __init__(self, role):
+        self.role = role
+        self.lookups = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def get(self, uid):
+        self.lookups += 1
+        role = self.role
+        self.started.set()
+        await self.release.wait()
+        return {"id": uid, "businessId": BUSINESS_ID, "role": role, "isActive": True}
+
+    def invalidate(self, uid=None, business_id=None):
+        return 0
+
+
+def run(scenario):
+    """Run a scenario that installs its own FakeUserRecords, restoring the real one after"""
+    original = permissions.user_records
+    try:
+        return asyncio.run(scenario())
+    finally:
+        permissions.user_records = original
+
+
+def test_invalidate_during_load_is_not_overwritten():
+    async def scenario():
+        records = FakeUserRecords("CASHIER_POS_OPERATOR")
+        permissions.user_records = records
+        cache = PermissionCache(maxsize=10, ttl=60)
+
+        load = asyncio.ensure_future(cache.get("u1", BUSINESS_ID))
+        await records.started.wait()
+
+        # Role change lands while the old lookup is still in flight
+        records.role = "BUSINESS_ADMIN"
+        cache.invalidate(uid="u1")
+        records.release.set()
+
+        stale = await load
+        assert "*" not in stale
+        fresh = await cache.get("u1", BUSINESS_ID)
+        assert records.lookups == 2
+        assert "*" in fresh
+        # The fresh lookup is cached
+        assert await cache.get("u1", BUSINESS_ID) == fresh
+        assert records.lookups == 2
+
+    run(scenario)
+
+
+def test_business_id_formats_match():
+    async def scenario():
+        records = FakeUserRecords("BUSINESS_ADMIN")
+        records.release.set()
+        permissions.user_records = records
+        cache = PermissionCache(maxsize=10, ttl=60)
+
+        assert "*" in await cache.get("u1", uuid.UUID(BUSINESS_ID).hex.upper())
+        assert await cache.get("u2", str(uuid.uuid4())) == frozenset()
+        assert await cache.get("u3", "not-a-uuid") == frozenset()
+
+    run(scenario)
+
+
+if __name__ == "__main__":
+    print("Running permission cache tests...")
+    test_invalidate_during_load_is_not_overwritten()
+    test_business_id_formats_match()
+    print("\nTests completed.")